@@ -0,0 +1,238 @@
+import os
+from collections import OrderedDict
+import pygame
+import bundle
+
+# Process-wide asset cache. Every image is read from disk at most once and
+# every frame set is built at most once, no matter how many sprites use it.
+_images = {}  # (path, size) -> Surface
+_frames = {}  # (pattern, count, size, atlas) -> list of Surfaces
+_bundles = {}  # pattern -> tile numbers in its bundle, or None without one
+
+# Counters used to confirm that steady-state gameplay does no file I/O
+stats = {"hits": 0, "misses": 0, "disk_reads": 0, "bundles": 0}
+
+ATLAS_MAX_WIDTH = 2048  # Widest atlas surface we are willing to build
+use_bundles = True  # Read packed animation bundles when they exist
+ROTATION_STEP = 1  # Degrees per rotation cache bucket
+ROTATION_CACHE_BYTES = 32 * 2**20  # Pixel memory the rotation cache may hold
+
+
+_alpha_format = None  # (display surface, masks convert_alpha produces for it)
+
+
+def _display_alpha_masks(display):
+    """Returns the channel masks `convert_alpha` uses for the current display."""
+    global _alpha_format
+    if _alpha_format is None or _alpha_format[0] is not display:
+        masks = pygame.Surface((1, 1), pygame.SRCALPHA).convert_alpha().get_masks()
+        _alpha_format = (display, masks)
+    return _alpha_format[1]
+
+
+def _finalize(surface, alpha=True):
+    """
+    Converts a freshly loaded surface to the display pixel format. Without a
+    display (headless runs) the surface is kept as loaded, and so is one
+    already in the display's alpha format (bundle frames).
+    """
+    display = pygame.display.get_surface()
+    if display is None:
+        return surface
+    if alpha and surface.get_bitsize() == 32 and surface.get_masks() == _display_alpha_masks(display):
+        return surface
+    return surface.convert_alpha() if alpha else surface.convert()
+
+
+def load_image(path, size=None, alpha=True):
+    """
+    Returns the image at `path`, optionally scaled, loading it only once.
+
+    :param path: Path of the image file.
+    :param size: Optional (width, height) to scale the image to.
+    :param alpha: Whether to keep per-pixel alpha when converting.
+    """
+    key = (path, size)
+    image = _images.get(key)
+    if image is not None:
+        stats["hits"] += 1
+        return image
+
+    stats["misses"] += 1
+    if size is None:
+        stats["disk_reads"] += 1
+        image = _finalize(pygame.image.load(path), alpha)
+    else:
+        image = pygame.transform.scale(load_image(path, None, alpha), size)
+    _images[key] = image
+    return image
+
+
+def add_image(path, surface):
+    """
+    Stores an image decoded elsewhere (see preload.py) as if `load_image`
+    had read it. Conversion happens here, so call it on the main thread.
+    """
+    stats["disk_reads"] += 1
+    _images[(path, None)] = _finalize(surface, alpha=bool(surface.get_flags() & pygame.SRCALPHA))
+
+
+def is_loaded(path):
+    """Whether the unscaled image at `path` is already cached."""
+    return (path, None) in _images
+
+
+def load_frames(pattern, count, size=None, atlas=False):
+    """
+    Returns the animation frames matching `pattern`, loading them only once.
+
+    Missing tiles are skipped, like the original per-class loaders did. If
+    the animation has a packed bundle (see bundle.py), frames come from it
+    instead of the loose files.
+
+    :param pattern: Format string taking the frame index, e.g. "tile{:03}.png".
+    :param count: Number of frame indices to try.
+    :param size: Optional (width, height) every frame is scaled to.
+    :param atlas: Pack the frames into a single atlas surface.
+    """
+    key = (pattern, count, size, atlas)
+    frames = _frames.get(key)
+    if frames is not None:
+        stats["hits"] += 1
+        return frames
+
+    stats["misses"] += 1
+    tiles = load_bundle(pattern)
+    frames = []
+    for i in range(count) if tiles is None else [t for t in tiles if t < count]:
+        try:
+            frames.append(load_image(pattern.format(i), size))
+        except FileNotFoundError:
+            continue
+
+    if atlas and frames:
+        frames = pack_atlas(frames)
+    _frames[key] = frames
+    return frames
+
+
+def load_bundle(pattern):
+    """
+    Caches every frame of the bundle for `pattern` as if its loose file had
+    been loaded, and returns the tile numbers, or None if there is no bundle.
+    """
+    if not use_bundles:
+        return None
+    if pattern in _bundles:
+        return _bundles[pattern]
+    path = bundle.bundle_path(pattern)
+    tiles = None
+    if os.path.exists(path):
+        frames = bundle.read(path)
+        for i, frame in frames.items():
+            key = (pattern.format(i), None)
+            if key not in _images:
+                _images[key] = _finalize(frame)
+        stats["bundles"] += 1
+        tiles = sorted(frames)
+    _bundles[pattern] = tiles
+    return tiles
+
+
+def pack_atlas(frames, max_width=ATLAS_MAX_WIDTH):
+    """
+    Packs frames into one surface and returns subsurface views into it.
+
+    Frames are laid out left to right in rows (a simple shelf packer), which
+    is all we need since every animation uses equally sized tiles.
+    """
+    positions = []
+    x = y = row_height = width = 0
+    for frame in frames:
+        w, h = frame.get_size()
+        if x and x + w > max_width:
+            x = 0
+            y += row_height
+            row_height = 0
+        positions.append((x, y))
+        x += w
+        width = max(width, x)
+        row_height = max(row_height, h)
+
+    sheet = pygame.Surface((width, y + row_height), pygame.SRCALPHA)
+    if pygame.display.get_surface() is not None:
+        sheet = sheet.convert_alpha()
+    sheet.fill((0, 0, 0, 0))
+    for frame, pos in zip(frames, positions):
+        sheet.blit(frame, pos, special_flags=pygame.BLEND_RGBA_MAX)  # Exact copy onto the cleared sheet
+
+    return [sheet.subsurface(pygame.Rect(pos, frame.get_size())) for frame, pos in zip(frames, positions)]
+
+
+class RotationCache:
+    """
+    Rotated copies of sprites, quantized to `step` degree buckets.
+
+    Rotations are made lazily on first use and shared by every sprite that
+    draws the same source surface. Least recently used entries are evicted
+    once their pixels exceed `max_bytes`.
+    """
+
+    def __init__(self, step=ROTATION_STEP, max_bytes=ROTATION_CACHE_BYTES):
+        self.step = step
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self._surfaces = OrderedDict()  # (source surface, bucket) -> rotated Surface
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def rotate(self, surface, angle):
+        """
+        Returns `surface` rotated counterclockwise by `angle` degrees, like
+        `pygame.transform.rotate`, rounded to the nearest bucket.
+        """
+        bucket = round(angle / self.step) % round(360 / self.step)
+        key = (surface, bucket)
+        rotated = self._surfaces.get(key)
+        if rotated is not None:
+            self.stats["hits"] += 1
+            self._surfaces.move_to_end(key)
+            return rotated
+
+        self.stats["misses"] += 1
+        rotated = self._surfaces[key] = pygame.transform.rotate(surface, bucket * self.step)
+        self.bytes += rotated.get_width() * rotated.get_height() * rotated.get_bytesize()
+        while self.bytes > self.max_bytes and len(self._surfaces) > 1:
+            _, evicted = self._surfaces.popitem(last=False)
+            self.bytes -= evicted.get_width() * evicted.get_height() * evicted.get_bytesize()
+            self.stats["evictions"] += 1
+        return rotated
+
+    def warm(self, surface):
+        """Builds every bucket for `surface` up front, e.g. behind a loading screen."""
+        for bucket in range(round(360 / self.step)):
+            self.rotate(surface, bucket * self.step)
+
+    @property
+    def hit_rate(self):
+        """Fraction of lookups served from the cache."""
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / lookups if lookups else 0.0
+
+    def clear(self):
+        self._surfaces.clear()
+        self.bytes = 0
+        for name in self.stats:
+            self.stats[name] = 0
+
+
+rotations = RotationCache()  # Shared by the ship and every shot
+
+
+def clear():
+    """Drops every cached asset and resets the counters."""
+    _images.clear()
+    _frames.clear()
+    _bundles.clear()
+    rotations.clear()
+    for name in stats:
+        stats[name] = 0
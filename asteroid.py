@@ -1,68 +1,76 @@
 import pygame
+import assets
+import sounds
 from circleshape import CircleShape
 from constants import *
+from pool import Pool
 import random
 
 
 class Asteroid(CircleShape):
+    max_age = ASTEROID_MAX_AGE
+    rng = random  # Random source for split angles, replaced by the game's seeded generator
+    budget = None  # The game's EntityBudget; over budget, splits make one piece instead of two
+    effects = None  # The game's Effects, which plays the explosions of destroyed asteroids
+
     def __init__(self, x, y, radius, frames=None):
         super().__init__(x, y, radius)
-        self.velocity = pygame.Vector2(0, 0)
+        self.reset_state(frames)
+
+    def reset(self, x, y, radius, frames=None):
+        """Reinitializes a pooled asteroid in place."""
+        super().reset(x, y, radius)
+        self.reset_state(frames)
+
+    def reset_state(self, frames):
+        """Resets the animation and sound state for the current radius."""
         self.frames = frames
         self.current_frame = 0
         self.animation_speed = 10  # Frames per second
         self.time_since_last_frame = 0
-        self.explosion_frames = None
-        self.exploding = False  # To track explosion state
-        self.explosion_frame = 0
-        self.explosion_speed = 15  # Frames per second for explosion
-        self.explosion_time_since_last_frame = 0
-        self.active = True  # Active state for collisions
-
-        # Load sound for large and medium asteroids
-        if radius > ASTEROID_MIN_RADIUS:
-            self.explosion_sound = pygame.mixer.Sound("sprites/asteroids/medium-destroy.mp3")
-        else:
-            self.explosion_sound = pygame.mixer.Sound("sprites/asteroids/small-destroy.mp3")
-        self.explosion_sound.set_volume(0.25)
 
+        # Sound clip for large and medium asteroids (see sounds.CLIPS)
+        if self.radius > ASTEROID_MIN_RADIUS:
+            self.explosion_sound = "asteroid-medium"
+        else:
+            self.explosion_sound = "asteroid-small"
 
-    def start_explosion(self):
-        """Trigger the explosion animation and deactivate collisions."""
-        self.exploding = True
-        self.explosion_frames = Asteroid.load_explosion_frames()
-        self.explosion_frame = 0
-        self.active = False  # Deactivate asteroid for collision purposes
+    def destroy(self):
+        """Hands the explosion over to the game's effects and removes the asteroid at once."""
+        if self.effects is not None:
+            self.effects.explode(Asteroid.load_explosion_frames(), self.position, self.velocity, self.radius)
 
         # Play the explosion sound for large and medium asteroids
-        if self.explosion_sound:
-            self.explosion_sound.play()
+        sounds.play(self.explosion_sound)
+        self.kill()
 
     def split(self):
-        """Splits the asteroid into smaller ones if possible."""
-        self.start_explosion()  # Trigger explosion animation
-
+        """Destroys the asteroid, splitting it into smaller ones if possible, and returns the new pieces."""
         if self.radius <= ASTEROID_MIN_RADIUS:
-            return
+            self.destroy()
+            return []
 
         new_radius = self.radius - ASTEROID_MIN_RADIUS
-        random_angle = random.uniform(20, 50)
+        random_angle = self.rng.uniform(20, 50)
 
         velocity1 = self.velocity.rotate(random_angle) * 1.2
         velocity2 = self.velocity.rotate(-random_angle) * 1.2
 
-        size = None
-        if new_radius == ASTEROID_MAX_RADIUS:
-            size = "large"
-        elif new_radius == ASTEROID_MIN_RADIUS * 2:
-            size = "medium"
-        elif new_radius == ASTEROID_MIN_RADIUS:
-            size = "small"
+        frames = Asteroid.frames_for_radius(new_radius)
 
-        frames = Asteroid.load_asteroid_frames(size) if size else None
+        if self.budget is not None and self.budget.exceeded():
+            # Over the entity budget: the fragments stay together as one piece
+            self.budget.stats["merged"] += 1
+            piece = type(self).create(self.position.x, self.position.y, new_radius, frames)
+            piece.velocity = self.velocity * 1.2
+            for group in self.groups():
+                group.add(piece)
+            self.destroy()
+            return [piece]
 
-        new_asteroid1 = Asteroid(self.position.x, self.position.y, new_radius, frames)
-        new_asteroid2 = Asteroid(self.position.x, self.position.y, new_radius, frames)
+        # Pieces are the same class as their parent (e.g. batched asteroids)
+        new_asteroid1 = type(self).create(self.position.x, self.position.y, new_radius, frames)
+        new_asteroid2 = type(self).create(self.position.x, self.position.y, new_radius, frames)
 
         new_asteroid1.velocity = velocity1
         new_asteroid2.velocity = velocity2
@@ -70,24 +78,13 @@ class Asteroid(CircleShape):
         for group in self.groups():
             group.add(new_asteroid1, new_asteroid2)
 
-    def collision(self, other):
-        """Override collision to ignore inactive (exploding) asteroids."""
-        if not self.active:
-            return False
-        return super().collision(other)
+        # Killed only now, so the pool can't hand this asteroid back as one of its pieces
+        self.destroy()
+        return [new_asteroid1, new_asteroid2]
 
     def update(self, dt):
         """Updates the asteroid's position and animation frame."""
-        if self.exploding:
-            self.explosion_time_since_last_frame += dt
-            if self.explosion_time_since_last_frame > 1 / self.explosion_speed:
-                self.explosion_frame += 1
-                self.explosion_time_since_last_frame = 0
-                if self.explosion_frame >= len(self.explosion_frames):
-                    self.kill()  # Remove asteroid completely after explosion finishes
-            return
-
-        # Normal asteroid behavior
+        self.previous_position.update(self.position)
         self.position += self.velocity * dt
         if self.frames:
             self.time_since_last_frame += dt
@@ -95,48 +92,56 @@ class Asteroid(CircleShape):
                 self.current_frame = (self.current_frame + 1) % len(self.frames)
                 self.time_since_last_frame = 0
 
+    def blit_item(self):
+        """Returns the animation frame to blit and where, or None without frames."""
+        if self.frames:
+            position = self.render_position()
+            frame = self.frames[self.current_frame]  # Already scaled to the asteroid's diameter
+            return frame, frame.get_rect(center=(position.x, position.y))
+        return None
+
     def draw(self, screen):
-        """Renders the asteroid or explosion on the screen."""
-        if self.exploding:
-            if self.explosion_frame < len(self.explosion_frames):
-                frame = self.explosion_frames[self.explosion_frame]
-                frame_rect = frame.get_rect(center=(self.position.x, self.position.y))
-                screen.blit(frame, frame_rect)
-        elif self.frames:
-            frame = self.frames[self.current_frame]
-            scaled_frame = pygame.transform.scale(frame, (self.radius * 2, self.radius * 2))
-            frame_rect = scaled_frame.get_rect(center=(self.position.x, self.position.y))
-            screen.blit(scaled_frame, frame_rect)
-        else:
-            pygame.draw.circle(screen, "white", (self.position.x, self.position.y), self.radius, width=2)
+        """Renders the asteroid on the screen and returns the changed rect."""
+        item = self.blit_item()
+        if item is not None:
+            return screen.blit(*item)
+        position = self.render_position()
+        return pygame.draw.circle(screen, "white", (position.x, position.y), self.radius, width=2)
+
+    @staticmethod
+    def size_for_radius(radius):
+        """Maps an asteroid radius to the name of its sprite folder."""
+        if radius == ASTEROID_MAX_RADIUS:
+            return "large"
+        elif radius == ASTEROID_MIN_RADIUS * 2:
+            return "medium"
+        elif radius == ASTEROID_MIN_RADIUS:
+            return "small"
+        return None
 
     @staticmethod
-    def load_asteroid_frames(size):
-        """Loads animation frames for asteroids based on their size."""
+    def load_asteroid_frames(size, radius=None):
+        """
+        Returns the shared animation frames for asteroids of the given size.
+
+        :param size: Name of the sprite folder ("large", "medium" or "small").
+        :param radius: If given, the frames are pre-scaled to this radius.
+        """
         if not size:
             return None
+        scale = (radius * 2, radius * 2) if radius else None
+        # Adjust the count if the number of frames differs
+        return assets.load_frames(f"sprites/asteroids/{size}/tile{{:03}}.png", 48, scale, atlas=True)
 
-        frames = []
-        for i in range(48):  # Adjust the range if the number of frames differs
-            path = f"sprites/asteroids/{size}/tile{i:03}.png"
-            try:
-                frame = pygame.image.load(path).convert_alpha()
-                frames.append(frame)
-            except FileNotFoundError:
-                continue
-
-        return frames
+    @staticmethod
+    def frames_for_radius(radius):
+        """Returns the frame table pre-scaled for an asteroid of this radius."""
+        return Asteroid.load_asteroid_frames(Asteroid.size_for_radius(radius), radius)
 
     @staticmethod
     def load_explosion_frames():
-        """Loads explosion animation frames."""
-        frames = []
-        for i in range(17):  # Explosion frames
-            path = f"sprites/asteroids/destroyed/tile{i:03}.png"
-            try:
-                frame = pygame.image.load(path).convert_alpha()
-                frames.append(frame)
-            except FileNotFoundError:
-                continue
-
-        return frames
+        """Returns the shared explosion animation frames."""
+        return assets.load_frames("sprites/asteroids/destroyed/tile{:03}.png", 17, atlas=True)
+
+
+Asteroid.pool = Pool(Asteroid)
@@ -2,9 +2,13 @@ import pygame
 import random
 from asteroid import Asteroid
 from constants import *
+from waves import WAVES, EntityBudget, wave_at
 
 
 class AsteroidField(pygame.sprite.Sprite):
+    asteroid_class = Asteroid  # Class used for spawned asteroids
+    rng = random  # Random source for spawns, replaced by the game's seeded generator
+
     edges = [
         [
             pygame.Vector2(1, 0),
@@ -28,10 +32,18 @@ class AsteroidField(pygame.sprite.Sprite):
         ],
     ]
 
-    def __init__(self):
-        """Initialize the asteroid field and its spawn timer."""
+    def __init__(self, waves=WAVES, budget=None):
+        """
+        Initialize the asteroid field and its spawn timer.
+
+        :param waves: Difficulty curve to follow (see waves.py).
+        :param budget: `EntityBudget` that spawns wait for, unlimited by default.
+        """
         pygame.sprite.Sprite.__init__(self, self.containers)
         self.spawn_timer = 0.0
+        self.elapsed = 0.0
+        self.waves = waves
+        self.budget = budget or EntityBudget()
 
     def spawn(self, radius, position, velocity):
         """
@@ -41,18 +53,10 @@ class AsteroidField(pygame.sprite.Sprite):
         :param position: The initial position of the asteroid as a vector.
         :param velocity: The velocity of the asteroid as a vector.
         """
-        size = None
-        if radius == ASTEROID_MAX_RADIUS:
-            size = "large"
-        elif radius == ASTEROID_MIN_RADIUS * 2:
-            size = "medium"
-        elif radius == ASTEROID_MIN_RADIUS:
-            size = "small"
-
-        # Load animation frames based on asteroid size
-        frames = Asteroid.load_asteroid_frames(size) if size else None
+        # Shared animation frames, pre-scaled to the asteroid's size
+        frames = Asteroid.frames_for_radius(radius)
 
-        asteroid = Asteroid(position.x, position.y, radius, frames)
+        asteroid = self.asteroid_class.create(position.x, position.y, radius, frames)
         asteroid.velocity = velocity
 
         # Add asteroid to all relevant sprite groups
@@ -63,18 +67,28 @@ class AsteroidField(pygame.sprite.Sprite):
         """
         Updates the asteroid field by checking if new asteroids need to be spawned.
 
+        Spawns that are due while the entity budget is used up wait until
+        there is room again.
+
         :param dt: The delta time since the last frame.
         """
+        self.elapsed += dt
         self.spawn_timer += dt
-        if self.spawn_timer > ASTEROID_SPAWN_RATE:
+        wave = wave_at(self.elapsed, self.waves)
+        if self.spawn_timer > wave["interval"]:
+            if self.budget.exceeded():
+                self.budget.stats["deferred"] += 1
+                return
             self.spawn_timer = 0
-            edge = random.choice(self.edges)
-            speed = random.randint(40, 100)
-            velocity = edge[0] * speed
-            velocity = velocity.rotate(random.randint(-30, 30))
-            position = edge[1](random.uniform(0, 1))
-            kind = random.randint(1, ASTEROID_KINDS)
-            radius = ASTEROID_MIN_RADIUS * kind
+            rng = self.rng
+            for _ in range(wave["burst"]):
+                edge = rng.choice(self.edges)
+                speed = rng.randint(*wave["speed"])
+                velocity = edge[0] * speed
+                velocity = velocity.rotate(rng.randint(-wave["spread"], wave["spread"]))
+                position = edge[1](rng.uniform(0, 1))
+                kind = rng.randint(*wave["kinds"])
+                radius = ASTEROID_MIN_RADIUS * kind
 
-            # Spawn a new asteroid
-            self.spawn(radius, position, velocity)
+                # Spawn a new asteroid
+                self.spawn(radius, position, velocity)
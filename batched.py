@@ -0,0 +1,241 @@
+"""
+Batched world mode: asteroids and shots keep their state in NumPy arrays.
+
+Every entity owns one row of a struct-of-arrays store, and the per-tick work
+(integration, animation stepping, swept collision times) runs as one vectorized pass
+over all rows instead of one Python `update` call per sprite. The sprites
+themselves become thin handles whose attributes read and write their row, so
+gameplay code keeps using the normal `Asteroid`/`Shot` API.
+
+NumPy is only needed when this mode is enabled.
+"""
+import pygame
+
+from asteroid import Asteroid
+from collision import earliest_impacts, times_of_impact
+from constants import *
+from player import Shot
+from pool import Pool
+
+try:
+    import numpy as np
+except ImportError:  # The batched world is optional
+    np = None
+
+
+class BatchedWorld:
+    """Struct-of-arrays store for every batched asteroid and shot."""
+
+    # Per-entity scalar columns: name -> (dtype, python type used when reading)
+    COLUMNS = {
+        "radius": ("f8", float),
+        "current_frame": ("i4", int),
+        "frame_count": ("i4", int),
+        "animation_speed": ("f8", float),
+        "time_since_last_frame": ("f8", float),
+        "age": ("f8", float),
+        "max_age": ("f8", float),
+        "alive": ("?", bool),
+    }
+
+    def __init__(self, capacity=1024):
+        if np is None:
+            raise ImportError("The batched world requires NumPy (pip install numpy)")
+        self.capacity = 0
+        self.position = np.zeros((0, 2))
+        self.previous_position = np.zeros((0, 2))
+        self.velocity = np.zeros((0, 2))
+        for name, (dtype, _) in self.COLUMNS.items():
+            setattr(self, name, np.zeros(0, dtype))
+        self.handles = []
+        self.free = []
+        self.grow(capacity)
+
+    def grow(self, capacity):
+        """Enlarges every array to hold at least `capacity` entities."""
+        if capacity <= self.capacity:
+            return
+        extra = capacity - self.capacity
+        self.position = np.concatenate([self.position, np.zeros((extra, 2))])
+        self.previous_position = np.concatenate([self.previous_position, np.zeros((extra, 2))])
+        self.velocity = np.concatenate([self.velocity, np.zeros((extra, 2))])
+        for name, (dtype, _) in self.COLUMNS.items():
+            setattr(self, name, np.concatenate([getattr(self, name), np.zeros(extra, dtype)]))
+        self.handles.extend([None] * extra)
+        # Hand out low indices first so live rows stay packed
+        self.free.extend(range(capacity - 1, self.capacity - 1, -1))
+        self.free.sort(reverse=True)
+        self.capacity = capacity
+
+    def allocate(self, handle):
+        """Reserves a row for `handle` and returns its index."""
+        if not self.free:
+            self.grow(self.capacity * 2)
+        index = self.free.pop()
+        self.position[index] = 0
+        self.previous_position[index] = 0
+        self.velocity[index] = 0
+        for name in self.COLUMNS:
+            getattr(self, name)[index] = 0
+        self.alive[index] = True
+        self.max_age[index] = handle.max_age if handle.max_age is not None else np.inf
+        self.handles[index] = handle
+        return index
+
+    def release(self, index):
+        """Returns a row to the free list."""
+        self.alive[index] = False
+        self.handles[index] = None
+        self.free.append(index)
+
+    def step(self, dt):
+        """
+        Advances every batched entity by `dt` seconds in a few array passes.
+
+        Mirrors `Asteroid.update` and `Shot.update`: every entity integrates
+        its velocity and advances its animation. Runs before the sprite
+        updates, so a shot fired this tick doesn't move until the next one,
+        like in a sprite group.
+        """
+        alive = self.alive
+        self.previous_position[alive] = self.position[alive]
+        self.position[alive] += self.velocity[alive] * dt
+
+        animated = alive & (self.frame_count > 0)
+        self.time_since_last_frame[animated] += dt
+        with np.errstate(divide="ignore"):
+            advance = animated & (self.time_since_last_frame > 1 / self.animation_speed)
+        self.current_frame[advance] = (self.current_frame[advance] + 1) % self.frame_count[advance]
+        self.time_since_last_frame[advance] = 0
+
+    def expired(self, margin, dt):
+        """
+        Ages every entity by `dt` and returns the handles that are past their
+        max age or fully outside the screen plus `margin`, like
+        `LifetimeManager.update` does per sprite.
+        """
+        self.age[self.alive] += dt
+        reach = margin + self.radius
+        x = self.position[:, 0]
+        y = self.position[:, 1]
+        outside = (x < -reach) | (x > SCREEN_WIDTH + reach) | (y < -reach) | (y > SCREEN_HEIGHT + reach)
+        expired = self.alive & (outside | (self.age > self.max_age))
+        return [self.handles[index] for index in np.flatnonzero(expired)]
+
+    def indices(self, handles):
+        """Returns the row indices of a sequence of handles as an array."""
+        return np.fromiter((handle.index for handle in handles), dtype=np.intp)
+
+    def overlapping(self, position, radius, targets):
+        """Returns the target handles overlapping a circle, in the order given."""
+        targets = list(targets)
+        index = self.indices(targets)
+        delta = self.position[index] - (position.x, position.y)
+        reach = self.radius[index] + radius
+        hit = np.einsum("ij,ij->i", delta, delta) <= reach * reach
+        return [targets[i] for i in np.flatnonzero(hit)]
+
+    def earliest_hits(self, sources, targets):
+        """
+        Returns the earliest (time of impact, target) of each source over the
+        last tick, or None where it hits nothing, from one swept impact-time
+        matrix. Ties go to the target listed first, like `Game.earliest_impact`.
+        """
+        sources = list(sources)
+        targets = list(targets)
+        if not sources:
+            return []
+        source_index = self.indices(sources)
+        target_index = self.indices(targets)
+        times = times_of_impact(
+            self.previous_position[source_index],
+            self.position[source_index],
+            self.radius[source_index],
+            self.previous_position[target_index],
+            self.position[target_index],
+            self.radius[target_index],
+        )
+        return [None if hit is None else (hit[1], targets[hit[0]]) for hit in earliest_impacts(times)]
+
+
+def _column(name, cast):
+    """Builds a property that reads and writes one scalar column of the world."""
+
+    def getter(self):
+        return cast(getattr(self.world, name)[self.index])
+
+    def setter(self, value):
+        getattr(self.world, name)[self.index] = value
+
+    return property(getter, setter)
+
+
+def _vector_column(name):
+    """
+    Builds a property for a 2D column. Reading returns a copy, so assign a new
+    vector (or use augmented assignment) instead of mutating `.x`/`.y`.
+    """
+
+    def getter(self):
+        return pygame.Vector2(*getattr(self.world, name)[self.index])
+
+    def setter(self, value):
+        getattr(self.world, name)[self.index] = (value[0], value[1])
+
+    return property(getter, setter)
+
+
+class BatchedBody:
+    """Mixin that stores a sprite's physical state in a row of `BatchedWorld`."""
+
+    world = None  # Set by main before any batched sprite is created
+
+    position = _vector_column("position")
+    previous_position = _vector_column("previous_position")
+    velocity = _vector_column("velocity")
+    radius = _column("radius", float)
+    age = _column("age", float)
+
+    def __init__(self, *args, **kwargs):
+        self.index = self.world.allocate(self)
+        super().__init__(*args, **kwargs)
+
+    def reset(self, x, y, *args):
+        self.index = self.world.allocate(self)
+        super().reset(x, y, *args)
+        # The base reset updates copies of the row
+        self.position = (x, y)
+        self.previous_position = (x, y)
+
+    def update(self, dt):
+        pass  # BatchedWorld.step advances every batched sprite at once
+
+    def kill(self):
+        if self.index is not None:
+            self.world.release(self.index)
+            self.index = None
+        super().kill()
+
+
+class BatchedAsteroid(BatchedBody, Asteroid):
+    current_frame = _column("current_frame", int)
+    animation_speed = _column("animation_speed", float)
+    time_since_last_frame = _column("time_since_last_frame", float)
+
+    @property
+    def frames(self):
+        return self._frames
+
+    @frames.setter
+    def frames(self, frames):
+        self._frames = frames
+        self.world.frame_count[self.index] = len(frames) if frames else 0
+
+
+class BatchedShot(BatchedBody, Shot):
+    pass
+
+
+# Separate pools, so batched and plain sprites never get mixed up
+BatchedAsteroid.pool = Pool(BatchedAsteroid)
+BatchedShot.pool = Pool(BatchedShot)
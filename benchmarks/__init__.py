@@ -0,0 +1,4 @@
+"""Performance benchmarks. Run each one from the repository root, e.g.
+
+    python -m benchmarks.bench_asteroid_draw
+"""
@@ -0,0 +1,58 @@
+"""Compares Asteroid.draw with per-frame scaling against the pre-scaled frame tables."""
+import random
+
+from benchmarks.common import init_pygame, time_call
+
+screen = init_pygame()
+
+import pygame
+from asteroid import Asteroid
+from constants import *
+
+COUNTS = (50, 200, 1000)
+FRAMES = 20  # Frames drawn per timing run
+
+
+def draw_rescaled(asteroid, screen):
+    """The old Asteroid.draw: scale the source frame on every call."""
+    frame = asteroid.frames[asteroid.current_frame]
+    scaled_frame = pygame.transform.scale(frame, (asteroid.radius * 2, asteroid.radius * 2))
+    screen.blit(scaled_frame, scaled_frame.get_rect(center=(asteroid.position.x, asteroid.position.y)))
+
+
+def make_asteroids(count, prescaled):
+    rng = random.Random(count)
+    asteroids = []
+    for _ in range(count):
+        radius = ASTEROID_MIN_RADIUS * rng.randint(1, ASTEROID_KINDS)
+        size = Asteroid.size_for_radius(radius)
+        frames = Asteroid.frames_for_radius(radius) if prescaled else Asteroid.load_asteroid_frames(size)
+        asteroid = Asteroid(rng.uniform(0, SCREEN_WIDTH), rng.uniform(0, SCREEN_HEIGHT), radius, frames)
+        asteroid.current_frame = rng.randrange(len(frames))
+        asteroids.append(asteroid)
+    return asteroids
+
+
+def main():
+    print(f"{'asteroids':>10} {'before us/ast':>14} {'after us/ast':>13} {'speedup':>8}")
+    for count in COUNTS:
+        old = make_asteroids(count, prescaled=False)
+        new = make_asteroids(count, prescaled=True)
+
+        def run_old():
+            for _ in range(FRAMES):
+                for asteroid in old:
+                    draw_rescaled(asteroid, screen)
+
+        def run_new():
+            for _ in range(FRAMES):
+                for asteroid in new:
+                    asteroid.draw(screen)
+
+        before = time_call(run_old) / (FRAMES * count) * 1e6
+        after = time_call(run_new) / (FRAMES * count) * 1e6
+        print(f"{count:>10} {before:>14.2f} {after:>13.2f} {before / after:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Compares loading every animation from loose PNGs against packed bundles.
+
+Each run happens in a fresh interpreter and loads the frame sets the game
+uses through the normal loaders in asteroid.py and player.py. Resident
+memory is measured before and after. Bundles are built first if missing.
+"""
+import json
+import os
+import subprocess
+import sys
+import time
+
+MODES = ("loose", "bundle")
+
+
+def resident_mb():
+    """Current resident set size of this process in MB."""
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+def load_animations(mode):
+    """Loads every animation frame set; called in a child process so caches start empty."""
+    from benchmarks.common import init_pygame
+
+    init_pygame()
+    import assets
+    from asteroid import Asteroid
+    from constants import ASTEROID_KINDS, ASTEROID_MIN_RADIUS
+    from player import Player
+
+    assets.use_bundles = mode == "bundle"
+    before = resident_mb()
+    start = time.perf_counter()
+    frames = Player.load_explosion_frames() + Asteroid.load_explosion_frames()
+    for kind in range(1, ASTEROID_KINDS + 1):
+        frames += Asteroid.frames_for_radius(ASTEROID_MIN_RADIUS * kind)
+    seconds = time.perf_counter() - start
+    return {"mode": mode, "ms": seconds * 1000, "frames": len(frames), "rss_mb": resident_mb() - before}
+
+
+def main():
+    import bundle
+
+    if not all(os.path.exists(bundle.bundle_path(pattern)) for pattern in bundle.ANIMATIONS):
+        subprocess.run([sys.executable, "bundle.py"], check=True, stdout=subprocess.DEVNULL)
+
+    print(f"{'mode':<8} {'load ms':>9} {'frames':>7} {'RSS growth MB':>14}")
+    for mode in MODES:
+        script = f"import json; from benchmarks.bench_bundle import load_animations; print(json.dumps(load_animations({mode!r})))"
+        output = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True).stdout
+        r = json.loads(output.splitlines()[-1])
+        print(f"{mode:<8} {r['ms']:>9.1f} {r['frames']:>7} {r['rss_mb']:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Stress test for the spatial-hash broad phase.
+
+Resolves the same shot/asteroid hits with the old nested scan and with the
+grid, checks that both produce identical results, and reports how the cost
+grows with the number of entities.
+"""
+import math
+import random
+import time
+
+from circleshape import CircleShape
+from collision import SpatialHash
+from constants import *
+
+COUNTS = (250, 500, 1000, 2000, 4000)
+
+
+class Body(CircleShape):
+    """Minimal stand-in for Asteroid that splits without loading any assets."""
+
+    created = 0
+
+    def __init__(self, x, y, radius):
+        super().__init__(x, y, radius)
+        self.exploding = False
+        self.index = Body.created  # Stable id for comparing results
+        Body.created += 1
+
+    def split(self):
+        self.exploding = True
+        if self.radius <= ASTEROID_MIN_RADIUS:
+            return []
+        return [Body(self.position.x, self.position.y, self.radius - ASTEROID_MIN_RADIUS) for _ in range(2)]
+
+
+def make_world(count):
+    Body.created = 0
+    rng = random.Random(count)
+    # Scale the play area with the entity count so density stays constant
+    side = math.sqrt(count) * 60
+    asteroids = [
+        Body(rng.uniform(0, side), rng.uniform(0, side), ASTEROID_MIN_RADIUS * rng.randint(1, ASTEROID_KINDS))
+        for _ in range(count)
+    ]
+    shots = [Body(rng.uniform(0, side), rng.uniform(0, side), SHOT_RADIUS) for _ in range(count)]
+    return shots, asteroids
+
+
+def resolve_scan(shots, asteroids):
+    hits = []
+    for i, shot in enumerate(shots):
+        for asteroid in list(asteroids):  # Snapshot, like iterating a sprite group
+            if not asteroid.exploding and shot.collision(asteroid):
+                hits.append((i, asteroid.index))
+                asteroids.extend(asteroid.split())
+                break
+    return hits
+
+
+def resolve_grid(shots, asteroids):
+    hits = []
+    grid = SpatialHash()
+    grid.build(asteroids)
+    for i, shot in enumerate(shots):
+        for asteroid in grid.query(shot.position, shot.radius):
+            if not asteroid.exploding and shot.collision(asteroid):
+                hits.append((i, asteroid.index))
+                for piece in asteroid.split():
+                    grid.insert(piece)
+                break
+    return hits
+
+
+def main():
+    print(f"{'entities':>9} {'scan ms':>9} {'grid ms':>9} {'hits':>6}")
+    previous = None
+    for count in COUNTS:
+        start = time.perf_counter()
+        expected = resolve_scan(*make_world(count))
+        scan = time.perf_counter() - start
+
+        start = time.perf_counter()
+        actual = resolve_grid(*make_world(count))
+        grid = time.perf_counter() - start
+
+        assert actual == expected, f"grid results differ from the scan at {count} entities"
+        line = f"{count * 2:>9} {scan * 1000:>9.1f} {grid * 1000:>9.1f} {len(actual):>6}"
+        if previous:
+            # Growth exponent between steps: ~2 is quadratic, ~1 is linear
+            scan_exp = math.log(scan / previous[0], 2)
+            grid_exp = math.log(grid / previous[1], 2)
+            line += f"   scan ~n^{scan_exp:.2f}  grid ~n^{grid_exp:.2f}"
+        print(line)
+        previous = (scan, grid)
+
+
+if __name__ == "__main__":
+    main()
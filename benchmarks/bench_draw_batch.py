@@ -0,0 +1,67 @@
+"""
+Sprite draw time at high entity counts: one blit per sprite against the
+render queue's one `blits` call per layer, with and without grouping by
+source surface.
+"""
+import time
+
+from benchmarks.common import init_pygame
+
+screen = init_pygame()
+
+import pygame
+import headless
+from constants import *
+from game import Game
+from player import Shot
+from renderer import RenderQueue
+
+COUNTS = (250, 1000, 2500, 5000)  # Asteroids; a quarter as many shots are added
+FRAMES = 20
+MODES = ("per sprite", "queue", "queue, sorted")
+
+
+def make_game(count):
+    """A game with `count` asteroids at various animation frames and count / 4 shots."""
+    game = Game(seed=count)
+    game.verbose = False
+    headless.populate(game, count)
+    rng = game.rng
+    for asteroid in game.asteroids:
+        asteroid.current_frame = rng.randrange(len(asteroid.frames))
+    for _ in range(count // 4):
+        velocity = pygame.Vector2(0, PLAYER_SHOOT_SPEED).rotate(rng.uniform(0, 360))
+        Shot.create(rng.uniform(0, SCREEN_WIDTH), rng.uniform(0, SCREEN_HEIGHT), velocity, rng.uniform(0, 360))
+    return game
+
+
+def time_draw(game, queue):
+    """Returns ms per frame spent in `Game.draw`, best of three runs."""
+    background = screen.copy()
+    best = float("inf")
+    for _ in range(3):
+        elapsed = 0.0
+        for _ in range(FRAMES):
+            screen.blit(background, (0, 0))
+            start = time.perf_counter()
+            game.draw(screen, queue)
+            elapsed += time.perf_counter() - start
+        best = min(best, elapsed)
+    return best / FRAMES * 1000
+
+
+def main():
+    print(f"{'asteroids':>10} {'shots':>6} " + " ".join(f"{mode + ' ms':>17}" for mode in MODES) + f" {'speedup':>8}")
+    for count in COUNTS:
+        game = make_game(count)
+        results = [
+            time_draw(game, None),
+            time_draw(game, RenderQueue(sort=False)),
+            time_draw(game, RenderQueue(sort=True)),
+        ]
+        line = " ".join(f"{ms:>17.2f}" for ms in results)
+        print(f"{count:>10} {len(game.shots):>6} {line} {results[0] / min(results[1:]):>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Cost of advancing the explosion and debris effects per tick, with the NumPy
+column update and with the plain per-row loop, as the live effect count grows.
+"""
+import time
+
+from benchmarks.common import init_pygame
+
+screen = init_pygame()
+
+import pygame
+import effects
+from constants import *
+
+COUNTS = (100, 1000, 10000)  # Live effects
+TICKS = 60
+
+
+def fill(system, count):
+    """Spawns `count` long-running effects spread over the screen."""
+    frames = [pygame.Surface((4, 4))] * 10_000  # Long enough that nothing finishes during the run
+    rng = system.rng
+    for _ in range(count):
+        system.spawn(frames, rng.uniform(0, SCREEN_WIDTH), rng.uniform(0, SCREEN_HEIGHT), rng.uniform(-50, 50), 0)
+
+
+def time_update(count, vectorized):
+    """Returns microseconds per `Effects.update` call with `count` live effects."""
+    numpy = effects.np
+    if not vectorized:
+        effects.np = None
+    try:
+        system = effects.Effects(seed=count)
+        fill(system, count)
+        start = time.perf_counter()
+        for _ in range(TICKS):
+            system.update(1 / SIMULATION_RATE)
+        return (time.perf_counter() - start) / TICKS * 1e6
+    finally:
+        effects.np = numpy
+
+
+def main():
+    if effects.np is None:
+        raise SystemExit("This benchmark compares against the NumPy update; install numpy")
+    print(f"{'effects':>8} {'loop us':>10} {'numpy us':>10} {'speedup':>8}")
+    for count in COUNTS:
+        loop = time_update(count, vectorized=False)
+        vectorized = time_update(count, vectorized=True)
+        print(f"{count:>8} {loop:>10.1f} {vectorized:>10.1f} {loop / vectorized:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
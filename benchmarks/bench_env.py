@@ -0,0 +1,68 @@
+"""
+Training environment throughput.
+
+Reports steps per second of one in-process `AsteroidsEnv`, then of a
+`VectorEnv` with a growing number of worker processes (ENVS_PER_WORKER
+games each), and how close each gets to linear scaling.
+
+    python -m benchmarks.bench_env --workers 1 2 4 8
+"""
+import argparse
+import multiprocessing
+import time
+
+import numpy as np
+from env import ACTIONS, AsteroidsEnv, VectorEnv
+
+STEPS = 2000
+ENVS_PER_WORKER = 4
+
+
+def single_env():
+    """Steps per second of one environment, with random actions."""
+    env = AsteroidsEnv(seed=0)
+    env.reset()
+    rng = np.random.default_rng(0)
+    actions = rng.integers(len(ACTIONS), size=STEPS).tolist()
+    start = time.perf_counter()
+    for action in actions:
+        _, _, terminated, truncated, _ = env.step(action)
+        if terminated or truncated:
+            env.reset()
+    return STEPS / (time.perf_counter() - start)
+
+
+def vector_env(workers):
+    """Total steps per second of a VectorEnv with `workers` processes."""
+    num_envs = workers * ENVS_PER_WORKER
+    rng = np.random.default_rng(0)
+    with VectorEnv(num_envs, workers=workers, seed=0) as env:
+        env.reset()
+        rounds = STEPS // ENVS_PER_WORKER
+        start = time.perf_counter()
+        for _ in range(rounds):
+            env.step(rng.integers(len(ACTIONS), size=num_envs))
+        return rounds * num_envs / (time.perf_counter() - start)
+
+
+def main():
+    cpus = multiprocessing.cpu_count()
+    default = [n for n in (1, 2, 4, 8, 16, 32) if n <= cpus]
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=default, help="worker counts to measure")
+    args = parser.parse_args()
+
+    print(f"single env: {single_env():.0f} steps/s ({cpus} CPUs)")
+    print(f"{'workers':>8} {'envs':>5} {'steps/s':>9} {'per worker':>11} {'scaling':>8}")
+    base = None
+    for workers in args.workers:
+        rate = vector_env(workers)
+        base = base or rate / workers
+        print(
+            f"{workers:>8} {workers * ENVS_PER_WORKER:>5} {rate:>9.0f} {rate / workers:>11.0f} "
+            f"{rate / (base * workers):>7.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
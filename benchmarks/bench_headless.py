@@ -0,0 +1,97 @@
+"""
+Throughput benchmark suite for the headless simulation.
+
+Runs every scripted scenario (fixed seeds) in a fresh process and reports
+ticks per second, per-phase milliseconds per tick and peak memory. Results
+can be saved as JSON and compared against a saved baseline, which exits with
+an error when a scenario got slower than the allowed tolerance:
+
+    python -m benchmarks.bench_headless --json baseline.json
+    python -m benchmarks.bench_headless --baseline baseline.json --tolerance 0.2
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+SCENARIO_NAMES = ("idle", "spin-and-fire", "barrage", "swarm")
+
+
+def run_scenario(name, batched, draw, heap):
+    """Runs one scenario; called in a child process so memory is per scenario."""
+    import resource
+    import tracemalloc
+
+    import headless
+
+    headless.init()
+    if heap:
+        tracemalloc.start()
+    result = headless.run(name, batched=batched, draw=draw)
+    heap_peak = tracemalloc.get_traced_memory()[1] / 2**20 if heap else None
+    tracemalloc.stop()
+
+    ticks = result["ticks"]
+    return {
+        "scenario": name + (" [batched]" if batched else ""),
+        "ticks": ticks,
+        "ticks_per_second": ticks / result["seconds"],
+        "phases_ms": {phase: seconds / ticks * 1000 for phase, seconds in result["timings"].items()},
+        "heap_peak_mb": heap_peak,
+        "rss_peak_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", action="append", choices=SCENARIO_NAMES, help="run only these scenarios")
+    parser.add_argument("--batched", action="store_true", help="also run each scenario in batched mode")
+    parser.add_argument("--no-draw", action="store_true", help="skip the draw phase")
+    parser.add_argument("--heap", action="store_true", help="trace the Python heap peak (slows every phase down)")
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--baseline", help="compare ticks/s against a previous --json file")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown vs the baseline (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    jobs = [(name, False) for name in args.scenario or SCENARIO_NAMES]
+    if args.batched:
+        jobs += [(name, True) for name, _ in jobs]
+
+    results = []
+    for name, batched in jobs:
+        # A fresh interpreter per scenario keeps peak memory and caches separate
+        call = f"run_scenario({name!r}, {batched}, {not args.no_draw}, {args.heap})"
+        script = f"import json; from benchmarks.bench_headless import run_scenario; print(json.dumps({call}))"
+        output = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True).stdout
+        results.append(json.loads(output.splitlines()[-1]))
+
+    print(f"{'scenario':<24} {'ticks/s':>9} {'update':>8} {'spawn':>8} {'collide':>8} {'draw':>8} {'heap MB':>8} {'rss MB':>8}")
+    for r in results:
+        ms = r["phases_ms"]
+        heap = "-" if r["heap_peak_mb"] is None else f"{r['heap_peak_mb']:.1f}"
+        print(
+            f"{r['scenario']:<24} {r['ticks_per_second']:>9.0f} {ms['update']:>8.3f} {ms['spawn']:>8.3f} "
+            f"{ms['collision']:>8.3f} {ms['draw']:>8.3f} {heap:>8} {r['rss_peak_mb']:>8.1f}"
+        )
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = {r["scenario"]: r for r in json.load(f)}
+        regressions = []
+        for r in results:
+            before = baseline.get(r["scenario"])
+            if before and r["ticks_per_second"] < before["ticks_per_second"] * (1 - args.tolerance):
+                regressions.append(
+                    f"{r['scenario']}: {before['ticks_per_second']:.0f} -> {r['ticks_per_second']:.0f} ticks/s"
+                )
+        if regressions:
+            print("Performance regressions:\n  " + "\n  ".join(regressions))
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Multiplayer bandwidth and server cost as the asteroid count grows.
+
+A server and bot clients run over UDP on 127.0.0.1, with ticks as fast as
+the machine allows. For each asteroid count it reports the server's time
+per tick (simulation plus snapshot encoding), the average delta snapshot
+size and bandwidth per client, and the size a full (non-delta) snapshot of
+the final world would have without the datagram cap, for comparison.
+"""
+import asyncio
+
+from benchmarks.common import init_pygame
+
+init_pygame()
+
+import net
+from constants import *
+
+COUNTS = (0, 100, 500, 1000, 2000)
+CLIENTS = 4
+TICKS = SIMULATION_RATE * 10
+
+
+def run(asteroids):
+    server, bots = asyncio.run(net.loopback(CLIENTS, TICKS, asteroids, realtime=False))
+    game = server.game
+    players = [(c.slot, *c.player.position, c.player.rotation, 0) for c in server.connections.values()]
+    full, _ = net.encode_snapshot(server.ticks, net.entity_records(game), {}, 0, players, max_size=None)
+    snapshots = sum(c.snapshots for c in server.connections.values())
+    sent = sum(c.bytes_sent for c in server.connections.values())
+    return {
+        "entities": len(game.asteroids) + len(game.shots),
+        "tick_ms": server.stats["tick_seconds"] / server.ticks * 1000,
+        "snapshot_ms": server.stats["snapshot_seconds"] / server.ticks * 1000,
+        "delta_bytes": sent / snapshots,
+        "full_bytes": len(full),
+        "kb_per_second": sent / CLIENTS / (server.ticks / SIMULATION_RATE) / 1000,
+        "dropped": sum(bot.stats["dropped"] for bot in bots),
+    }
+
+
+def main():
+    print(
+        f"{'asteroids':>10} {'entities':>9} {'tick ms':>8} {'snapshot ms':>12} {'delta B':>8} "
+        f"{'full B':>7} {'kB/s/client':>12} {'dropped':>8}"
+    )
+    for count in COUNTS:
+        r = run(count)
+        print(
+            f"{count:>10} {r['entities']:>9} {r['tick_ms']:>8.2f} {r['snapshot_ms']:>12.2f} {r['delta_bytes']:>8.0f} "
+            f"{r['full_bytes']:>7} {r['kb_per_second']:>12.1f} {r['dropped']:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Compares pixels pushed and frame time for full-screen redraws against dirty rects."""
+import random
+import time
+
+from benchmarks.common import init_pygame
+
+screen = init_pygame()
+
+import pygame
+import headless
+from constants import *
+from game import Game
+from player import Player
+from renderer import Hud, Renderer
+
+SCENARIOS = ("idle", "spin-and-fire", "barrage", "swarm")
+FRAMES = 300
+
+
+def make_background():
+    """A noisy stand-in for the map image, so blits cost the same as a real picture."""
+    rng = random.Random(0)
+    background = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    for _ in range(2000):
+        color = (rng.randrange(64), rng.randrange(64), rng.randrange(96))
+        background.fill(color, (rng.randrange(SCREEN_WIDTH), rng.randrange(SCREEN_HEIGHT), 40, 40))
+    return background.convert()
+
+
+def run(name, dirty, background, font, life_sprites):
+    """Runs a scenario for `FRAMES` frames and returns (pixels per frame, ms per frame, full frames)."""
+    scenario = headless.SCENARIOS[name]
+    game = Game(seed=scenario["seed"])
+    headless.populate(game, scenario["asteroids"])
+    game.player.make_invincible(float("inf"))
+    renderer = Renderer(screen, background, Hud(font, life_sprites), dirty)
+
+    dt = 1 / SIMULATION_RATE
+    render_time = 0.0
+    for tick in range(FRAMES):
+        game.player.controls = scenario["controls"](tick)
+        game.step(dt)
+        start = time.perf_counter()
+        renderer.render(game)
+        render_time += time.perf_counter() - start
+    return renderer.pixels / FRAMES, render_time / FRAMES * 1000, renderer.full_frames
+
+
+def main():
+    background = make_background()
+    font = pygame.font.Font(None, 36)
+    life_sprites = Player.load_life_sprites()
+
+    print(
+        f"{'scenario':<14} {'full px/frame':>14} {'dirty px/frame':>15} {'pushed':>7} "
+        f"{'full ms':>8} {'dirty ms':>9} {'full frames':>12}"
+    )
+    for name in SCENARIOS:
+        full_pixels, full_ms, _ = run(name, False, background, font, life_sprites)
+        dirty_pixels, dirty_ms, full_frames = run(name, True, background, font, life_sprites)
+        print(
+            f"{name:<14} {full_pixels:>14.0f} {dirty_pixels:>15.0f} {dirty_pixels / full_pixels:>6.1%} "
+            f"{full_ms:>8.3f} {dirty_ms:>9.3f} {full_frames:>12}"
+        )
+
+
+if __name__ == "__main__":
+    main()
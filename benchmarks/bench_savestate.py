@@ -0,0 +1,50 @@
+"""
+Save state size and latency as the world grows.
+
+For each entity count it reports the save state size, plain and
+compressed, and the best time to save, restore in place, load into a new
+game, `fork` a copy, and start and finish a (no-op) `lookahead`.
+"""
+from benchmarks.common import init_pygame, time_call
+
+init_pygame()
+
+import headless
+import savestate
+from game import Game
+
+COUNTS = (100, 1000, 10000)  # Asteroids on screen
+
+
+def run(count):
+    game = Game(seed=count)
+    headless.populate(game, count)
+    data = savestate.save(game)
+    compressed = savestate.save(game, compress=True)
+    return {
+        "entities": len(game.asteroids) + len(game.shots) + len(game.players),
+        "bytes": len(data),
+        "compressed": len(compressed),
+        "save_ms": time_call(lambda: savestate.save(game)) * 1000,
+        "restore_ms": time_call(lambda: savestate.restore(game, data)) * 1000,
+        "load_ms": time_call(lambda: savestate.load(data)) * 1000,
+        "fork_ms": time_call(lambda: savestate.fork(game)) * 1000,
+        "lookahead_ms": time_call(lambda: savestate.lookahead(game, lambda copy: copy.score)) * 1000,
+    }
+
+
+def main():
+    print(
+        f"{'entities':>8} {'bytes':>8} {'zlib':>8} {'save ms':>8} {'restore ms':>11} {'load ms':>8} "
+        f"{'fork ms':>8} {'lookahead ms':>13}"
+    )
+    for count in COUNTS:
+        r = run(count)
+        print(
+            f"{r['entities']:>8} {r['bytes']:>8} {r['compressed']:>8} {r['save_ms']:>8.2f} {r['restore_ms']:>11.2f} "
+            f"{r['load_ms']:>8.2f} {r['fork_ms']:>8.2f} {r['lookahead_ms']:>13.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
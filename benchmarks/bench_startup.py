@@ -0,0 +1,82 @@
+"""
+Time to first frame with and without the threaded preload.
+
+Each mode runs in a fresh interpreter. "cold" is the first startup, with
+empty asset caches; "warm" is a second startup in the same process, with
+the caches filled. After the cold startup 600 ticks are played, and the
+disk reads and worst frame during play show whether assets were still
+loaded lazily mid-game.
+"""
+import json
+import subprocess
+import sys
+import time
+
+MODES = ("lazy", "preload")
+PLAY_TICKS = 600
+
+
+def startup(use_preload):
+    """Starts the game up to its first rendered frame and returns the seconds taken and the game."""
+    import pygame
+    import preload
+    from constants import SCREEN_WIDTH, SCREEN_HEIGHT
+    from game import Game
+    from player import Player
+    from renderer import Hud, Renderer
+
+    start = time.perf_counter()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.mixer.init()
+    font = pygame.font.Font(None, 36)
+    if use_preload:
+        preload.preload(preload.LoadingScreen(screen, font))
+
+    background = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert()  # The map image is not in the repo
+    game = Game(seed=1)
+    renderer = Renderer(screen, background, Hud(font, Player.load_life_sprites()))
+    renderer.render(game)
+    return time.perf_counter() - start, game, renderer
+
+
+def run_mode(mode):
+    """Measures one mode; called in a child process so every run starts cold."""
+    import assets
+    import headless
+    from constants import SIMULATION_RATE
+
+    headless.init()
+    cold, game, renderer = startup(mode == "preload")
+
+    reads = assets.stats["disk_reads"]
+    worst = 0.0
+    game.player.make_invincible(float("inf"))
+    for tick in range(PLAY_TICKS):
+        game.player.controls = headless.patrol(tick)
+        start = time.perf_counter()
+        game.step(1 / SIMULATION_RATE)
+        renderer.render(game)
+        worst = max(worst, time.perf_counter() - start)
+    play_reads = assets.stats["disk_reads"] - reads
+
+    warm, _, _ = startup(mode == "preload")
+    return {
+        "mode": mode,
+        "cold_ms": cold * 1000,
+        "warm_ms": warm * 1000,
+        "play_reads": play_reads,
+        "worst_ms": worst * 1000,
+    }
+
+
+def main():
+    print(f"{'mode':<8} {'cold ms':>9} {'warm ms':>9} {'reads in play':>14} {'worst frame ms':>15}")
+    for mode in MODES:
+        script = f"import json; from benchmarks.bench_startup import run_mode; print(json.dumps(run_mode({mode!r})))"
+        output = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True).stdout
+        r = json.loads(output.splitlines()[-1])
+        print(f"{mode:<8} {r['cold_ms']:>9.1f} {r['warm_ms']:>9.1f} {r['play_reads']:>14} {r['worst_ms']:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
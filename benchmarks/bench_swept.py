@@ -0,0 +1,89 @@
+"""
+Swept shot collision: tunneling under long ticks, and the batch API's cost.
+
+Shots are fired straight at small asteroids and moved with ticks of growing
+length. The point-in-time overlap test misses every asteroid a shot passes
+within a single tick; the swept test catches all of them. The second table
+checks the vectorized `times_of_impact` against the scalar test and times
+both.
+"""
+import random
+import time
+
+import numpy as np
+import pygame
+from circleshape import CircleShape
+from collision import circles_overlap, earliest_impacts, time_of_impact, times_of_impact
+from constants import *
+
+TICK_LENGTHS = (1 / 120, 1 / 60, 1 / 20, 1 / 10, 1 / 4)
+TRIALS = 2000
+BATCH_SIZES = ((50, 200), (200, 1000), (500, 2000))
+
+
+def tunneling(dt, rng):
+    """Returns (point hits, swept hits) for shots aimed at a small asteroid."""
+    point = swept = 0
+    for _ in range(TRIALS):
+        asteroid = CircleShape(0, 0, ASTEROID_MIN_RADIUS)
+        distance = rng.uniform(ASTEROID_MIN_RADIUS + SHOT_RADIUS, 200)
+        shot = CircleShape(-distance, rng.uniform(-ASTEROID_MIN_RADIUS, ASTEROID_MIN_RADIUS), SHOT_RADIUS)
+        shot.velocity = pygame.Vector2(PLAYER_SHOOT_SPEED, 0)
+        point_hit = swept_hit = False
+        while shot.position.x < 250 and not (point_hit and swept_hit):
+            shot.previous_position.update(shot.position)
+            shot.position += shot.velocity * dt
+            point_hit = point_hit or circles_overlap(shot, asteroid)
+            swept_hit = swept_hit or time_of_impact(shot, asteroid) is not None
+        point += point_hit
+        swept += swept_hit
+    return point, swept
+
+
+def random_bodies(count, radii, speed, rng):
+    """Returns start positions, end positions and radii of bodies moving for one tick."""
+    starts = rng.uniform((0, 0), (SCREEN_WIDTH, SCREEN_HEIGHT), (count, 2))
+    angles = rng.uniform(0, 2 * np.pi, count)
+    moves = np.stack((np.cos(angles), np.sin(angles)), axis=1) * speed / SIMULATION_RATE
+    return starts, starts + moves, rng.choice(radii, count)
+
+
+def main():
+    rng = random.Random(0)
+    print(f"{'tick ms':>8} {'point hits':>11} {'swept hits':>11}")
+    for dt in TICK_LENGTHS:
+        point, swept = tunneling(dt, rng)
+        print(f"{dt * 1000:>8.1f} {point / TRIALS:>11.1%} {swept / TRIALS:>11.1%}")
+
+    print()
+    print(f"{'shots':>6} {'asteroids':>10} {'scalar ms':>10} {'batch ms':>9} {'hits':>5}")
+    np_rng = np.random.default_rng(0)
+    asteroid_radii = [ASTEROID_MIN_RADIUS * kind for kind in range(1, ASTEROID_KINDS + 1)]
+    for shots, asteroids in BATCH_SIZES:
+        shot_bodies = random_bodies(shots, [SHOT_RADIUS], PLAYER_SHOOT_SPEED, np_rng)
+        asteroid_bodies = random_bodies(asteroids, asteroid_radii, 100, np_rng)
+
+        start = time.perf_counter()
+        times = times_of_impact(*shot_bodies, *asteroid_bodies)
+        hits = [hit for hit in earliest_impacts(times) if hit is not None]
+        batch = time.perf_counter() - start
+
+        shapes = []
+        for starts, ends, radii in (shot_bodies, asteroid_bodies):
+            group = []
+            for (x0, y0), (x1, y1), radius in zip(starts, ends, radii):
+                body = CircleShape(x1, y1, radius)
+                body.previous_position.update(x0, y0)
+                group.append(body)
+            shapes.append(group)
+        start = time.perf_counter()
+        scalar = [[time_of_impact(shot, asteroid) for asteroid in shapes[1]] for shot in shapes[0]]
+        scalar_seconds = time.perf_counter() - start
+
+        expected = np.array([[np.inf if t is None else t for t in row] for row in scalar])
+        assert np.allclose(times, expected), "batch and scalar impact times differ"
+        print(f"{shots:>6} {asteroids:>10} {scalar_seconds * 1000:>10.1f} {batch * 1000:>9.2f} {len(hits):>5}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+import os
+import time
+
+
+def init_pygame(width=1280, height=720):
+    """Initializes pygame on the SDL dummy drivers and returns the screen."""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    import pygame
+
+    pygame.init()
+    return pygame.display.set_mode((width, height))
+
+
+def time_call(func, repeat=5):
+    """Returns the best wall-clock time of `repeat` calls to func, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
@@ -0,0 +1,104 @@
+"""
+Packed animation bundles.
+
+A bundle holds every frame of one animation, already decoded, in a single
+file next to the loose PNGs: a header, an index of (tile number, width,
+height, offset) entries, then raw 32-bit pixels. The pixels are stored in
+BGRA byte order, which is the layout `convert_alpha` produces on common
+displays, so frames can be used straight from the memory map without a
+decode or a copy. `assets.load_frames` reads a bundle when one exists and
+falls back to the loose files otherwise.
+
+Build (or rebuild after changing the art) with:
+
+    python bundle.py
+"""
+import mmap
+import os
+import struct
+
+import pygame
+
+MAGIC = b"FRMS"
+VERSION = 1
+PIXEL_FORMAT = "BGRA"
+HEADER = struct.Struct("<4sHH4s")  # magic, version, frame count, pixel format
+ENTRY = struct.Struct("<HHHQ")  # tile number, width, height, pixel data offset
+ALIGNMENT = 64  # Pixel data of each frame starts on a cache line
+
+# Frame patterns and tile counts of every animation that gets a bundle
+ANIMATIONS = {
+    "sprites/asteroids/large/tile{:03}.png": 48,
+    "sprites/asteroids/medium/tile{:03}.png": 48,
+    "sprites/asteroids/small/tile{:03}.png": 48,
+    "sprites/asteroids/destroyed/tile{:03}.png": 17,
+    "sprites/player/destroyed/tile{:03}.png": 64,
+}
+
+
+def bundle_path(pattern):
+    """Returns where the bundle for a frame pattern lives."""
+    return os.path.join(os.path.dirname(pattern), "frames.bundle")
+
+
+def build(pattern, count, path=None):
+    """
+    Decodes the loose frames matching `pattern` and writes them as a bundle.
+
+    Missing tiles are skipped, like `assets.load_frames` does.
+
+    :param pattern: Format string taking the tile number, e.g. "tile{:03}.png".
+    :param count: Number of tile numbers to try.
+    :param path: Output file, defaults to `bundle_path(pattern)`.
+    :return: The path written and the number of frames in it.
+    """
+    frames = []
+    for i in range(count):
+        try:
+            frames.append((i, pygame.image.load(pattern.format(i))))
+        except FileNotFoundError:
+            continue
+
+    path = path or bundle_path(pattern)
+    offset = HEADER.size + ENTRY.size * len(frames)
+    entries = []
+    for i, frame in frames:
+        offset += -offset % ALIGNMENT
+        entries.append(ENTRY.pack(i, frame.get_width(), frame.get_height(), offset))
+        offset += frame.get_width() * frame.get_height() * 4
+
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(frames), PIXEL_FORMAT.encode()))
+        f.write(b"".join(entries))
+        for entry, (_, frame) in zip(entries, frames):
+            f.write(bytes(ENTRY.unpack(entry)[3] - f.tell()))  # Alignment padding
+            f.write(pygame.image.tobytes(frame, PIXEL_FORMAT))
+    return path, len(frames)
+
+
+def read(path):
+    """
+    Memory-maps a bundle and returns its frames as {tile number: Surface}.
+
+    The surfaces share the mapped file instead of holding a copy, so pages
+    are only read from disk as frames are used.
+    """
+    with open(path, "rb") as f:
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, version, count, pixel_format = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path} is not a version {VERSION} frame bundle")
+
+    view = memoryview(data)
+    frames = {}
+    for n in range(count):
+        i, width, height, offset = ENTRY.unpack_from(data, HEADER.size + n * ENTRY.size)
+        pixels = view[offset : offset + width * height * 4]
+        frames[i] = pygame.image.frombuffer(pixels, (width, height), pixel_format.decode())
+    return frames
+
+
+if __name__ == "__main__":
+    for pattern, count in ANIMATIONS.items():
+        path, frames = build(pattern, count)
+        print(f"{path}: {frames} frames, {os.path.getsize(path) / 2**20:.1f} MB")
@@ -1,7 +1,23 @@
+import itertools
+
 import pygame
+from collision import circles_overlap
 
 class CircleShape(pygame.sprite.Sprite):
     PLAYER_RADIUS = 20
+    max_age = None  # Seconds before LifetimeManager removes the shape, None to keep it
+    pool = None  # Pool that killed shapes are returned to, if any
+    render_alpha = 1.0  # Interpolation factor between the last two ticks, set before drawing
+    layer = 0  # Draw order in a RenderQueue, higher layers go on top
+    ids = itertools.count(1)  # Source of entity ids, replaced by the game's own counter
+
+    @classmethod
+    def create(cls, *args):
+        """Builds a shape, reusing a pooled instance when the class has a pool."""
+        if cls.pool is not None:
+            return cls.pool.acquire(*args)
+        return cls(*args)
+
     def __init__(self, x, y, radius):
         if hasattr(self, "containers"):
             super().__init__(self.containers)
@@ -9,9 +25,43 @@ class CircleShape(pygame.sprite.Sprite):
             super().__init__()
 
         self.position = pygame.Vector2(x, y)
+        self.previous_position = pygame.Vector2(x, y)  # Position at the previous tick
         self.velocity = pygame.Vector2(0, 0)
         self.radius = radius
+        self.age = 0  # Advanced by LifetimeManager
+        self.pooled = None  # None if not pool-managed, True while in the pool's free list
+        self.entity_id = next(CircleShape.ids)  # Unique in its game, a reused shape gets a new one
+
+    def reset(self, x, y, radius):
+        """Reinitializes a pooled shape in place and adds it back to its containers."""
+        if hasattr(self, "containers"):
+            self.add(self.containers)
+
+        self.position.update(x, y)
+        self.previous_position.update(x, y)
+        self.velocity.update(0, 0)
+        self.radius = radius
+        self.age = 0
+        self.pooled = False
+        self.entity_id = next(CircleShape.ids)
+
+    def kill(self):
+        """Removes the shape from all groups and returns it to its pool."""
+        super().kill()
+        if self.pooled is False:
+            self.pooled = True
+            self.pool.release(self)
 
+    def render_position(self):
+        """Returns where to draw the shape, interpolated between the last two ticks."""
+        return self.previous_position.lerp(self.position, CircleShape.render_alpha)
+
+    def blit_item(self):
+        """
+        Returns the (surface, rect) to blit this frame, or None to fall back
+        to `draw` (nothing to blit, or a shape drawn without a surface).
+        """
+        return None
 
     def draw(self, screen):
         pass
@@ -25,6 +75,4 @@ class CircleShape(pygame.sprite.Sprite):
             if not isinstance(other, CircleShape):
                 raise ValueError("collision() requires another CircleShape instance.")
 
-            distance = self.position.distance_to(other.position)
-
-            return distance <= (self.radius + other.radius)
\ No newline at end of file
+            return circles_overlap(self, other)
\ No newline at end of file
@@ -0,0 +1,201 @@
+import itertools
+import math
+
+from constants import *
+
+try:
+    import numpy as np
+except ImportError:  # Only the batched API needs NumPy
+    np = None
+
+# Each cell is as wide as the largest asteroid, so a circle never spans
+# more than a 2x2 block of cells.
+CELL_SIZE = ASTEROID_MAX_RADIUS * 2
+
+
+def circles_overlap(a, b):
+    """Checks if two circle shapes overlap, without taking a square root."""
+    dx = a.position.x - b.position.x
+    dy = a.position.y - b.position.y
+    reach = a.radius + b.radius
+    return dx * dx + dy * dy <= reach * reach
+
+
+def time_of_impact(a, b):
+    """
+    Swept circle test over the last tick.
+
+    Both shapes move in a straight line from `previous_position` to
+    `position`, so the test is done on their relative motion: a segment
+    against a circle of the combined radius.
+
+    :return: Fraction of the tick (0 to 1) at which the shapes first touch,
+        or None if they don't touch during the tick.
+    """
+    start_x = a.previous_position.x - b.previous_position.x
+    start_y = a.previous_position.y - b.previous_position.y
+    move_x = a.position.x - b.position.x - start_x
+    move_y = a.position.y - b.position.y - start_y
+    reach = a.radius + b.radius
+
+    c = start_x * start_x + start_y * start_y - reach * reach
+    if c <= 0:
+        return 0.0  # Already touching at the start of the tick
+    a2 = move_x * move_x + move_y * move_y
+    b2 = start_x * move_x + start_y * move_y
+    discriminant = b2 * b2 - a2 * c
+    if b2 >= 0 or discriminant < 0:
+        return None  # Moving apart, or passing each other
+    t = (-b2 - math.sqrt(discriminant)) / a2
+    return t if t <= 1 else None
+
+
+def times_of_impact(starts, ends, radii, target_starts, target_ends, target_radii):
+    """
+    Vectorized `time_of_impact` for every source/target pair.
+
+    :param starts: (n, 2) source positions at the start of the tick.
+    :param ends: (n, 2) source positions at the end of the tick.
+    :param radii: (n,) source radii.
+    :param target_starts: (m, 2) target positions at the start of the tick.
+    :param target_ends: (m, 2) target positions at the end of the tick.
+    :param target_radii: (m,) target radii.
+    :return: (n, m) array of impact times in [0, 1], inf where there is no hit.
+    """
+    start = starts[:, None, :] - target_starts[None, :, :]
+    move = ends[:, None, :] - target_ends[None, :, :] - start
+    reach = radii[:, None] + target_radii[None, :]
+
+    c = np.einsum("ijk,ijk->ij", start, start) - reach * reach
+    a2 = np.einsum("ijk,ijk->ij", move, move)
+    b2 = np.einsum("ijk,ijk->ij", start, move)
+    discriminant = b2 * b2 - a2 * c
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = (-b2 - np.sqrt(np.maximum(discriminant, 0))) / a2
+    t = np.where((b2 < 0) & (discriminant >= 0) & (t <= 1), t, np.inf)
+    return np.where(c <= 0, 0.0, t)
+
+
+def earliest_impacts(times):
+    """
+    Picks each source's earliest hit from an impact time matrix, like
+    `Game.earliest_impact` does for one shot: on a tie, the target listed
+    first wins.
+
+    :param times: (n, m) array from `times_of_impact`.
+    :return: List with a (target index, time) or None per source.
+    """
+    if not times.shape[1]:
+        return [None] * len(times)
+    columns = np.argmin(times, axis=1)
+    earliest = times[np.arange(len(times)), columns]
+    return [None if t == np.inf else (column, t) for column, t in zip(columns.tolist(), earliest.tolist())]
+
+
+class SpatialHash:
+    """
+    Uniform grid used as the collision broad phase.
+
+    Objects are bucketed by every cell their swept bounding box touches, and queries
+    return the objects in nearby cells in the order they were inserted. Keeping
+    insertion order lets the narrow phase visit candidates in the same order as
+    a plain scan over the sprite group, so hit resolution stays identical.
+    """
+
+    def __init__(self, cell_size=CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.order = {}  # object -> insertion sequence number
+        self.ranges = {}  # object -> cell range it is bucketed in
+        self.sequence = itertools.count()
+
+    def clear(self):
+        """Removes every object from the grid."""
+        self.cells.clear()
+        self.order.clear()
+        self.ranges.clear()
+        self.sequence = itertools.count()
+
+    def _cell_range(self, x, y, radius):
+        size = self.cell_size
+        return (
+            int((x - radius) // size),
+            int((x + radius) // size),
+            int((y - radius) // size),
+            int((y + radius) // size),
+        )
+
+    def _swept_range(self, obj):
+        """Cell range covering a shape's whole path over the last tick."""
+        size = self.cell_size
+        radius = obj.radius
+        x0, y0 = obj.previous_position
+        x1, y1 = obj.position
+        if x0 > x1:
+            x0, x1 = x1, x0
+        if y0 > y1:
+            y0, y1 = y1, y0
+        return (
+            int((x0 - radius) // size),
+            int((x1 + radius) // size),
+            int((y0 - radius) // size),
+            int((y1 + radius) // size),
+        )
+
+    def insert(self, obj):
+        """
+        Adds a circle shape to every cell its path over the last tick touches.
+
+        Inserting an object again (a pooled sprite handed out as a new one)
+        moves it to its new cells and to the end of the order, like the sprite
+        group it was re-added to.
+        """
+        if obj in self.ranges:
+            self.remove(obj)
+        self.order[obj] = next(self.sequence)  # Never reused, so sequence numbers can't tie
+        self.ranges[obj] = x0, x1, y0, y1 = self._swept_range(obj)
+        cells = self.cells
+        if x0 == x1 and y0 == y1:
+            cells.setdefault((x0, y0), []).append(obj)  # Common case: a single cell
+            return
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                cells.setdefault((cx, cy), []).append(obj)
+
+    def remove(self, obj):
+        """Takes an object out of the grid."""
+        x0, x1, y0, y1 = self.ranges.pop(obj)
+        del self.order[obj]
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                self.cells[(cx, cy)].remove(obj)
+
+    def build(self, objects):
+        """Rebuilds the grid from scratch with the given objects."""
+        self.clear()
+        for obj in objects:
+            self.insert(obj)
+
+    def query(self, position, radius):
+        """
+        Returns the objects whose cells overlap the given circle.
+
+        :param position: Center of the query circle.
+        :param radius: Radius of the query circle.
+        :return: Candidate objects, in insertion order, without duplicates.
+        """
+        return self._collect(self._cell_range(position.x, position.y, radius))
+
+    def query_swept(self, obj):
+        """Returns the objects whose cells overlap a shape's path over the last tick."""
+        return self._collect(self._swept_range(obj))
+
+    def _collect(self, cell_range):
+        x0, x1, y0, y1 = cell_range
+        found = set()
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = self.cells.get((cx, cy))
+                if bucket:
+                    found.update(bucket)
+        return sorted(found, key=self.order.__getitem__)
@@ -11,4 +11,13 @@ PLAYER_TURN_SPEED = 300
 PLAYER_SPEED = 200
 SHOT_RADIUS = 5
 PLAYER_SHOOT_SPEED = 500
-PLAYER_SHOOT_COOLDOWN = 0.3
\ No newline at end of file
+PLAYER_SHOOT_COOLDOWN = 0.3
+
+CULL_MARGIN = 100  # Distance outside the screen before an entity is removed
+SHOT_MAX_AGE = 4  # Seconds
+ASTEROID_MAX_AGE = 60  # Seconds
+
+SIMULATION_RATE = 60  # Fixed simulation ticks per second
+MAX_CATCH_UP_STEPS = 5  # Most simulation ticks run for one rendered frame
+RENDER_FPS = 60  # Frame rate cap, 0 for uncapped
+DIRTY_AREA_LIMIT = 0.5  # Fraction of the screen above which a full redraw is cheaper than dirty rects
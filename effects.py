@@ -0,0 +1,180 @@
+"""
+Explosions and debris as a particle system.
+
+A destroyed asteroid leaves the gameplay groups at once and hands its
+explosion over to `Effects`. Every effect is one row of flat columns
+(position, velocity, animation, frame and frame timer) that `update`
+advances in a single pass, vectorized with NumPy when it is installed.
+Effects never collide with anything, so they cost the collision checks
+nothing, and extra debris costs a few array slots instead of a sprite each.
+
+Debris is purely cosmetic and uses its own random generator, so it does not
+change the outcome of a seeded game.
+"""
+import random
+from array import array
+
+import pygame
+from circleshape import CircleShape
+from constants import *
+
+try:
+    import numpy as np
+except ImportError:  # Falls back to a plain loop over the same columns
+    np = None
+
+EXPLOSION_FPS = 15  # Explosion animation frames per second
+DEBRIS_PARTICLES = 6  # Debris specks thrown out by each explosion
+DEBRIS_SPEED = (40, 160)  # px/s, added to the asteroid's own velocity
+DEBRIS_FPS = 12
+DEBRIS_RADII = (3, 3, 2, 2, 2, 1, 1, 1)  # One animation frame per radius, shrinking
+
+FLOAT_COLUMNS = ("x", "y", "vx", "vy", "timer", "speed")
+INT_COLUMNS = ("frame", "animation")
+
+_debris_frames = None
+
+
+def debris_frames():
+    """Returns the shared animation frames of a debris speck."""
+    global _debris_frames
+    if _debris_frames is None:
+        frames = []
+        for radius in DEBRIS_RADII:
+            frame = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+            pygame.draw.circle(frame, (170, 160, 150), (radius, radius), radius)
+            frames.append(frame.convert_alpha() if pygame.display.get_surface() else frame)
+        _debris_frames = frames
+    return _debris_frames
+
+
+class Effects:
+    """
+    Animated effects stored as columns, one row per effect.
+
+    Rows are kept packed: finished effects are dropped by compacting the
+    columns after each update, so `len(effects)` is the live count.
+    """
+
+    layer = 0  # Drawn with the asteroids, under shots and the player
+
+    def __init__(self, seed=0, debris=DEBRIS_PARTICLES):
+        """
+        :param seed: Seed for the debris directions and speeds.
+        :param debris: Debris specks per explosion, 0 for none.
+        """
+        self.rng = random.Random(seed)
+        self.debris = debris
+        for name in FLOAT_COLUMNS:
+            setattr(self, name, array("d"))
+        for name in INT_COLUMNS:
+            setattr(self, name, array("q"))
+        self.animations = []  # Frame lists, indexed by the animation column
+        self.lengths = array("q")  # Frame count of each animation
+        self._animation_ids = {}  # id(frames) -> animation index
+        self.stats = {"spawned": 0, "peak": 0}
+
+    def __len__(self):
+        return len(self.x)
+
+    def spawn(self, frames, x, y, vx=0.0, vy=0.0, speed=EXPLOSION_FPS):
+        """
+        Starts an animation at (x, y), drifting at (vx, vy) px/s.
+
+        :param frames: Frame surfaces, played once at `speed` frames per second.
+        """
+        animation = self._animation_ids.get(id(frames))
+        if animation is None:
+            animation = self._animation_ids[id(frames)] = len(self.animations)
+            self.animations.append(frames)  # Also keeps id(frames) from being reused
+            self.lengths.append(len(frames))
+        self.x.append(x)
+        self.y.append(y)
+        self.vx.append(vx)
+        self.vy.append(vy)
+        self.timer.append(0.0)
+        self.speed.append(speed)
+        self.frame.append(0)
+        self.animation.append(animation)
+        self.stats["spawned"] += 1
+        self.stats["peak"] = max(self.stats["peak"], len(self.x))
+
+    def explode(self, frames, position, velocity, radius):
+        """Plays the explosion `frames` at `position` and throws debris outward from a body of `radius`."""
+        self.spawn(frames, position.x, position.y)
+        if not self.debris:
+            return
+        frames = debris_frames()
+        rng = self.rng
+        for _ in range(self.debris):
+            direction = pygame.Vector2(1, 0).rotate(rng.uniform(0, 360))
+            x, y = position + direction * rng.uniform(0, radius * 0.5)
+            vx, vy = velocity * 0.5 + direction * rng.uniform(*DEBRIS_SPEED)
+            self.spawn(frames, x, y, vx, vy, DEBRIS_FPS * rng.uniform(0.7, 1.3))
+
+    def update(self, dt):
+        """Moves every effect, advances its animation and drops the finished ones."""
+        if not self.x:
+            return
+        # The NumPy views of the columns are gone once the helper returns, so they can be resized
+        count = self._advance_arrays(dt) if np is not None else self._advance_loop(dt)
+        self._truncate(count)
+
+    def _advance_arrays(self, dt):
+        """Advances every row with NumPy views of the columns and packs the live rows first; returns their count."""
+        x, y, vx, vy, timer, speed = (np.frombuffer(getattr(self, name)) for name in FLOAT_COLUMNS)
+        frame, animation = (np.frombuffer(getattr(self, name), dtype=np.int64) for name in INT_COLUMNS)
+        x += vx * dt
+        y += vy * dt
+        timer += dt
+        advance = timer > 1 / speed
+        frame += advance
+        timer[advance] = 0
+
+        keep = frame < np.frombuffer(self.lengths, dtype=np.int64)[animation]
+        count = int(np.count_nonzero(keep))
+        if count < len(keep):
+            for column in (x, y, vx, vy, timer, speed, frame, animation):
+                column[:count] = column[keep]
+        return count
+
+    def _advance_loop(self, dt):
+        """Same as `_advance_arrays`, one row at a time."""
+        x, y, vx, vy, timer, speed = (getattr(self, name) for name in FLOAT_COLUMNS)
+        frame, animation, lengths = self.frame, self.animation, self.lengths
+        count = 0
+        for i in range(len(x)):
+            timer[i] += dt
+            if timer[i] > 1 / speed[i]:
+                frame[i] += 1
+                timer[i] = 0
+                if frame[i] >= lengths[animation[i]]:
+                    continue
+            # Shift the surviving rows down over the finished ones
+            x[count] = x[i] + vx[i] * dt
+            y[count] = y[i] + vy[i] * dt
+            vx[count], vy[count], timer[count], speed[count] = vx[i], vy[i], timer[i], speed[i]
+            frame[count], animation[count] = frame[i], animation[i]
+            count += 1
+        return count
+
+    def _truncate(self, count):
+        for name in FLOAT_COLUMNS + INT_COLUMNS:
+            del getattr(self, name)[count:]
+
+    def clear(self):
+        """Drops every effect."""
+        self._truncate(0)
+
+    def blit_items(self):
+        """Yields the (surface, rect) to blit for every effect, like `CircleShape.blit_item`."""
+        # Drifting effects are drawn between the last two ticks, like the sprites
+        lag = (1 - CircleShape.render_alpha) / SIMULATION_RATE
+        animations = self.animations
+        for x, y, vx, vy, frame, animation in zip(self.x, self.y, self.vx, self.vy, self.frame, self.animation):
+            surface = animations[animation][frame]
+            yield surface, surface.get_rect(center=(x - vx * lag, y - vy * lag))
+
+    def draw(self, screen):
+        """Blits every effect onto `screen` and returns the rects covered."""
+        return screen.blits(list(self.blit_items()))
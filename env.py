@@ -0,0 +1,259 @@
+"""
+Gym-style training environments.
+
+`AsteroidsEnv` wraps a headless `Game` with `reset()` and `step(action)`
+returning a flat NumPy observation, so automated pilots can be trained and
+evaluated without a window. `VectorEnv` runs many independent games across
+worker processes; observations, actions and rewards are exchanged through
+shared memory, and only a one-byte command goes over each worker's pipe.
+
+    env = AsteroidsEnv(seed=1)
+    observation, info = env.reset()
+    observation, reward, terminated, truncated, info = env.step(action)
+
+Requires NumPy.
+"""
+import itertools
+import math
+import multiprocessing
+from multiprocessing import shared_memory
+
+import pygame
+import headless
+from constants import *
+from game import Game
+from player import Controls
+
+try:
+    import numpy as np
+except ImportError:  # Only the training environments need NumPy
+    np = None
+
+# Every combination of turn, thrust and fire; actions are indices into this list
+ACTIONS = [Controls(*controls) for controls in itertools.product((-1, 0, 1), (-1, 0, 1), (False, True))]
+
+OBSERVED_ASTEROIDS = 8  # Nearest asteroids included in each observation
+PLAYER_FEATURES = 7  # x, y, sin and cos of the heading, shot cooldown, invincible, exploding
+ASTEROID_FEATURES = 5  # Relative x and y, velocity x and y, radius
+OBSERVATION_SIZE = PLAYER_FEATURES + OBSERVED_ASTEROIDS * ASTEROID_FEATURES
+LIFE_PENALTY = 50  # Reward lost with each life
+EPISODE_TICKS = SIMULATION_RATE * 120  # Episodes are truncated after two minutes
+
+
+class AsteroidsEnv:
+    """
+    One headless game as a reinforcement learning environment.
+
+    Actions are indices into `ACTIONS` (or `Controls` tuples). The reward is
+    the score gained, minus `LIFE_PENALTY` for each life lost. Positions and
+    velocities in the observation are scaled by the screen size.
+    """
+
+    def __init__(self, seed=None, batched=False, frame_skip=1, max_ticks=EPISODE_TICKS):
+        """
+        :param seed: Seed of the first episode; later episodes count up from it.
+        :param batched: Store asteroids and shots in NumPy arrays (see batched.py).
+        :param frame_skip: Simulation ticks each action is repeated for.
+        :param max_ticks: Ticks after which an episode is truncated.
+        """
+        headless.init()
+        self.seed = seed
+        self.batched = batched
+        self.frame_skip = frame_skip
+        self.max_ticks = max_ticks
+        self.dt = 1 / SIMULATION_RATE
+        self.game = None
+        self.ticks = 0
+        self.observation = np.zeros(OBSERVATION_SIZE, dtype=np.float32)
+
+    def reset(self, seed=None):
+        """
+        Starts a new episode.
+
+        :param seed: Seed for this episode, defaults to the next in sequence.
+        :return: (observation, info)
+        """
+        if seed is None and self.seed is not None:
+            seed = self.seed
+            self.seed += 1
+        self.game = Game(self.batched, seed)
+        self.game.verbose = False
+        self.ticks = 0
+        return self.observe(), {"seed": self.game.seed}
+
+    def step(self, action):
+        """
+        Runs `frame_skip` ticks with the given controls.
+
+        :return: (observation, reward, terminated, truncated, info)
+        """
+        game = self.game
+        game.activate()  # Several environments may share this process
+        game.player.controls = action if isinstance(action, Controls) else ACTIONS[action]
+        score, lives = game.score, game.lives
+        for _ in range(self.frame_skip):
+            game.step(self.dt)
+            self.ticks += 1
+            if game.game_over:
+                break
+
+        reward = game.score - score - LIFE_PENALTY * (lives - game.lives)
+        truncated = self.ticks >= self.max_ticks and not game.game_over
+        info = {"score": game.score, "lives": game.lives, "ticks": self.ticks}
+        return self.observe(), float(reward), game.game_over, truncated, info
+
+    def observe(self, out=None):
+        """
+        Writes the current observation into `out` (or an internal buffer) and returns it.
+
+        Layout: the player's features, then the nearest asteroids by distance,
+        zero-padded when fewer are on screen.
+        """
+        out = self.observation if out is None else out
+        game = self.game
+        player = game.player
+        heading = math.radians(player.rotation)
+        out[:PLAYER_FEATURES] = (
+            player.position.x / SCREEN_WIDTH,
+            player.position.y / SCREEN_HEIGHT,
+            math.sin(heading),
+            math.cos(heading),
+            max(player.shoot_timer, 0) / PLAYER_SHOOT_COOLDOWN,
+            player.invincible,
+            player.exploding,
+        )
+        out[PLAYER_FEATURES:] = 0
+
+        asteroids = game.asteroids.sprites()
+        if asteroids:
+            state = np.array(
+                [(a.position.x, a.position.y, a.velocity.x, a.velocity.y, a.radius) for a in asteroids],
+                dtype=np.float32,
+            )
+            state[:, 0] -= player.position.x
+            state[:, 1] -= player.position.y
+            distance_sq = state[:, 0] ** 2 + state[:, 1] ** 2
+            nearest = np.argsort(distance_sq)[:OBSERVED_ASTEROIDS]
+            state = state[nearest] / (SCREEN_WIDTH, SCREEN_HEIGHT, SCREEN_WIDTH, SCREEN_HEIGHT, ASTEROID_MAX_RADIUS)
+            out[PLAYER_FEATURES : PLAYER_FEATURES + state.size] = state.ravel()
+        return out
+
+
+# Commands sent to the workers
+RESET, STEP, CLOSE = 0, 1, 2
+
+
+def _worker(connection, memory_names, num_envs, env_ids, seed, batched, frame_skip):
+    """Runs the environments `env_ids` in a worker process until told to close."""
+    memory = [shared_memory.SharedMemory(name=name) for name in memory_names]
+    observations, actions, rewards, dones = _views(memory, num_envs)
+    envs = {i: AsteroidsEnv(None if seed is None else seed + i * 100_000, batched, frame_skip) for i in env_ids}
+    try:
+        while True:
+            command = connection.recv_bytes()[0]
+            if command == CLOSE:
+                break
+            for i, env in envs.items():
+                if command == RESET:
+                    env.reset()
+                    dones[i] = False
+                    rewards[i] = 0
+                else:
+                    _, rewards[i], terminated, truncated, _ = env.step(int(actions[i]))
+                    dones[i] = terminated or truncated
+                    if dones[i]:
+                        env.reset()  # Auto-reset: the observation starts the next episode
+                env.observe(observations[i])
+            connection.send_bytes(b"\0")
+    finally:
+        del observations, actions, rewards, dones
+        for block in memory:
+            block.close()
+        pygame.quit()
+
+
+def _views(memory, num_envs):
+    """NumPy views of the shared observation, action, reward and done arrays."""
+    observations = np.ndarray((num_envs, OBSERVATION_SIZE), np.float32, memory[0].buf)
+    actions = np.ndarray(num_envs, np.int8, memory[1].buf)
+    rewards = np.ndarray(num_envs, np.float32, memory[2].buf)
+    dones = np.ndarray(num_envs, np.bool_, memory[3].buf)
+    return observations, actions, rewards, dones
+
+
+class VectorEnv:
+    """
+    `num_envs` independent games spread over `workers` processes.
+
+    `step(actions)` steps every game at once and returns arrays (observations,
+    rewards, dones). Games that end are reset automatically, so the returned
+    observation of a done game is the first of its next episode. The arrays
+    are views of shared memory and are overwritten by the next call.
+    """
+
+    def __init__(self, num_envs, workers=None, seed=None, batched=False, frame_skip=1):
+        """
+        :param num_envs: Number of games.
+        :param workers: Worker processes, defaults to one per CPU (at most `num_envs`).
+        :param seed: Base seed; game i uses seeds starting at seed + i * 100000.
+        :param batched: Store asteroids and shots in NumPy arrays (see batched.py).
+        :param frame_skip: Simulation ticks each action is repeated for.
+        """
+        workers = min(workers or multiprocessing.cpu_count(), num_envs)
+        self.num_envs = num_envs
+        sizes = (num_envs * OBSERVATION_SIZE * 4, num_envs, num_envs * 4, num_envs)
+        self.memory = [shared_memory.SharedMemory(create=True, size=size) for size in sizes]
+        self.observations, self.actions, self.rewards, self.dones = _views(self.memory, num_envs)
+
+        context = multiprocessing.get_context("spawn")
+        self.connections = []
+        self.processes = []
+        names = [block.name for block in self.memory]
+        for n in range(workers):
+            parent, child = context.Pipe()
+            env_ids = list(range(n, num_envs, workers))
+            process = context.Process(
+                target=_worker, args=(child, names, num_envs, env_ids, seed, batched, frame_skip), daemon=True
+            )
+            process.start()
+            child.close()
+            self.connections.append(parent)
+            self.processes.append(process)
+
+    def _broadcast(self, command):
+        for connection in self.connections:
+            connection.send_bytes(bytes((command,)))
+        for connection in self.connections:
+            connection.recv_bytes()
+
+    def reset(self):
+        """Resets every game and returns the observations."""
+        self._broadcast(RESET)
+        return self.observations
+
+    def step(self, actions):
+        """
+        Steps every game with its action index.
+
+        :return: (observations, rewards, dones)
+        """
+        self.actions[:] = actions
+        self._broadcast(STEP)
+        return self.observations, self.rewards, self.dones
+
+    def close(self):
+        """Stops the workers and frees the shared memory."""
+        for connection in self.connections:
+            connection.send_bytes(bytes((CLOSE,)))
+        for process in self.processes:
+            process.join()
+        self.observations = self.actions = self.rewards = self.dones = None
+        for block in self.memory:
+            block.close()
+            block.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
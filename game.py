@@ -0,0 +1,276 @@
+import hashlib
+import itertools
+import random
+import struct
+import pygame
+import profiler
+import sounds
+from circleshape import CircleShape
+from constants import *
+from player import Player, Shot
+from asteroid import Asteroid
+from asteroidfield import AsteroidField
+from collision import SpatialHash, time_of_impact
+from effects import Effects
+from lifetime import LifetimeManager
+from waves import EntityBudget
+
+
+class Game:
+    """
+    The game state and its simulation tick, without any rendering.
+
+    `step(dt)` runs one tick: sprite updates, spawning, culling, and the
+    player and shot collision checks. It is always called with the fixed
+    simulation timestep, so the outcome does not depend on the frame rate.
+    All randomness comes from `rng`, so a game with a given seed and the same
+    per-tick player controls always plays out the same way.
+    """
+
+    verbose = True  # Print lives and game over messages
+
+    def __init__(self, batched=False, seed=None, entity_budget=None):
+        """
+        :param batched: Store asteroids and shots in NumPy arrays (see batched.py).
+        :param seed: Seed for the game's random generator, None for a random one.
+        :param entity_budget: Most live asteroids and shots before spawns wait
+            and splits merge (see waves.py), None for no limit.
+        """
+        self.seed = random.randrange(2**63) if seed is None else seed
+        self.rng = random.Random(self.seed)
+        self.score = 0
+        self.lives = 3
+        self.game_over = False
+
+        # Initialize sprite groups
+        self.shots = pygame.sprite.Group()
+        self.asteroids = pygame.sprite.Group()
+        self.updatable = pygame.sprite.Group()
+        self.drawable = pygame.sprite.Group()
+
+        self.budget = EntityBudget(entity_budget, lambda: len(self.asteroids) + len(self.shots))
+        self.effects = Effects(self.seed)  # Explosions and debris, outside the gameplay groups
+        self.ids = itertools.count(1)  # Entity ids, in creation order
+
+        self.world = None
+        if batched:
+            # Keep asteroid and shot state in NumPy arrays, stepped in one pass per tick
+            from batched import BatchedWorld
+
+            self.world = BatchedWorld()
+        self.activate()
+
+        self.players = []  # Every ship in the game; `player` is the local one
+        self.player = self.add_player()
+
+        self.asteroid_field = AsteroidField(budget=self.budget)
+
+        self.grid = SpatialHash()  # Collision broad phase
+
+        # Remove shots and asteroids once they leave the play area or get too old
+        self.lifetimes = LifetimeManager(world=self.world)
+        self.lifetimes.track("shots", self.shots)
+        self.lifetimes.track("asteroids", self.asteroids)
+
+    def activate(self):
+        """
+        Points the sprite classes' shared settings (groups, random generator,
+        batched world) at this game. New games activate themselves; call it
+        before stepping when several games share one process.
+        """
+        Asteroid.containers = (self.asteroids, self.updatable, self.drawable)
+        Shot.containers = (self.shots, self.updatable, self.drawable)
+        AsteroidField.containers = ()  # Updated by Game.spawn, not with the sprites
+        AsteroidField.asteroid_class = Asteroid
+        AsteroidField.rng = Asteroid.rng = self.rng
+        CircleShape.ids = self.ids
+        Asteroid.budget = self.budget
+        Asteroid.effects = self.effects
+        Player.shot_class = None
+
+        if self.world is not None:
+            from batched import BatchedBody, BatchedAsteroid, BatchedShot
+
+            BatchedBody.world = self.world
+            BatchedAsteroid.containers = (self.asteroids, self.drawable)
+            BatchedShot.containers = (self.shots, self.drawable)
+            AsteroidField.asteroid_class = BatchedAsteroid
+            Player.shot_class = BatchedShot
+
+    def add_player(self):
+        """Adds a ship at the centre of the screen (e.g. for a network client) and returns it."""
+        player = Player(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
+        self.players.append(player)
+        self.updatable.add(player)
+        self.drawable.add(player)
+        return player
+
+    def remove_player(self, player):
+        """Takes a ship added with `add_player` out of the game."""
+        self.players.remove(player)
+        player.kill()
+
+    def handle_event(self, event):
+        """Passes a pygame event on to the player."""
+        self.player.handle_input(event)
+
+    def step(self, dt):
+        """Advances the game by one simulation tick of `dt` seconds."""
+        self.update(dt)
+        profiler.mark("update")
+        self.spawn(dt)
+        self.cull(dt)
+        profiler.mark("spawn")
+        self.collide()
+
+    def update(self, dt):
+        """Updates every sprite and effect."""
+        sounds.begin_tick()  # Identical clips are merged per tick, in every loop that runs the game
+        if self.world is not None:
+            self.world.step(dt)  # Before the sprites, so shots fired this tick start moving next tick
+        for sprite in self.updatable:
+            sprite.update(dt)
+        self.effects.update(dt)
+
+    def spawn(self, dt):
+        """Lets the asteroid field spawn new asteroids."""
+        self.asteroid_field.update(dt)
+
+    def cull(self, dt):
+        """Removes shots and asteroids that left the play area or expired."""
+        self.lifetimes.update(dt)
+
+    def collide(self):
+        """Runs the player and shot collision checks."""
+        if self.world is None:
+            # Bucket asteroids into the broad-phase grid once per tick
+            self.grid.build(self.asteroids)
+        self.check_player_collisions()
+        profiler.mark("player collision")
+        self.check_shot_collisions()
+        profiler.mark("shot collision")
+
+    def draw(self, screen, queue=None):
+        """
+        Draws every sprite onto `screen` and returns the rects they covered.
+
+        :param queue: A `RenderQueue` to batch the blits through, None to
+            draw sprite by sprite.
+        """
+        rects = []
+        if queue is None:
+            rects += self.effects.draw(screen)
+            for sprite in self.drawable:
+                rect = sprite.draw(screen)
+                if rect is not None:
+                    rects.append(rect)
+            return rects
+
+        for sprite in self.drawable:
+            item = sprite.blit_item()
+            if item is not None:
+                queue.add(sprite.layer, *item)
+            else:
+                rect = sprite.draw(screen)  # Shapes without a surface draw themselves
+                if rect is not None:
+                    rects.append(rect)
+        layer = self.effects.layer
+        for surface, rect in self.effects.blit_items():
+            queue.add(layer, surface, rect)
+        rects += queue.submit(screen)
+        return rects
+
+    def state_hash(self):
+        """
+        Returns a digest of the score, lives and every body's position and
+        velocity, used to check that a replay ended in the recorded state.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(struct.pack("<qq?", self.score, self.lives, self.game_over))
+        player = self.player
+        digest.update(struct.pack("<5d", player.position.x, player.position.y, player.rotation, *player.velocity))
+        for group in (self.asteroids, self.shots):
+            digest.update(struct.pack("<q", len(group)))
+            for sprite in group:
+                digest.update(
+                    struct.pack(
+                        "<5d", sprite.position.x, sprite.position.y, sprite.velocity.x, sprite.velocity.y, sprite.radius
+                    )
+                )
+        return digest.hexdigest()
+
+    def check_player_collisions(self):
+        """Checks every player against nearby asteroids and takes a (shared) life on a hit."""
+        for player in self.players:
+            if player.exploding or player.invincible:
+                continue
+            if self.world is None:
+                nearby = self.grid.query(player.position, player.radius)
+            else:
+                nearby = self.world.overlapping(player.position, player.radius, self.asteroids)
+
+            for asteroid in nearby:
+                if player.collision(asteroid):
+                    player.explode()
+                    self.lives -= 1
+                    if self.lives > 0:
+                        # Let the explosion animation finish before respawning
+                        if self.verbose:
+                            print(f"Lives remaining: {self.lives}")
+                    else:
+                        if self.verbose:
+                            print("Game Over!")
+                        self.game_over = True
+                    break  # Stop checking further collisions for this player
+
+    def check_shot_collisions(self):
+        """
+        Handles shots hitting asteroids.
+
+        Shots are swept along their path over the tick, so a fast shot can't
+        skip past a small asteroid, and hits resolve earliest impact first.
+        The batched world only computes the impact times in one vectorized
+        pass; both modes resolve the hits the same way.
+        """
+        shots = self.shots.sprites()
+        if self.world is not None:
+            # One vectorized impact-time matrix for every shot/asteroid pair
+            earliest = self.world.earliest_hits(shots, self.asteroids)
+        else:
+            earliest = [self.earliest_impact(shot) for shot in shots]
+        impacts = [
+            (impact[0], order, shot, impact[1])
+            for order, (shot, impact) in enumerate(zip(shots, earliest))
+            if impact is not None
+        ]
+        impacts.sort(key=lambda impact: impact[:2])
+
+        for _, _, shot, asteroid in impacts:
+            # An earlier shot may have destroyed the asteroid (and the pool handed it out
+            # again as a new piece); if so, look for something else in the path
+            if not asteroid.alive() or time_of_impact(shot, asteroid) is None:
+                impact = self.earliest_impact(shot)
+                if impact is None:
+                    continue
+                asteroid = impact[1]
+            self.score += 5  # Increment score only for active asteroids
+            shot.kill()
+            # Later shots only reach the new pieces through the re-lookup above, when their own
+            # target is gone or missed; their impact lists were computed before the split
+            pieces = asteroid.split()
+            if self.world is None:
+                for piece in pieces:
+                    self.grid.insert(piece)
+
+    def earliest_impact(self, shot):
+        """Returns (time of impact, asteroid) for the first live asteroid in the shot's path, or None."""
+        if self.world is not None:
+            return self.world.earliest_hits([shot], self.asteroids)[0]
+        earliest = None
+        for asteroid in self.grid.query_swept(shot):
+            if not asteroid.alive():
+                continue  # Destroyed earlier this tick, still listed in the grid
+            t = time_of_impact(shot, asteroid)
+            if t is not None and (earliest is None or t < earliest[0]):
+                earliest = (t, asteroid)
+        return earliest
@@ -0,0 +1,136 @@
+"""
+Headless simulation: runs the game loop without a window.
+
+Uses the SDL dummy video and audio drivers, and no display surface at all
+unless drawing is requested, so it works on servers and in CI. Scripted
+scenarios replace the keyboard and use fixed seeds, so runs are repeatable.
+
+    python headless.py --scenario barrage --ticks 3600
+"""
+import os
+import time
+
+import pygame
+import assets
+from constants import *
+from game import Game
+from player import Controls
+
+PHASES = ("update", "spawn", "collision", "draw")
+
+
+def init():
+    """Initializes pygame on the SDL dummy video and audio drivers."""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    pygame.init()
+
+
+def idle(tick):
+    return Controls(0, 0, False)
+
+
+def spin_and_fire(tick):
+    return Controls(1, 0, True)
+
+
+def patrol(tick):
+    # Alternate turning directions every two seconds while thrusting and firing
+    return Controls(1 if tick // 120 % 2 else -1, 1, True)
+
+
+# Scenario name -> settings. "asteroids" are spawned on screen before the
+# first tick, and "invincible" keeps the player alive for throughput runs.
+SCENARIOS = {
+    "idle": {"seed": 1, "ticks": 3600, "asteroids": 0, "invincible": False, "controls": idle},
+    "spin-and-fire": {"seed": 2, "ticks": 3600, "asteroids": 0, "invincible": True, "controls": spin_and_fire},
+    "barrage": {"seed": 3, "ticks": 3600, "asteroids": 200, "invincible": True, "controls": patrol},
+    "swarm": {"seed": 4, "ticks": 600, "asteroids": 2000, "invincible": True, "controls": spin_and_fire},
+}
+
+
+def populate(game, count):
+    """Spawns `count` asteroids at random positions on the screen."""
+    rng = game.rng
+    for _ in range(count):
+        radius = ASTEROID_MIN_RADIUS * rng.randint(1, ASTEROID_KINDS)
+        position = pygame.Vector2(rng.uniform(0, SCREEN_WIDTH), rng.uniform(0, SCREEN_HEIGHT))
+        velocity = pygame.Vector2(rng.randint(40, 100), 0).rotate(rng.uniform(0, 360))
+        game.asteroid_field.spawn(radius, position, velocity)
+
+
+def run(name, ticks=None, batched=False, draw=False, entity_budget=None):
+    """
+    Runs a scenario headless and times each phase of the tick.
+
+    :param name: Scenario name from `SCENARIOS`.
+    :param ticks: Number of ticks to run, defaults to the scenario's own.
+    :param batched: Use the NumPy batched world.
+    :param draw: Also draw every tick onto the dummy display.
+    :param entity_budget: Live asteroid and shot limit, None for none.
+    :return: Dict with the game, ticks run, wall time and per-phase seconds.
+    """
+    scenario = SCENARIOS[name]
+    ticks = scenario["ticks"] if ticks is None else ticks
+
+    screen = None
+    if draw:
+        # A (dummy) display lets sprites be converted to its pixel format, like in the game
+        screen = pygame.display.get_surface() or pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+
+    game = Game(batched, scenario["seed"], entity_budget)
+    populate(game, scenario["asteroids"])
+    if scenario["invincible"]:
+        game.player.make_invincible(float("inf"))
+
+    timings = dict.fromkeys(PHASES, 0.0)
+    dt = 1 / SIMULATION_RATE
+    clock = time.perf_counter
+    start = clock()
+
+    tick = 0
+    while tick < ticks and not game.game_over:
+        game.player.controls = scenario["controls"](tick)
+
+        # The phases of Game.step, in its order; culling counts as spawning, like the profiler's marks
+        t0 = clock()
+        game.update(dt)
+        t1 = clock()
+        game.spawn(dt)
+        game.cull(dt)
+        t2 = clock()
+        game.collide()
+        t3 = clock()
+        timings["update"] += t1 - t0
+        timings["spawn"] += t2 - t1
+        timings["collision"] += t3 - t2
+
+        if screen is not None:
+            screen.fill("black")
+            game.draw(screen)
+            timings["draw"] += clock() - t3
+        tick += 1
+
+    return {"game": game, "ticks": tick, "seconds": clock() - start, "timings": timings}
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run Asteroids without a window")
+    parser.add_argument("--scenario", choices=SCENARIOS, default="barrage")
+    parser.add_argument("--ticks", type=int, help="ticks to simulate (default: the scenario's own)")
+    parser.add_argument("--batched", action="store_true", help="store asteroids and shots in NumPy arrays")
+    parser.add_argument("--draw", action="store_true", help="also draw each tick to the dummy display")
+    parser.add_argument("--budget", type=int, help="live entity budget (default: none)")
+    args = parser.parse_args()
+
+    init()
+    result = run(args.scenario, args.ticks, args.batched, args.draw, args.budget)
+    game = result["game"]
+    print(f"{result['ticks']} ticks in {result['seconds']:.2f}s ({result['ticks'] / result['seconds']:.0f} ticks/s)")
+    print(f"Score: {game.score}  Lives: {game.lives}  Asteroids: {len(game.asteroids)}  Shots: {len(game.shots)}")
+    if args.budget:
+        print(f"Entity budget {args.budget}: {game.budget.stats['deferred']} spawns deferred, {game.budget.stats['merged']} splits merged")
+    if args.draw:
+        print(f"Rotation cache hit rate: {assets.rotations.hit_rate:.1%} ({assets.rotations.bytes / 2**20:.1f} MB)")
@@ -0,0 +1,57 @@
+from constants import *
+
+
+def out_of_bounds(sprite, margin=CULL_MARGIN):
+    """Checks if a circle shape is fully outside the screen plus a margin."""
+    reach = margin + sprite.radius
+    x, y = sprite.position
+    return x < -reach or x > SCREEN_WIDTH + reach or y < -reach or y > SCREEN_HEIGHT + reach
+
+
+class LifetimeManager:
+    """
+    Removes entities that left the play area or outlived their `max_age`.
+
+    Without this every missed bullet and drifting asteroid would stay in the
+    sprite groups forever. The manager also keeps live/peak/culled counts per
+    tracked group so soak tests can confirm the entity count stays bounded.
+    """
+
+    def __init__(self, margin=CULL_MARGIN, world=None):
+        """
+        :param margin: Distance outside the screen before an entity is culled.
+        :param world: BatchedWorld to cull in one vectorized pass, if any.
+        """
+        self.margin = margin
+        self.world = world
+        self.groups = {}
+        self.metrics = {}
+
+    def track(self, name, group):
+        """Starts culling the sprites of `group`, reported under `name`."""
+        self.groups[name] = group
+        self.metrics[name] = {"live": len(group), "peak": len(group), "culled": 0}
+
+    def update(self, dt):
+        """Ages every tracked sprite and removes the expired ones."""
+        if self.world is not None:
+            for sprite in self.world.expired(self.margin, dt):
+                self._cull(sprite)
+        else:
+            for group in self.groups.values():
+                for sprite in group.sprites():
+                    sprite.age += dt
+                    too_old = sprite.max_age is not None and sprite.age > sprite.max_age
+                    if too_old or out_of_bounds(sprite, self.margin):
+                        self._cull(sprite)
+
+        for name, group in self.groups.items():
+            metrics = self.metrics[name]
+            metrics["live"] = len(group)
+            metrics["peak"] = max(metrics["peak"], metrics["live"])
+
+    def _cull(self, sprite):
+        for name, group in self.groups.items():
+            if group.has(sprite):
+                self.metrics[name]["culled"] += 1
+        sprite.kill()
@@ -1,107 +1,123 @@
+import gc
 import pygame
+import assets
+import preload
+import profiler
+import replay
+import waves
 from constants import *
-from player import *
-from asteroid import *
-from asteroidfield import *
+from circleshape import CircleShape
+from game import Game
+from player import Player
+from renderer import Hud, Renderer
+from simulation import FixedTimestep
 
 
-def main():
+def main(batched=False, fps=RENDER_FPS, full_redraw=False, record=None, seed=None, profile=None, budget=None):
     screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
     clock = pygame.time.Clock()
-    dt = 0
 
-    # Load the background image
-    background = pygame.image.load("sprites/maps/1.png").convert()
-    # If scaling is required to fit the screen resolution
-    background = pygame.transform.scale(background, (SCREEN_WIDTH, SCREEN_HEIGHT))
+    # Initialize font
+    pygame.font.init()
+    pygame.mixer.init()
+    font = pygame.font.Font(None, 36)  # Default font, size 36
+
+    # Decode every sprite and sound up front so gameplay does no file I/O
+    preload.preload(preload.LoadingScreen(screen, font))
+
+    # Load the background image, scaled once to fit the screen resolution
+    background = assets.load_image("sprites/maps/1.png", (SCREEN_WIDTH, SCREEN_HEIGHT), alpha=False)
 
     # Load life sprites through Player class
     life_sprites = Player.load_life_sprites()  # Use the function from player.py
-    lives = 3  # Initialize lives
 
-    # Initialize sprite groups
-    shots = pygame.sprite.Group()
-    asteroids = pygame.sprite.Group()
-    updatable = pygame.sprite.Group()
-    drawable = pygame.sprite.Group()
+    # Cap live entities at what this machine can simulate and draw within the frame target
+    if budget is None:
+        budget = waves.calibrate_budget(background.copy())
+    game = Game(batched, seed, budget or None)
+    recording = replay.Recording(game.seed, batched, budget or None)  # Per-tick controls, saved with --record
 
-    Asteroid.containers = (asteroids, updatable, drawable)
-    Shot.containers = (shots, updatable, drawable)
-    AsteroidField.containers = (updatable,)
+    # Simulation runs at a fixed rate, independent of the render rate
+    timestep = FixedTimestep()
 
-    player = Player(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
-    updatable.add(player)
-    drawable.add(player)
+    # Redraw and push only the regions that changed each frame
+    renderer = Renderer(screen, background, Hud(font, life_sprites), dirty=not full_redraw)
 
-    asteroid_field = AsteroidField()
-    updatable.add(asteroid_field)
+    # Frame profiler: F3 toggles the overlay, --profile records from the start
+    renderer.overlays.append(profiler.current)
+    profiler.current.enabled = bool(profile)
 
-    score = 0  # Initialize score
-
-    # Initialize font
-    pygame.font.init()
-    pygame.mixer.init()
-    font = pygame.font.Font(None, 36)  # Default font, size 36
+    # Everything loaded so far lives for the whole session, so keep the
+    # garbage collector from rescanning it during gameplay
+    gc.collect()
+    gc.freeze()
 
     running = True
     while running:
-        dt = clock.tick(60) / 1000
+        frame_time = clock.tick(fps) / 1000
+        profiler.begin_frame()
 
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
-            player.handle_input(event, shots)
-
-        # Update all sprites
-        for sprite in updatable:
-            sprite.update(dt)
-
-        # Check player-asteroid collisions
-        for asteroid in asteroids:
-            if asteroid.exploding:
-                continue  # Skip exploding asteroids
-            if not player.exploding and not player.invincible and player.collision(asteroid):
-                player.explode()
-                lives -= 1
-                if lives > 0:
-                    # Let the explosion animation finish before respawning
-                    print(f"Lives remaining: {lives}")
-                else:
-                    print("Game Over!")
-                    running = False
-                break  # Stop checking further collisions for this frame
-
-
-        # Handle shots hitting asteroids
-        for shot in shots:
-            for asteroid in asteroids:
-                if not asteroid.exploding and shot.collision(asteroid):  # Ignore exploding asteroids
-                    score += 5  # Increment score only for active asteroids
-                    shot.kill()
-                    asteroid.split()
-                    break
-
-        # Draw the background image
-        screen.blit(background, (0, 0))  # Draw background before other elements
-
-        # Draw all drawable sprites
-        for sprite in drawable:
-            sprite.draw(screen)
-
-        # Render and display the score
-        score_text = font.render(f"Score: {score}", True, "white")
-        screen.blit(score_text, (10, 10))  # Position score at (10, 10)
-
-        # Display the life sprite based on the current number of lives
-        if lives >= 0:
-            screen.blit(life_sprites[lives], (10, 50))  # Position below the score
-
-        # Update the display
-        pygame.display.flip()
+            elif event.type in (pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED):
+                renderer.needs_full_update = True
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                profiler.current.toggle_overlay()
+            game.handle_event(event)
+        profiler.mark("events")
+
+        for _ in range(timestep.advance(frame_time)):
+            # Sample the controls once per tick so the session can be replayed exactly
+            game.player.controls = game.player.read_keyboard()
+            recording.record(game.player.controls)
+            game.step(timestep.dt)
+            if game.game_over:
+                running = False
+                break
+
+        # Draw sprites between the last two simulated states
+        CircleShape.render_alpha = timestep.alpha
+
+        renderer.render(game)
+        profiler.end_frame(frame_time, game)
+
+    if profile:
+        profiler.current.dump(profile)
+        print(f"Wrote the last {profiler.current.count} frames to {profile}")
+
+    if record:
+        recording.final_hash = game.state_hash()
+        recording.save(record)
+        print(f"Recorded {len(recording)} ticks to {record}")
 
     pygame.quit()
 
 
 if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Asteroids")
+    parser.add_argument("--batched", action="store_true", help="store asteroids and shots in NumPy arrays")
+    parser.add_argument("--full-redraw", action="store_true", help="redraw and flip the whole screen every frame")
+    parser.add_argument("--fps", type=int, default=RENDER_FPS, help="render frame rate cap, 0 for uncapped")
+    parser.add_argument("--seed", type=int, help="seed for the game's random generator")
+    parser.add_argument("--record", metavar="FILE", help="save the session's inputs for --replay")
+    parser.add_argument("--budget", type=int, help="live entity budget, 0 for none (default: measured at startup)")
+    parser.add_argument("--profile", metavar="FILE", help="record frame timings and dump them to a .csv or .json file")
+    parser.add_argument("--replay", metavar="FILE", help="re-run a recorded session headless and check its final state")
+    args = parser.parse_args()
+
+    if args.replay:
+        raise SystemExit(replay.main(args.replay))
+
     pygame.init()
-    main()
+    main(
+        batched=args.batched,
+        fps=args.fps,
+        full_redraw=args.full_redraw,
+        record=args.record,
+        seed=args.seed,
+        profile=args.profile,
+        budget=args.budget,
+    )
@@ -0,0 +1,734 @@
+"""
+Networked multiplayer: an authoritative server and UDP clients.
+
+The server runs the only real `Game`, with one ship per client, and sends
+each client a snapshot of the world `SNAPSHOT_RATE` times a second.
+Snapshots are delta compressed against the last snapshot that client
+acknowledged. Asteroids and shots fly in straight lines, so an entity is
+left out entirely while its velocity and radius are unchanged and its
+position still matches the extrapolation from the baseline. Only new,
+changed and removed entities are sent. Snapshots are capped at
+`MAX_DATAGRAM` bytes, so they travel unfragmented; changes that don't fit
+wait for the next snapshot.
+
+Clients send their controls every tick, repeating the last few to survive
+packet loss. Each client predicts its own ship from those controls and
+corrects the prediction when the server acknowledges an input. Every other
+entity is shown `INTERPOLATION_DELAY` ticks in the past, interpolated
+between the two snapshots around that time.
+
+All ships share one score and one set of lives. When the lives run out the
+world stays frozen for `RESTART_DELAY` seconds, then the server starts a
+new round in place: asteroids and shots are cleared, the waves start over,
+score and lives are reset and every ship respawns in the centre. Clients
+stay connected throughout.
+
+    python net.py server --port 7777
+    python net.py client localhost 7777
+    python net.py loopback --clients 4 --seconds 10
+"""
+import asyncio
+import struct
+import time
+from collections import deque
+
+import pygame
+from constants import *
+from game import Game
+from player import Controls, Player
+from replay import pack_controls, unpack_controls
+
+SNAPSHOT_RATE = 20  # Snapshots per second sent to each client
+SNAPSHOT_INTERVAL = SIMULATION_RATE // SNAPSHOT_RATE  # Ticks between snapshots
+SNAPSHOT_HISTORY = 32  # Unacknowledged snapshots kept per client before it gets a full one
+INTERPOLATION_DELAY = 2 * SNAPSHOT_INTERVAL  # Ticks clients draw other entities behind the newest snapshot
+INPUT_REDUNDANCY = 4  # Most recent inputs repeated in every input packet
+INPUT_BUFFER = 6  # Inputs the server queues per client before skipping ahead
+MAX_DATAGRAM = 1200  # Bytes, fits one packet on common paths (1500-byte MTU, tunnels) without IP fragmentation
+POSITION_SCALE = 8  # Fixed-point units per pixel (and per pixel per second for velocities)
+POSITION_TOLERANCE = 2  # Units an extrapolated position may be off before the entity is resent
+RESTART_DELAY = 3  # Seconds the world stays frozen after a game over before a new round starts
+DT = 1 / SIMULATION_RATE
+
+# Message types, the first byte of every datagram
+HELLO, WELCOME, INPUT, SNAPSHOT, BYE = range(5)
+
+KIND_ASTEROID, KIND_SHOT = 0, 1
+
+# Entity fields present in a snapshot entry
+FIELD_KIND, FIELD_POSITION, FIELD_VELOCITY, FIELD_RADIUS = 1, 2, 4, 8
+ALL_FIELDS = FIELD_KIND | FIELD_POSITION | FIELD_VELOCITY | FIELD_RADIUS
+
+# Player flags
+EXPLODING, INVINCIBLE = 1, 2
+
+WELCOME_MESSAGE = struct.Struct("<BB")  # type, player slot
+INPUT_HEADER = struct.Struct("<BIIB")  # type, newest input number, snapshot ack, input count; then one byte each
+# type, tick, baseline tick, input ack, score, lives, player count, removed count, entity count
+SNAPSHOT_HEADER = struct.Struct("<BIIIiBBHH")
+PLAYER_STATE = struct.Struct("<BhhHB")  # slot, x, y, rotation in 1/100 degree, flags
+ENTITY_HEADER = struct.Struct("<IB")  # entity id, fields present
+ENTITY_ID = struct.Struct("<I")
+KIND = struct.Struct("<B")
+VECTOR = struct.Struct("<hh")
+RADIUS = struct.Struct("<B")
+
+IDLE = Controls(0, 0, False)
+
+
+def quantize(value):
+    """Converts pixels (or pixels per second) to clamped 16-bit fixed point."""
+    return max(-32768, min(32767, round(value * POSITION_SCALE)))
+
+
+def entity_records(game):
+    """
+    Returns {entity id: record} for every asteroid and shot.
+
+    A record is (kind, x, y, vx, vy, radius) with positions and velocities
+    in fixed point.
+    """
+    records = {}
+    # Shots first: when a snapshot is full, the entities at the end wait for the next one
+    for kind, group in ((KIND_SHOT, game.shots), (KIND_ASTEROID, game.asteroids)):
+        for sprite in group:
+            position, velocity = sprite.position, sprite.velocity
+            records[sprite.entity_id] = (
+                kind,
+                quantize(position.x),
+                quantize(position.y),
+                quantize(velocity.x),
+                quantize(velocity.y),
+                int(sprite.radius),
+            )
+    return records
+
+
+def extrapolate(entry, tick):
+    """Returns the fixed-point (x, y) of a state entry (tick, record) moved on to `tick`."""
+    base_tick, record = entry
+    elapsed = (tick - base_tick) / SIMULATION_RATE
+    return record[1] + record[3] * elapsed, record[2] + record[4] * elapsed
+
+
+def _unchanged(record, entry, tick):
+    """Whether the client can reconstruct `record` from its baseline entry by extrapolation."""
+    base = entry[1]
+    if record[0] != base[0] or record[3] != base[3] or record[4] != base[4] or record[5] != base[5]:
+        return False
+    x, y = extrapolate(entry, tick)
+    return abs(x - record[1]) <= POSITION_TOLERANCE and abs(y - record[2]) <= POSITION_TOLERANCE
+
+
+def encode_snapshot(
+    tick, records, baseline, baseline_tick, players, input_ack=0, score=0, lives=0, max_size=MAX_DATAGRAM
+):
+    """
+    Encodes a snapshot as a delta against the state a client acknowledged.
+
+    Removals and changed entities that don't fit in `max_size` bytes are
+    left out; the returned state keeps the client's old view of them, so
+    they go out with a later snapshot.
+
+    :param tick: Server tick of the snapshot.
+    :param records: Current {entity id: record}, see `entity_records`.
+    :param baseline: The client's acknowledged state, {entity id: (tick, record)}.
+    :param baseline_tick: Tick of `baseline`, 0 for none (a full snapshot).
+    :param players: List of (slot, x, y, rotation, flags), in pixels and degrees.
+    :param max_size: Largest datagram to build, None for no limit.
+    :return: (datagram, state the client will have once it applies it).
+    """
+    max_size = max_size or float("inf")
+    body = [
+        PLAYER_STATE.pack(slot, quantize(x), quantize(y), round(rotation % 360 * 100) % 36000, flags)
+        for slot, x, y, rotation, flags in players
+    ]
+    size = SNAPSHOT_HEADER.size + sum(map(len, body))
+
+    state = {}
+    removed = 0
+    for entity_id, entry in baseline.items():
+        if entity_id in records:
+            continue
+        if size + ENTITY_ID.size > max_size:
+            state[entity_id] = entry  # Out of room: removed with a later snapshot
+            continue
+        body.append(ENTITY_ID.pack(entity_id))
+        size += ENTITY_ID.size
+        removed += 1
+
+    changed = 0
+    for entity_id, record in records.items():
+        entry = baseline.get(entity_id)
+        if entry is not None and _unchanged(record, entry, tick):
+            state[entity_id] = entry
+            continue
+        if entry is None:
+            fields = ALL_FIELDS
+        else:
+            base = entry[1]
+            fields = FIELD_POSITION  # Any change restarts the extrapolation from here
+            if record[0] != base[0]:
+                fields |= FIELD_KIND
+            if record[3] != base[3] or record[4] != base[4]:
+                fields |= FIELD_VELOCITY
+            if record[5] != base[5]:
+                fields |= FIELD_RADIUS
+
+        parts = [ENTITY_HEADER.pack(entity_id, fields)]
+        if fields & FIELD_KIND:
+            parts.append(KIND.pack(record[0]))
+        parts.append(VECTOR.pack(record[1], record[2]))
+        if fields & FIELD_VELOCITY:
+            parts.append(VECTOR.pack(record[3], record[4]))
+        if fields & FIELD_RADIUS:
+            parts.append(RADIUS.pack(record[5]))
+        entry_bytes = b"".join(parts)
+        if size + len(entry_bytes) > max_size:
+            # Out of room: the client keeps its old view of this entity until the next snapshot
+            if entry is not None:
+                state[entity_id] = entry
+            continue
+        body.append(entry_bytes)
+        size += len(entry_bytes)
+        state[entity_id] = (tick, record)
+        changed += 1
+
+    header = SNAPSHOT_HEADER.pack(
+        SNAPSHOT, tick, baseline_tick, input_ack, score, max(lives, 0), len(players), removed, changed
+    )
+    return header + b"".join(body), state
+
+
+def decode_snapshot(data, states):
+    """
+    Applies a snapshot datagram to the baseline state it was encoded against.
+
+    :param data: Datagram from `encode_snapshot`.
+    :param states: The client's states, {tick: {entity id: (tick, record)}}.
+    :return: Dict with tick, state, input_ack, score, lives and players
+        ({slot: (x, y, rotation, flags)}), or None if the baseline is unknown.
+    """
+    _, tick, baseline_tick, input_ack, score, lives, player_count, removed, changed = SNAPSHOT_HEADER.unpack_from(data)
+    if baseline_tick and baseline_tick not in states:
+        return None
+    state = dict(states[baseline_tick]) if baseline_tick else {}
+
+    offset = SNAPSHOT_HEADER.size
+    players = {}
+    for _ in range(player_count):
+        slot, x, y, rotation, flags = PLAYER_STATE.unpack_from(data, offset)
+        players[slot] = (x / POSITION_SCALE, y / POSITION_SCALE, rotation / 100, flags)
+        offset += PLAYER_STATE.size
+    for _ in range(removed):
+        state.pop(ENTITY_ID.unpack_from(data, offset)[0], None)
+        offset += ENTITY_ID.size
+    for _ in range(changed):
+        entity_id, fields = ENTITY_HEADER.unpack_from(data, offset)
+        offset += ENTITY_HEADER.size
+        kind, _, _, vx, vy, radius = state[entity_id][1] if entity_id in state else (0, 0, 0, 0, 0, 0)
+        if fields & FIELD_KIND:
+            (kind,) = KIND.unpack_from(data, offset)
+            offset += KIND.size
+        x, y = VECTOR.unpack_from(data, offset)
+        offset += VECTOR.size
+        if fields & FIELD_VELOCITY:
+            vx, vy = VECTOR.unpack_from(data, offset)
+            offset += VECTOR.size
+        if fields & FIELD_RADIUS:
+            (radius,) = RADIUS.unpack_from(data, offset)
+            offset += RADIUS.size
+        state[entity_id] = (tick, (kind, x, y, vx, vy, radius))
+
+    return {"tick": tick, "state": state, "input_ack": input_ack, "score": score, "lives": lives, "players": players}
+
+
+class Connection:
+    """The server's view of one client: its ship, queued inputs and acknowledged state."""
+
+    def __init__(self, slot, player):
+        self.slot = slot
+        self.player = player
+        self.inputs = {}  # Input number -> Controls, received but not applied yet
+        self.applied = 0  # Number of the last input applied
+        self.controls = IDLE
+        self.acked = 0  # Newest snapshot tick the client confirmed, 0 for none
+        self.baseline = {}  # The client's state at `acked`
+        self.sent = {}  # Snapshot tick -> the client's state once it applies that snapshot
+        self.bytes_sent = 0
+        self.snapshots = 0
+
+    def receive_inputs(self, newest, controls):
+        """Queues the inputs numbered up to `newest` that have not been applied yet."""
+        first = newest - len(controls) + 1
+        for number, byte in enumerate(controls, first):
+            if number > self.applied:
+                self.inputs[number] = unpack_controls(byte)
+
+    def acknowledge(self, tick):
+        """Makes the snapshot sent at `tick` the baseline of the next delta."""
+        if tick > self.acked and tick in self.sent:
+            self.acked = tick
+            self.baseline = self.sent[tick]
+            self.sent = {sent: state for sent, state in self.sent.items() if sent > tick}
+
+    def next_controls(self):
+        """Applies the client's next input to its ship, repeating the last one (without firing) if none arrived."""
+        while len(self.inputs) > INPUT_BUFFER:
+            # The client got ahead of the server; drop the oldest inputs rather than lag behind
+            self.applied = min(self.inputs)
+            del self.inputs[self.applied]
+        number = self.applied + 1 if self.applied + 1 in self.inputs else min(self.inputs, default=None)
+        if number is None:
+            self.controls = self.controls._replace(fire=False)
+        else:
+            self.applied = number
+            self.controls = self.inputs.pop(number)
+        self.player.controls = self.controls
+
+    def snapshot(self, tick, records, players, score, lives):
+        """Encodes the delta snapshot for this client and remembers what it will hold."""
+        if self.acked and tick - self.acked > SNAPSHOT_HISTORY * SNAPSHOT_INTERVAL:
+            self.acked, self.baseline, self.sent = 0, {}, {}  # Too far behind: start over with a full snapshot
+        packet, state = encode_snapshot(tick, records, self.baseline, self.acked, players, self.applied, score, lives)
+        self.sent[tick] = state
+        self.bytes_sent += len(packet)
+        self.snapshots += 1
+        return packet
+
+
+class Server(asyncio.DatagramProtocol):
+    """
+    Authoritative game server. Call `tick()` once per simulation tick; every
+    `SNAPSHOT_INTERVAL` ticks it sends each client its snapshot.
+    """
+
+    def __init__(self, game=None, max_clients=8, invincible=False):
+        """
+        :param game: The game to serve, a new one by default.
+        :param max_clients: Players allowed at once.
+        :param invincible: Make joining ships invincible (for benchmarks and soak tests).
+        """
+        self.game = game or Game()
+        self.game.verbose = False
+        self.game.remove_player(self.game.player)  # Every ship belongs to a client
+        self.starting_lives = self.game.lives
+        self.restart_ticks = 0  # Ticks left before a new round, while the game is over
+        self.rounds = 1
+        self.max_clients = max_clients
+        self.invincible = invincible
+        self.connections = {}  # Address -> Connection
+        self.transport = None
+        self.ticks = 0
+        self.stats = {"tick_seconds": 0.0, "snapshot_seconds": 0.0}
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, address):
+        try:
+            message = data[0]
+            connection = self.connections.get(address)
+            if message == HELLO:
+                connection = connection or self.join(address)
+                if connection is not None:
+                    self.transport.sendto(WELCOME_MESSAGE.pack(WELCOME, connection.slot), address)
+            elif message == INPUT and connection is not None:
+                _, newest, ack, count = INPUT_HEADER.unpack_from(data)
+                connection.receive_inputs(newest, data[INPUT_HEADER.size : INPUT_HEADER.size + count])
+                connection.acknowledge(ack)
+            elif message == BYE and connection is not None:
+                self.leave(address)
+        except (IndexError, struct.error):
+            pass  # Ignore malformed datagrams
+
+    def join(self, address):
+        """Gives a new client a ship, or returns None when the server is full."""
+        slots = {connection.slot for connection in self.connections.values()}
+        free = [slot for slot in range(self.max_clients) if slot not in slots]
+        if not free:
+            return None
+        self.game.activate()
+        player = self.game.add_player()
+        if self.invincible:
+            player.make_invincible(float("inf"))
+        connection = self.connections[address] = Connection(free[0], player)
+        return connection
+
+    def leave(self, address):
+        """Removes a client and its ship."""
+        connection = self.connections.pop(address)
+        self.game.remove_player(connection.player)
+
+    def tick(self):
+        """Runs one simulation tick and sends snapshots when one is due."""
+        start = time.perf_counter()
+        game = self.game
+        game.activate()
+        for connection in self.connections.values():
+            connection.next_controls()
+        if not game.game_over:
+            game.step(DT)
+            if game.game_over:
+                self.restart_ticks = RESTART_DELAY * SIMULATION_RATE
+        else:
+            self.restart_ticks -= 1
+            if self.restart_ticks <= 0:
+                self.restart()
+        self.ticks += 1
+        stepped = time.perf_counter()
+        if self.ticks % SNAPSHOT_INTERVAL == 0 and self.connections:
+            self.send_snapshots()
+        end = time.perf_counter()
+        self.stats["tick_seconds"] += end - start
+        self.stats["snapshot_seconds"] += end - stepped
+
+    def restart(self):
+        """Starts a new round: clears the world and resets the score, lives, waves and ships."""
+        game = self.game
+        game.activate()
+        for sprite in game.asteroids.sprites() + game.shots.sprites():
+            sprite.kill()
+        game.effects.clear()
+        game.score = 0
+        game.lives = self.starting_lives
+        game.game_over = False
+        game.asteroid_field.elapsed = game.asteroid_field.spawn_timer = 0.0
+        for player in game.players:
+            player.reset(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
+            player.make_invincible(float("inf") if self.invincible else 3)
+        self.rounds += 1
+
+    def send_snapshots(self):
+        records = entity_records(self.game)
+        players = [
+            (c.slot, c.player.position.x, c.player.position.y, c.player.rotation, _player_flags(c.player))
+            for c in self.connections.values()
+        ]
+        for address, connection in self.connections.items():
+            packet = connection.snapshot(self.ticks, records, players, self.game.score, self.game.lives)
+            self.transport.sendto(packet, address)
+
+
+def _player_flags(player):
+    return (EXPLODING if player.exploding else 0) | (INVINCIBLE if player.invincible else 0)
+
+
+class PredictedShip:
+    """The client's own ship, moved locally with the same code as `Player`."""
+
+    rotate = Player.rotate
+    move = Player.move
+
+    def __init__(self):
+        self.position = pygame.Vector2(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
+        self.rotation = 0
+        self.flags = 0
+
+    def apply(self, controls, dt):
+        """Moves the ship like `Player.update` does for one tick of `controls`."""
+        if self.flags & EXPLODING:
+            return
+        if controls.turn:
+            self.rotate(dt, controls.turn)
+        if controls.thrust:
+            self.move(dt * controls.thrust)
+
+
+class Client(asyncio.DatagramProtocol):
+    """
+    A player connected to a `Server`. Call `send_input(controls)` and
+    `update(dt)` once per tick, and `view()` to get what to draw.
+    """
+
+    def __init__(self):
+        self.transport = None
+        self.slot = None  # Assigned by the server's welcome
+        self.input_number = 0
+        self.pending = deque(maxlen=SIMULATION_RATE * 2)  # (number, Controls) the server has not applied yet
+        self.states = {}  # Snapshot tick -> {entity id: (tick, record)}
+        self.latest = 0  # Newest snapshot tick applied
+        self.history = deque(maxlen=SNAPSHOT_HISTORY)  # (tick, {entity id: (kind, x, y, vx, vy, radius)}, players)
+        self.ship = PredictedShip()
+        self.clock = 0.0  # Estimate of the server's current tick
+        self.score = 0
+        self.lives = 0
+        self.stats = {"bytes_received": 0, "snapshots": 0, "dropped": 0}
+
+    def connection_made(self, transport):
+        self.transport = transport
+        transport.sendto(bytes((HELLO,)))
+
+    def datagram_received(self, data, address):
+        try:
+            if data[0] == WELCOME:
+                self.slot = WELCOME_MESSAGE.unpack_from(data)[1]
+            elif data[0] == SNAPSHOT:
+                self.stats["bytes_received"] += len(data)
+                self.receive_snapshot(data)
+        except (IndexError, KeyError, struct.error):
+            self.stats["dropped"] += 1
+
+    def close(self):
+        """Tells the server the client is leaving and closes the socket."""
+        if self.transport is not None:
+            self.transport.sendto(bytes((BYE,)))
+            self.transport.close()
+
+    def send_input(self, controls):
+        """Sends the controls for the next tick and applies them to the predicted ship."""
+        if self.slot is None:
+            return
+        self.input_number += 1
+        self.pending.append((self.input_number, controls))
+        self.ship.apply(controls, DT)
+        recent = list(self.pending)[-INPUT_REDUNDANCY:]
+        header = INPUT_HEADER.pack(INPUT, self.input_number, self.latest, len(recent))
+        self.transport.sendto(header + bytes(pack_controls(sent) for _, sent in recent))
+
+    def update(self, dt):
+        """Advances the client's estimate of the server clock."""
+        self.clock += dt * SIMULATION_RATE
+
+    def receive_snapshot(self, data):
+        snapshot = decode_snapshot(data, self.states)
+        if snapshot is None or snapshot["tick"] <= self.latest:
+            self.stats["dropped"] += 1  # Baseline unknown, or arrived out of order
+            return
+        tick = snapshot["tick"]
+        self.stats["snapshots"] += 1
+        self.states[tick] = snapshot["state"]
+        oldest = tick - SNAPSHOT_HISTORY * SNAPSHOT_INTERVAL
+        self.states = {kept: state for kept, state in self.states.items() if kept > oldest}
+        self.latest = tick
+        self.score = snapshot["score"]
+        self.lives = snapshot["lives"]
+        if abs(self.clock - tick) > SNAPSHOT_INTERVAL * 2:
+            self.clock = tick  # Resynchronize after a stall or on the first snapshot
+
+        entities = {}
+        for entity_id, entry in snapshot["state"].items():
+            x, y = extrapolate(entry, tick)
+            kind, _, _, vx, vy, radius = entry[1]
+            scaled = (value / POSITION_SCALE for value in (x, y, vx, vy))
+            entities[entity_id] = (kind, *scaled, radius)
+        self.history.append((tick, entities, snapshot["players"]))
+        self.reconcile(snapshot["input_ack"], snapshot["players"].get(self.slot))
+
+    def reconcile(self, input_ack, own):
+        """Resets the predicted ship to the server's and replays the inputs the server has not seen."""
+        while self.pending and self.pending[0][0] <= input_ack:
+            self.pending.popleft()
+        if own is None:
+            return
+        x, y, rotation, flags = own
+        self.ship.position.update(x, y)
+        self.ship.rotation = rotation
+        self.ship.flags = flags
+        for _, controls in self.pending:
+            self.ship.apply(controls, DT)
+
+    def view(self):
+        """
+        Returns what to draw now: ({entity id: (kind, x, y, vx, vy, radius)},
+        {slot: (x, y, rotation, flags)}), with other entities interpolated
+        `INTERPOLATION_DELAY` ticks in the past and the own ship predicted.
+        """
+        if not self.history:
+            return {}, {}
+        render_tick = self.clock - INTERPOLATION_DELAY
+        older = newer = self.history[-1]
+        for snapshot in reversed(self.history):
+            if snapshot[0] <= render_tick:
+                older = snapshot
+                break
+            newer = snapshot
+        else:
+            older = newer  # Before the oldest snapshot we have
+
+        span = newer[0] - older[0]
+        alpha = min(max((render_tick - older[0]) / span, 0), 1) if span else 1
+        entities = {}
+        for entity_id, now in newer[1].items():
+            before = older[1].get(entity_id)
+            if before is None:
+                entities[entity_id] = now
+            else:
+                x = before[1] + (now[1] - before[1]) * alpha
+                y = before[2] + (now[2] - before[2]) * alpha
+                entities[entity_id] = (now[0], x, y, now[3], now[4], now[5])
+
+        players = {}
+        for slot, now in newer[2].items():
+            before = older[2].get(slot, now)
+            x = before[0] + (now[0] - before[0]) * alpha
+            y = before[1] + (now[1] - before[1]) * alpha
+            players[slot] = (x, y, now[2], now[3])
+        if self.slot in players:
+            players[self.slot] = (self.ship.position.x, self.ship.position.y, self.ship.rotation, self.ship.flags)
+        return entities, players
+
+    def draw(self, screen):
+        """Draws the current view with the game's sprites."""
+        import assets
+        from asteroid import Asteroid
+        from player import Shot
+
+        entities, players = self.view()
+        frame_number = int(self.clock) // 6  # Asteroid animations run at 10 frames per second
+        blits = []
+        for entity_id, (kind, x, y, vx, vy, radius) in entities.items():
+            if kind == KIND_ASTEROID:
+                frames = Asteroid.frames_for_radius(radius)
+                if not frames:
+                    continue
+                surface = frames[(frame_number + entity_id) % len(frames)]
+            else:
+                angle = pygame.Vector2(0, 1).angle_to((vx, vy))
+                surface = assets.rotations.rotate(Shot.load_bullet_image(), -angle)
+            blits.append((surface, surface.get_rect(center=(x, y))))
+        ship = Player.load_ship_sprite()
+        for x, y, rotation, flags in players.values():
+            if not flags & EXPLODING:
+                surface = assets.rotations.rotate(ship, -rotation + 180)
+                blits.append((surface, surface.get_rect(center=(x, y))))
+        return screen.blits(blits)
+
+
+async def serve(server, host="0.0.0.0", port=7777, seconds=None):
+    """Runs `server` on a UDP port in real time, for `seconds` or forever."""
+    loop = asyncio.get_running_loop()
+    transport, _ = await loop.create_datagram_endpoint(lambda: server, local_addr=(host, port))
+    try:
+        start = next_tick = loop.time()
+        while seconds is None or loop.time() - start < seconds:
+            server.tick()
+            next_tick += DT
+            await asyncio.sleep(max(0.0, next_tick - loop.time()))
+    finally:
+        transport.close()
+
+
+async def connect(host, port):
+    """Connects a new `Client` to a server and waits for its welcome."""
+    loop = asyncio.get_running_loop()
+    _, client = await loop.create_datagram_endpoint(Client, remote_addr=(host, port))
+    for _ in range(100):
+        if client.slot is not None:
+            return client
+        await asyncio.sleep(0.01)
+    client.close()
+    raise ConnectionError(f"No answer from {host}:{port}")
+
+
+async def loopback(clients=4, ticks=SIMULATION_RATE * 10, asteroids=0, seed=1, realtime=True, controls=None):
+    """
+    Runs a server and `clients` bot clients on 127.0.0.1 in one process.
+
+    :param ticks: Simulation ticks to run.
+    :param asteroids: Asteroids spawned on screen before the first tick.
+    :param realtime: Pace ticks at the simulation rate instead of running flat out.
+    :param controls: Function (client index, tick) -> Controls, a patrol by default.
+    :return: (server, clients) after the run.
+    """
+    import headless
+
+    controls = controls or (lambda index, tick: headless.patrol(tick + index * 40))
+    loop = asyncio.get_running_loop()
+    server = Server(Game(seed=seed), invincible=True)
+    transport, _ = await loop.create_datagram_endpoint(lambda: server, local_addr=("127.0.0.1", 0))
+    port = transport.get_extra_info("sockname")[1]
+    bots = [await connect("127.0.0.1", port) for _ in range(clients)]
+    headless.populate(server.game, asteroids)
+    try:
+        next_tick = loop.time()
+        for tick in range(ticks):
+            for index, bot in enumerate(bots):
+                bot.send_input(controls(index, tick))
+                bot.update(DT)
+            await _yield(clients + 1)  # Let the inputs arrive
+            server.tick()
+            await _yield(clients + 1)  # Let the snapshots arrive
+            if realtime:
+                next_tick += DT
+                await asyncio.sleep(max(0.0, next_tick - loop.time()))
+    finally:
+        for bot in bots:
+            bot.close()
+        transport.close()
+    return server, bots
+
+
+async def _yield(times):
+    # The event loop reads one datagram per socket per iteration, so a server
+    # with n clients needs n iterations to take in one input from each
+    for _ in range(times):
+        await asyncio.sleep(0)
+
+
+async def play(host, port):
+    """Runs a windowed client: WASD to fly, space to fire."""
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    font = pygame.font.Font(None, 36)
+    client = await connect(host, port)
+    loop = asyncio.get_running_loop()
+    next_tick = loop.time()
+    try:
+        while True:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    return
+            keys = pygame.key.get_pressed()
+            turn = keys[pygame.K_d] - keys[pygame.K_a]
+            thrust = keys[pygame.K_w] - keys[pygame.K_s]
+            client.send_input(Controls(turn, thrust, keys[pygame.K_SPACE]))
+            client.update(DT)
+
+            screen.fill("black")
+            client.draw(screen)
+            screen.blit(font.render(f"Score: {client.score}  Lives: {client.lives}", True, "white"), (10, 10))
+            pygame.display.flip()
+
+            next_tick += DT
+            await asyncio.sleep(max(0.0, next_tick - loop.time()))
+    finally:
+        client.close()
+        pygame.quit()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Networked Asteroids")
+    commands = parser.add_subparsers(dest="command", required=True)
+    server_parser = commands.add_parser("server", help="run an authoritative server")
+    server_parser.add_argument("--host", default="0.0.0.0")
+    server_parser.add_argument("--port", type=int, default=7777)
+    server_parser.add_argument("--seed", type=int)
+    client_parser = commands.add_parser("client", help="join a server in a window")
+    client_parser.add_argument("host")
+    client_parser.add_argument("port", type=int)
+    loopback_parser = commands.add_parser("loopback", help="run a server and bot clients locally")
+    loopback_parser.add_argument("--clients", type=int, default=4)
+    loopback_parser.add_argument("--seconds", type=float, default=10)
+    loopback_parser.add_argument("--asteroids", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.command == "client":
+        asyncio.run(play(args.host, args.port))
+    else:
+        import headless
+
+        headless.init()
+        if args.command == "server":
+            print(f"Serving on {args.host}:{args.port}")
+            asyncio.run(serve(Server(Game(seed=args.seed)), args.host, args.port))
+        else:
+            server, bots = asyncio.run(loopback(args.clients, int(args.seconds * SIMULATION_RATE), args.asteroids))
+            seconds = server.ticks / SIMULATION_RATE
+            print(f"{server.ticks} ticks, {server.stats['tick_seconds'] / server.ticks * 1000:.2f} ms per server tick")
+            for bot in bots:
+                kb = bot.stats["bytes_received"] / seconds / 1000
+                stats = bot.stats
+                print(f"client {bot.slot}: {stats['snapshots']} snapshots, {kb:.1f} kB/s, {stats['dropped']} dropped")
@@ -1,16 +1,29 @@
+from collections import namedtuple
 import pygame
+import assets
+import sounds
 from circleshape import CircleShape
 from constants import *
+from pool import Pool
+
+
+# One tick of player input: turn and thrust are -1, 0 or 1, fire is a bool
+Controls = namedtuple("Controls", "turn thrust fire")
 
 
 class Player(CircleShape):
+    shot_class = None  # Class used for fired shots, defaults to Shot
+    layer = 2  # Drawn above asteroids and shots
+
     def __init__(self, x, y):
         super().__init__(x, y, CircleShape.PLAYER_RADIUS)
         self.rotation = 0
         self.shoot_timer = 0
         self.invincible = False  # Player starts non-invincible
         self.invincible_timer = 0  # Timer for invincibility
-        
+        self.controls = None  # Scripted Controls for the next tick, None to read the keyboard
+        self.fire_queued = False  # Space was pressed since the last tick
+
         # Explosion-related attributes
         self.exploding = False
         self.explosion_frames = self.load_explosion_frames()
@@ -20,43 +33,28 @@ class Player(CircleShape):
         self.explosion_position = None  # Track explosion position separately
 
         # Load the ship sprite and scale it
-        self.sprite = pygame.image.load("sprites/player/ship.png").convert_alpha()
-        self.sprite = pygame.transform.scale(self.sprite, (65, 65))  # Adjust size as needed
-
-        # Load the explosion sound
-        self.explosion_sound = pygame.mixer.Sound("sprites/player/p-explosion.mp3")
-        self.laser_sound = pygame.mixer.Sound("sprites/player/laser.mp3")
-        self.laser_sound.set_volume(1)
-        self.explosion_sound.set_volume(0.5)
+        self.sprite = self.load_ship_sprite()
 
     def make_invincible(self, duration):
         """Activate invincibility for a given duration (in seconds)."""
         self.invincible = True
         self.invincible_timer = duration
 
+    @staticmethod
+    def load_ship_sprite():
+        """Returns the shared, scaled ship sprite."""
+        return assets.load_image("sprites/player/ship.PNG", (65, 65))  # Adjust size as needed
+
     @staticmethod
     def load_life_sprites():
-        """Loads, resizes, and returns a dictionary of life sprites."""
+        """Returns a dictionary of resized life sprites."""
         heart_size = (75, 25)  # Desired size (width, height) in pixels
-        return {
-            0: pygame.transform.scale(pygame.image.load("sprites/player/0.png").convert_alpha(), heart_size),
-            1: pygame.transform.scale(pygame.image.load("sprites/player/1.png").convert_alpha(), heart_size),
-            2: pygame.transform.scale(pygame.image.load("sprites/player/2.png").convert_alpha(), heart_size),
-            3: pygame.transform.scale(pygame.image.load("sprites/player/3.png").convert_alpha(), heart_size),
-        }
+        return {lives: assets.load_image(f"sprites/player/{lives}.png", heart_size) for lives in range(4)}
 
     @staticmethod
     def load_explosion_frames():
-        """Loads explosion animation frames for the player."""
-        frames = []
-        for i in range(64):  # Assuming 64 explosion frames
-            path = f"sprites/player/destroyed/tile{i:03}.png"
-            try:
-                frame = pygame.image.load(path).convert_alpha()
-                frames.append(frame)
-            except FileNotFoundError:
-                continue
-        return frames
+        """Returns the shared explosion animation frames for the player."""
+        return assets.load_frames("sprites/player/destroyed/tile{:03}.png", 64)  # Assuming 64 explosion frames
 
     def explode(self):
         """Trigger the player's explosion."""
@@ -66,47 +64,62 @@ class Player(CircleShape):
         self.invincible = False  # Turn off invincibility during explosion
 
         # Play the explosion sound
-        self.explosion_sound.play()
+        sounds.play("player-explosion")
 
     def reset(self, x, y):
         """Reset the player after explosion."""
         self.position = pygame.Vector2(x, y)
+        self.previous_position = pygame.Vector2(x, y)  # Don't interpolate the respawn jump
         self.exploding = False
         self.invincible = False
         self.invincible_timer = 0
 
     def shoot(self):
-        if self.laser_sound:
-            self.laser_sound.play()  # Play the laser sound effect
+        sounds.play("laser")  # Play the laser sound effect
         direction = pygame.Vector2(0, 1).rotate(self.rotation)
         velocity = direction * PLAYER_SHOOT_SPEED
-        return Shot(self.position.x, self.position.y, velocity, self.rotation)
+        return (self.shot_class or Shot).create(self.position.x, self.position.y, velocity, self.rotation)
+
+    def try_shoot(self):
+        """Fires a shot if the cooldown allows it and returns it, or None."""
+        if self.exploding or self.shoot_timer > 0:  # Can't shoot while exploding
+            return None
+        self.shoot_timer = PLAYER_SHOOT_COOLDOWN
+        return self.shoot()
 
-    def handle_input(self, event, shots_group):
+    def handle_input(self, event):
+        # Shots are fired on the next tick, so the shot timing is part of the tick's controls
         if event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE:
-            if not self.exploding and self.shoot_timer <= 0:  # Can't shoot while exploding
-                shot = self.shoot()
-                shots_group.add(shot)
-                self.shoot_timer = PLAYER_SHOOT_COOLDOWN
+            self.fire_queued = True
 
-    def draw(self, screen):
-        """Draw the player's ship sprite or explosion."""
+    def read_keyboard(self):
+        """Returns the Controls held on the keyboard for the next tick, firing if space was pressed."""
+        keys = pygame.key.get_pressed()
+        fire, self.fire_queued = self.fire_queued, False
+        return Controls(keys[pygame.K_d] - keys[pygame.K_a], keys[pygame.K_w] - keys[pygame.K_s], fire)
+
+    def blit_item(self):
+        """Returns the ship or explosion frame to blit and where, or None when nothing shows."""
         if self.exploding:
             if self.explosion_frame < len(self.explosion_frames):
                 frame = self.explosion_frames[self.explosion_frame]
-                frame_rect = frame.get_rect(center=(self.explosion_position.x, self.explosion_position.y))
-                screen.blit(frame, frame_rect)
-            return  # Skip drawing the ship during explosion
+                return frame, frame.get_rect(center=(self.explosion_position.x, self.explosion_position.y))
+            return None  # Skip drawing the ship during explosion
 
         if self.invincible:
             # Flicker effect: Draw only in alternate frames
             if pygame.time.get_ticks() % 500 < 250:
-                return  # Skip drawing for flickering effect
+                return None  # Skip drawing for flickering effect
 
-        # Rotate the sprite based on the player's rotation
-        rotated_sprite = pygame.transform.rotate(self.sprite, -self.rotation + 180)  # Adjust by 180 degrees
-        sprite_rect = rotated_sprite.get_rect(center=(self.position.x, self.position.y))
-        screen.blit(rotated_sprite, sprite_rect)
+        # Rotate the sprite based on the player's rotation, shared through the rotation cache
+        rotated_sprite = assets.rotations.rotate(self.sprite, -self.rotation + 180)  # Adjust by 180 degrees
+        position = self.render_position()
+        return rotated_sprite, rotated_sprite.get_rect(center=(position.x, position.y))
+
+    def draw(self, screen):
+        """Draw the player's ship sprite or explosion and return the changed rect."""
+        item = self.blit_item()
+        return None if item is None else screen.blit(*item)
 
     def rotate(self, dt, direction):
         self.rotation += direction * PLAYER_TURN_SPEED * dt
@@ -116,6 +129,7 @@ class Player(CircleShape):
         self.position += forward * PLAYER_SPEED * dt
 
     def update(self, dt):
+        self.previous_position.update(self.position)
         if self.exploding:
             # Handle explosion animation
             self.explosion_time_since_last_frame += dt
@@ -136,20 +150,19 @@ class Player(CircleShape):
         if self.shoot_timer > 0:
             self.shoot_timer -= dt
 
-        keys = pygame.key.get_pressed()
-
-        if keys[pygame.K_a]:
-            self.rotate(dt, -1)
-        if keys[pygame.K_d]:
-            self.rotate(dt, 1)
+        controls = self.controls if self.controls is not None else self.read_keyboard()
 
-        if keys[pygame.K_w]:
-            self.move(dt)
-        if keys[pygame.K_s]:
-            self.move(-dt)
+        if controls.turn:
+            self.rotate(dt, controls.turn)
+        if controls.thrust:
+            self.move(dt * controls.thrust)
+        if controls.fire:
+            self.try_shoot()
 
 class Shot(CircleShape):
     bullet_image = None  # Class variable to hold the bullet sprite
+    max_age = SHOT_MAX_AGE
+    layer = 1  # Drawn above asteroids
 
     def __init__(self, x, y, velocity, rotation, bullet_width=50, bullet_height=100):
         """
@@ -163,26 +176,51 @@ class Shot(CircleShape):
         :param bullet_height: Desired height of the bullet sprite.
         """
         super().__init__(x, y, SHOT_RADIUS)
-        self.velocity = velocity
-        self.rotation = rotation  # Store rotation angle
 
         # Load and scale the bullet sprite
         if Shot.bullet_image is None:
-            Shot.bullet_image = pygame.image.load("sprites/player/bullet.png").convert_alpha()
-            Shot.bullet_image = pygame.transform.scale(Shot.bullet_image, (bullet_width, bullet_height))
+            Shot.bullet_image = Shot.load_bullet_image(bullet_width, bullet_height)
 
-        # Rotate the bullet sprite to match the rotation angle
-        self.bullet_sprite = pygame.transform.rotate(Shot.bullet_image, -self.rotation)
+        self.aim(velocity, rotation)
 
-    def draw(self, screen):
-        """Draws the rotated bullet sprite."""
+    @staticmethod
+    def load_bullet_image(bullet_width=50, bullet_height=100):
+        """Returns the shared, scaled bullet sprite."""
+        return assets.load_image("sprites/player/bullet.png", (bullet_width, bullet_height))
+
+    def reset(self, x, y, velocity, rotation):
+        """Reinitializes a pooled shot in place."""
+        super().reset(x, y, SHOT_RADIUS)
+        self.aim(velocity, rotation)
+
+    def aim(self, velocity, rotation):
+        """Sets the shot's velocity and rotates the bullet sprite to match."""
+        self.velocity = velocity
+        self.rotation = rotation  # Store rotation angle
+
+        # Rotate the bullet sprite to match the rotation angle (a cache lookup for angles seen before)
+        self.bullet_sprite = assets.rotations.rotate(Shot.bullet_image, -self.rotation)
+
+    def blit_item(self):
+        """Returns the rotated bullet sprite and where to blit it, or None without a sprite."""
         if self.bullet_sprite:
-            bullet_rect = self.bullet_sprite.get_rect(center=(self.position.x, self.position.y))
-            screen.blit(self.bullet_sprite, bullet_rect)
-        else:
-            # Fallback to a circle if the sprite fails to load
-            pygame.draw.circle(screen, "white", (self.position.x, self.position.y), self.radius)
+            position = self.render_position()
+            return self.bullet_sprite, self.bullet_sprite.get_rect(center=(position.x, position.y))
+        return None
+
+    def draw(self, screen):
+        """Draws the rotated bullet sprite and returns the changed rect."""
+        item = self.blit_item()
+        if item is not None:
+            return screen.blit(*item)
+        # Fallback to a circle if the sprite fails to load
+        position = self.render_position()
+        return pygame.draw.circle(screen, "white", (position.x, position.y), self.radius)
 
     def update(self, dt):
         """Updates the bullet's position."""
+        self.previous_position.update(self.position)
         self.position += self.velocity * dt
+
+
+Shot.pool = Pool(Shot)
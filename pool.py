@@ -0,0 +1,45 @@
+class Pool:
+    """
+    Free list of killed sprites that can be reinitialized instead of rebuilt.
+
+    Pooled classes implement `reset(*args)` with the same arguments as their
+    constructor, and hand themselves back through `release` when killed
+    (see `CircleShape.kill`).
+    """
+
+    def __init__(self, cls):
+        self.cls = cls
+        self.free = []
+        self.created = 0  # Objects built with the constructor
+        self.reused = 0  # Objects handed out again from the free list
+        self.live = 0  # Objects currently in use
+        self.high_water = 0  # Most objects ever in use at once
+
+    def acquire(self, *args):
+        """Returns a reset object from the free list, or a new one if it is empty."""
+        if self.free:
+            obj = self.free.pop()
+            obj.reset(*args)
+            self.reused += 1
+        else:
+            obj = self.cls(*args)
+            obj.pooled = False  # Hand it back to us when it is killed
+            self.created += 1
+        self.live += 1
+        self.high_water = max(self.high_water, self.live)
+        return obj
+
+    def release(self, obj):
+        """Puts a killed object back on the free list."""
+        self.live -= 1
+        self.free.append(obj)
+
+    def stats(self):
+        """Returns the pool counters, used to tune pool sizes."""
+        return {
+            "created": self.created,
+            "reused": self.reused,
+            "live": self.live,
+            "free": len(self.free),
+            "high_water": self.high_water,
+        }
@@ -0,0 +1,114 @@
+"""
+Startup preloading behind a loading screen.
+
+Animation bundles (see bundle.py) are memory-mapped, then every other
+sprite PNG under `sprites/` and every sound clip is decoded in a thread
+pool. The decoded surfaces are converted to the display format and
+stored in the asset cache on the main thread as they arrive, while a
+progress bar is drawn. The scaled frame sets and sprites are then built
+from the cache, so gameplay never touches the disk.
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import pygame
+import assets
+import bundle
+import sounds
+from constants import *
+
+SPRITE_ROOT = "sprites"
+SKIP_DIRS = {"old"}  # Unused art kept in the repo
+PRELOAD_THREADS = min(8, os.cpu_count() or 1)
+
+
+def find_images(root=SPRITE_ROOT):
+    """Returns the paths of every PNG under `root`, as the game spells them."""
+    paths = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(name for name in dirnames if name not in SKIP_DIRS)
+        for name in sorted(filenames):
+            if name.lower().endswith(".png"):
+                paths.append(os.path.join(dirpath, name).replace(os.sep, "/"))
+    return paths
+
+
+def warm_caches():
+    """Builds every scaled sprite, frame set and sprite rotation the game uses from the cached images."""
+    import effects
+    from asteroid import Asteroid
+    from player import Player, Shot
+
+    for kind in range(1, ASTEROID_KINDS + 1):
+        Asteroid.frames_for_radius(ASTEROID_MIN_RADIUS * kind)
+    Asteroid.load_explosion_frames()
+    effects.debris_frames()
+    Player.load_life_sprites()
+    Player.load_explosion_frames()
+    # Every rotation the ship and the shots can be drawn at
+    assets.rotations.warm(Player.load_ship_sprite())
+    assets.rotations.warm(Shot.load_bullet_image())
+
+
+def preload(progress=None, threads=PRELOAD_THREADS):
+    """
+    Decodes every image and sound in parallel and fills the asset caches.
+
+    :param progress: Called on the main thread with (done, total) as items finish.
+    :param threads: Decoder threads.
+    :return: Number of files decoded.
+    """
+    # Animations with a packed bundle are mapped in directly instead of decoded
+    for pattern in bundle.ANIMATIONS:
+        assets.load_bundle(pattern)
+
+    images = [path for path in find_images() if not assets.is_loaded(path)]
+    clips = []
+    if pygame.mixer.get_init():
+        clips = [name for name in sounds.bank.clips if name not in sounds.bank.sounds]
+    total = len(images) + len(clips) + 1  # The last step builds the scaled frame sets
+
+    with ThreadPoolExecutor(threads) as pool:
+        # Decoding runs in the pool; converting needs the display, so it stays on this thread
+        jobs = {pool.submit(pygame.image.load, path): (assets.add_image, path) for path in images}
+        for name in clips:
+            jobs[pool.submit(pygame.mixer.Sound, sounds.bank.clips[name][0])] = (sounds.bank.add, name)
+
+        for done, job in enumerate(as_completed(jobs), 1):
+            store, key = jobs[job]
+            store(key, job.result())
+            if progress:
+                progress(done, total)
+
+    warm_caches()
+    if progress:
+        progress(total, total)
+    return len(jobs)
+
+
+class LoadingScreen:
+    """Progress bar drawn while `preload` runs."""
+
+    def __init__(self, screen, font):
+        self.screen = screen
+        self.font = font
+        self.bar = pygame.Rect(0, 0, screen.get_width() // 2, 24)
+        self.bar.center = screen.get_rect().center
+        self.percent = None
+
+    def __call__(self, done, total):
+        pygame.event.pump()  # Keep the window responsive
+        percent = done * 100 // total
+        if percent == self.percent:
+            return  # Only redraw when the bar moves
+        self.percent = percent
+
+        screen = self.screen
+        screen.fill("black")
+        pygame.draw.rect(screen, "white", self.bar, width=2)
+        filled = self.bar.inflate(-8, -8)
+        filled.width = round(filled.width * done / total)
+        screen.fill("white", filled)
+        text = self.font.render(f"Loading {percent}%", True, "white")
+        screen.blit(text, text.get_rect(midbottom=(self.bar.centerx, self.bar.top - 10)))
+        pygame.display.flip()
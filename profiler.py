@@ -0,0 +1,173 @@
+"""
+Frame profiler and on-screen performance overlay.
+
+The game loop calls `mark(phase)` at the end of each phase, and the time
+since the previous mark is added to that phase for the current frame. The
+last `PROFILER_FRAMES` frames are kept in a ring buffer with the entity
+counts and net allocations of each frame. Press F3 in game to show the
+overlay, or run `python main.py --profile frames.csv` (or `.json`) to record
+from the start and dump the buffer on exit.
+
+When the profiler is disabled every hook is a single flag check, so the
+calls stay in the loop at all times.
+"""
+import csv
+import json
+import sys
+import time
+
+import pygame
+from constants import *
+
+PHASES = ("events", "update", "spawn", "player collision", "shot collision", "draw", "flip")
+COUNTERS = ("asteroids", "shots", "sprites", "allocations")
+PROFILER_FRAMES = 600  # Frames kept in the ring buffer
+GRAPH_FRAMES = 120  # Frames shown in the overlay's frame-time graph
+
+
+class FrameProfiler:
+    """
+    Per-frame phase timings, entity counts and allocations in a ring buffer.
+
+    Allocations are the net change in Python's allocated memory blocks over
+    the frame (`sys.getallocatedblocks`), which is cheap enough to sample
+    every frame and shows garbage piling up.
+    """
+
+    def __init__(self, frames=PROFILER_FRAMES):
+        self.enabled = False
+        self.visible = False  # Overlay shown
+        self.overlay_recording = False  # Recording was turned on by showing the overlay
+        self.size = frames
+        self.columns = {name: [0.0] * frames for name in ("frame", "work") + PHASES + COUNTERS}
+        self.index = 0  # Next slot to write
+        self.count = 0  # Frames recorded, up to `size`
+        self.current = dict.fromkeys(PHASES, 0.0)
+        self.frame_start = self.last = 0.0
+        self.blocks = 0
+        self.font = None
+
+    def toggle_overlay(self):
+        """
+        Shows or hides the overlay. Recording runs while it is shown, and
+        keeps running once it is hidden only if it was on before (--profile).
+        """
+        self.visible = not self.visible
+        if self.visible and not self.enabled:
+            self.enabled = self.overlay_recording = True
+            self.begin_frame()  # Time the rest of this frame from here
+        elif not self.visible and self.overlay_recording:
+            self.enabled = self.overlay_recording = False
+
+    def begin_frame(self):
+        """Starts timing a new frame."""
+        for phase in self.current:
+            self.current[phase] = 0.0
+        self.frame_start = self.last = time.perf_counter()
+        self.blocks = sys.getallocatedblocks()
+
+    def mark(self, phase):
+        """Adds the time since the previous mark to `phase`."""
+        now = time.perf_counter()
+        self.current[phase] += now - self.last
+        self.last = now
+
+    def end_frame(self, frame_time, asteroids, shots, sprites):
+        """
+        Stores the frame in the ring buffer.
+
+        :param frame_time: Seconds since the previous frame, including any wait.
+        :param asteroids: Live asteroids.
+        :param shots: Live shots.
+        :param sprites: Drawn sprites.
+        """
+        i = self.index
+        columns = self.columns
+        columns["frame"][i] = frame_time * 1000
+        columns["work"][i] = (self.last - self.frame_start) * 1000
+        for phase, seconds in self.current.items():
+            columns[phase][i] = seconds * 1000
+        columns["asteroids"][i] = asteroids
+        columns["shots"][i] = shots
+        columns["sprites"][i] = sprites
+        columns["allocations"][i] = sys.getallocatedblocks() - self.blocks
+        self.index = (i + 1) % self.size
+        self.count = min(self.count + 1, self.size)
+
+    def rows(self):
+        """Returns the recorded frames, oldest first, as dicts of column values."""
+        start = (self.index - self.count) % self.size
+        order = [(start + n) % self.size for n in range(self.count)]
+        return [{name: values[i] for name, values in self.columns.items()} for i in order]
+
+    def recent(self, name, frames):
+        """Returns the last `frames` values of a column, oldest first."""
+        frames = min(frames, self.count)
+        values = self.columns[name]
+        return [values[(self.index - frames + n) % self.size] for n in range(frames)]
+
+    def dump(self, path):
+        """Writes the ring buffer to `path`, as JSON if it ends in .json and CSV otherwise."""
+        rows = self.rows()
+        with open(path, "w", newline="") as f:
+            if path.endswith(".json"):
+                json.dump(rows, f, indent=1)
+            else:
+                writer = csv.DictWriter(f, fieldnames=list(self.columns))
+                writer.writeheader()
+                writer.writerows(rows)
+
+    def draw(self, screen):
+        """Draws the overlay in the top right corner and returns its rect, or None if hidden."""
+        if not self.visible or not self.count:
+            return None
+        if self.font is None:
+            self.font = pygame.font.Font(None, 20)
+
+        frames = min(self.count, GRAPH_FRAMES)
+        averages = {name: sum(self.recent(name, frames)) / frames for name in self.columns}
+        lines = [f"frame {averages['frame']:6.2f} ms   work {averages['work']:6.2f} ms"]
+        lines += [f"{phase:<16} {averages[phase]:6.2f} ms" for phase in PHASES]
+        lines.append(
+            f"ast {averages['asteroids']:.0f}  shots {averages['shots']:.0f}  "
+            f"sprites {averages['sprites']:.0f}  alloc {averages['allocations']:+.0f}"
+        )
+
+        line_height = 16
+        graph_height = 60
+        panel = pygame.Rect(0, 0, GRAPH_FRAMES * 2 + 20, len(lines) * line_height + graph_height + 20)
+        panel.topright = (screen.get_width() - 10, 10)
+        screen.fill((0, 0, 0), panel)
+        for n, line in enumerate(lines):
+            screen.blit(self.font.render(line, True, "white"), (panel.x + 10, panel.y + 5 + n * line_height))
+
+        # Work time per frame, with the frame budget as a reference line
+        bottom = panel.bottom - 10
+        budget = 1000 / (RENDER_FPS or SIMULATION_RATE)
+        scale = graph_height / (2 * budget)
+        budget_y = bottom - budget * scale
+        pygame.draw.line(screen, (90, 90, 90), (panel.x + 10, budget_y), (panel.right - 10, budget_y))
+        for n, work in enumerate(self.recent("work", frames)):
+            x = panel.x + 10 + n * 2
+            color = (80, 220, 80) if work <= budget else (230, 70, 70)
+            pygame.draw.line(screen, color, (x, bottom), (x, bottom - min(work * scale, graph_height)))
+        return panel
+
+
+current = FrameProfiler()  # Shared by the game loop, the game and the renderer
+
+
+def begin_frame():
+    if current.enabled:
+        current.begin_frame()
+
+
+def mark(phase):
+    if current.enabled:
+        current.mark(phase)
+
+
+def end_frame(frame_time, game):
+    """Stores the frame along with the game's entity counts."""
+    if current.enabled:
+        current.end_frame(frame_time, len(game.asteroids), len(game.shots), len(game.drawable))
@@ -0,0 +1,190 @@
+"""
+Frame rendering: background, sprites and HUD.
+
+In dirty mode only the parts of the screen that changed are redrawn and
+pushed to the display. The background is a static layer: last frame's
+sprites are erased by copying the background back over their rects, and
+`display.update(rects)` sends just those rects plus this frame's sprites
+instead of flipping the whole screen. When the changed area grows past
+`DIRTY_AREA_LIMIT` of the screen (dense waves), overlapping rects would push
+more pixels than a flip, so those frames fall back to a full redraw. The HUD
+text is cached and only re-rendered when the score or lives change.
+
+Sprites are not blitted one by one: their (surface, rect) pairs go into a
+`RenderQueue`, which submits each layer in a single `Surface.blits` call.
+"""
+import pygame
+import profiler
+from constants import *
+
+
+class Hud:
+    """Score text and life sprite, re-rendered only when their values change."""
+
+    def __init__(self, font, life_sprites):
+        self.font = font
+        self.life_sprites = life_sprites
+        self.score = None
+        self.lives = None
+        self.score_surface = None
+        self.rects = []  # Screen rects covered by the HUD the last time it was drawn
+
+    def refresh(self, score, lives):
+        """
+        Re-renders whatever changed since the last call.
+
+        :param score: Current score.
+        :param lives: Current number of lives.
+        :return: True if the HUD looks different than before.
+        """
+        changed = False
+        if score != self.score:
+            self.score = score
+            self.score_surface = self.font.render(f"Score: {score}", True, "white")
+            changed = True
+        if lives != self.lives:
+            self.lives = lives
+            changed = True
+        return changed
+
+    def draw(self, screen):
+        """Blits the cached HUD surfaces and returns the rects they cover."""
+        self.rects = [screen.blit(self.score_surface, (10, 10))]  # Position score at (10, 10)
+        # Display the life sprite based on the current number of lives
+        if self.lives >= 0:
+            self.rects.append(screen.blit(self.life_sprites[self.lives], (10, 50)))  # Position below the score
+        return self.rects
+
+
+class RenderQueue:
+    """
+    Blits collected over a frame and submitted one `Surface.blits` call per layer.
+
+    Within a layer the blits are grouped by source surface, so asteroids
+    sharing an animation frame are drawn back to back. `calls` and `blits`
+    count the submitted calls and blits in total.
+    """
+
+    def __init__(self, sort=True):
+        """
+        :param sort: Group each layer's blits by source surface.
+        """
+        self.sort = sort
+        self.layers = {}
+        self.calls = 0
+        self.blits = 0
+
+    def add(self, layer, surface, rect):
+        """Queues a blit of `surface` at `rect` on `layer` (higher layers go on top)."""
+        batch = self.layers.get(layer)
+        if batch is None:
+            batch = self.layers[layer] = []
+        batch.append((surface, rect))
+
+    def submit(self, screen):
+        """Blits everything queued onto `screen`, empties the queue and returns the rects covered."""
+        rects = []
+        for layer in sorted(self.layers):
+            batch = self.layers[layer]
+            if not batch:
+                continue
+            if self.sort:
+                batch.sort(key=_source)
+            rects += screen.blits(batch)
+            self.calls += 1
+            self.blits += len(batch)
+            batch.clear()
+        return rects
+
+
+def _source(item):
+    return id(item[0])
+
+
+class Renderer:
+    """
+    Draws a game frame and pushes it to the display.
+
+    `pixels` counts how many pixels were sent to the display in total, so
+    the dirty and full-redraw modes can be compared.
+    """
+
+    def __init__(self, screen, background, hud, dirty=True, batch=True):
+        """
+        :param screen: The display surface.
+        :param background: Static background, the same size as `screen`.
+        :param hud: A `Hud` for the score and lives.
+        :param dirty: Update only the changed rects instead of the whole screen.
+        :param batch: Submit sprites through a `RenderQueue` instead of one blit each.
+        """
+        self.screen = screen
+        self.background = background
+        self.hud = hud
+        self.dirty = dirty
+        self.queue = RenderQueue() if batch else None
+        self.screen_rect = screen.get_rect()
+        self.previous = []  # Rects drawn last frame, erased before drawing the next one
+        self.overlays = []  # Objects drawn on top of everything, with a draw(screen) -> rect or None
+        self.area_limit = self.screen_rect.width * self.screen_rect.height * DIRTY_AREA_LIMIT
+        self.frames = 0
+        self.full_frames = 0
+        self.pixels = 0
+        self.dirty_area = 0  # Pixels the last frame changed, or would have with dirty rects
+        self.needs_full_update = True
+
+    def draw(self, game):
+        """Draws the sprites, HUD and overlays and returns the rects to erase next frame."""
+        screen = self.screen
+        drawn = game.draw(screen, self.queue)
+        self.hud.draw(screen)  # Cheap blits of cached surfaces, keeps the HUD on top
+        for overlay in self.overlays:
+            rect = overlay.draw(screen)
+            if rect is not None:
+                drawn.append(rect)
+        return drawn
+
+    def render(self, game):
+        """
+        Draws `game` and updates the display.
+
+        :return: Number of pixels pushed to the display this frame.
+        """
+        self.frames += 1
+        hud_changed = self.hud.refresh(game.score, game.lives)
+
+        if not self.dirty or self.needs_full_update or self.dirty_area > self.area_limit:
+            self.screen.blit(self.background, (0, 0))
+            self.previous = self.draw(game)
+            profiler.mark("draw")
+            pygame.display.flip()
+            profiler.mark("flip")
+            self.needs_full_update = False
+            self.full_frames += 1
+            # Erasing and redrawing every sprite would cover about twice its area
+            self.dirty_area = 2 * sum(rect.width * rect.height for rect in self.previous)
+            pixels = self.screen_rect.width * self.screen_rect.height
+            self.pixels += pixels
+            return pixels
+
+        screen = self.screen
+        background = self.background
+
+        # Erase last frame's sprites (and the old HUD if it changed) with the background layer
+        erased = self.previous + self.hud.rects if hud_changed else self.previous
+        for rect in erased:
+            screen.blit(background, rect, rect)
+
+        drawn = self.draw(game)
+
+        rects = erased + drawn
+        if hud_changed:
+            rects += self.hud.rects
+        rects = [rect.clip(self.screen_rect) for rect in rects]
+        profiler.mark("draw")
+        pygame.display.update(rects)
+        profiler.mark("flip")
+
+        self.previous = drawn
+        pixels = self.dirty_area = sum(rect.width * rect.height for rect in rects)
+        self.pixels += pixels
+        return pixels
@@ -0,0 +1,128 @@
+"""
+Input recording and replay.
+
+A game is fully determined by its seed, its mode, its entity budget and the
+player's controls on every simulation tick, so that is all a recording
+stores: one byte per tick, zlib-compressed, plus the hash of the final game
+state. Replaying re-runs the ticks headless as fast as the CPU allows and
+checks the final hash, so a session from a field report can be reproduced
+and profiled.
+
+    python main.py --record session.rec
+    python main.py --replay session.rec
+"""
+import struct
+import time
+import zlib
+
+from constants import *
+from game import Game
+from player import Controls
+
+MAGIC = b"ASTR"
+VERSION = 4
+HEADER = struct.Struct("<4sBBqII16s")  # magic, version, flags, seed, entity budget (0 = none), ticks, final state hash
+FLAG_BATCHED = 1
+
+
+def pack_controls(controls):
+    """Packs Controls into one byte: 2 bits turn, 2 bits thrust, 1 bit fire."""
+    return (controls.turn + 1) | (controls.thrust + 1) << 2 | bool(controls.fire) << 4
+
+
+def unpack_controls(byte):
+    """Inverse of `pack_controls`."""
+    return Controls((byte & 3) - 1, (byte >> 2 & 3) - 1, bool(byte >> 4 & 1))
+
+
+class Recording:
+    """The seed, mode, entity budget and per-tick controls of one game session."""
+
+    def __init__(self, seed, batched=False, entity_budget=None):
+        self.seed = seed
+        self.batched = batched
+        self.entity_budget = entity_budget
+        self.inputs = bytearray()  # One packed Controls byte per tick
+        self.final_hash = None
+
+    def __len__(self):
+        return len(self.inputs)
+
+    def record(self, controls):
+        """Appends the controls used for the next tick."""
+        self.inputs.append(pack_controls(controls))
+
+    def controls(self):
+        """Yields the recorded Controls, one per tick."""
+        for byte in self.inputs:
+            yield unpack_controls(byte)
+
+    def save(self, path):
+        """Writes the recording to `path`."""
+        flags = FLAG_BATCHED if self.batched else 0
+        final_hash = bytes.fromhex(self.final_hash) if self.final_hash else bytes(16)
+        with open(path, "wb") as f:
+            budget = self.entity_budget or 0
+            f.write(HEADER.pack(MAGIC, VERSION, flags, self.seed, budget, len(self.inputs), final_hash))
+            f.write(zlib.compress(bytes(self.inputs), 9))
+
+    @classmethod
+    def load(cls, path):
+        """Reads a recording written by `save`."""
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, version, flags, seed, budget, ticks, final_hash = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} recording")
+        recording = cls(seed, bool(flags & FLAG_BATCHED), budget or None)
+        recording.inputs = bytearray(zlib.decompress(data[HEADER.size:]))
+        if len(recording.inputs) != ticks:
+            raise ValueError(f"{path} is truncated: {len(recording.inputs)} of {ticks} ticks")
+        recording.final_hash = final_hash.hex() if any(final_hash) else None
+        return recording
+
+
+def replay(recording):
+    """
+    Re-runs a recording without rendering.
+
+    :param recording: The `Recording` to play back.
+    :return: Dict with the game, ticks run, wall time and whether the final
+        state hash matched (None if the recording has no hash).
+    """
+    game = Game(recording.batched, recording.seed, recording.entity_budget)
+    dt = 1 / SIMULATION_RATE
+    start = time.perf_counter()
+    ticks = 0
+    for controls in recording.controls():
+        game.player.controls = controls
+        game.step(dt)
+        ticks += 1
+        if game.game_over:
+            break
+    seconds = time.perf_counter() - start
+
+    matched = None if recording.final_hash is None else game.state_hash() == recording.final_hash
+    return {"game": game, "ticks": ticks, "seconds": seconds, "matched": matched}
+
+
+def main(path):
+    """Replays the recording at `path` headless and reports the result."""
+    import headless
+
+    headless.init()
+    recording = Recording.load(path)
+    result = replay(recording)
+    seconds = result["seconds"]
+    game = result["game"]
+    speedup = result["ticks"] / SIMULATION_RATE / seconds if seconds else float("inf")
+    print(f"{result['ticks']} ticks in {seconds:.2f}s ({speedup:.0f}x real time)")
+    print(f"Score: {game.score}  Lives: {game.lives}  State: {game.state_hash()}")
+    if result["matched"] is None:
+        print("Recording has no final state hash to check")
+    elif result["matched"]:
+        print("Final state matches the recording")
+    else:
+        print(f"Final state differs from the recording ({recording.final_hash})")
+        return 1
+    return 0
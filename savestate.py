@@ -0,0 +1,309 @@
+"""
+Save states: the whole running game as a compact binary blob.
+
+`save(game)` captures everything the simulation depends on (score, lives,
+the random generator, the spawn timers, every ship, asteroid and shot,
+entity ids included) and `restore(game, data)` puts it back in place, so
+the restored game continues exactly like the original would have. Sprites
+come from the pools and frames from the asset caches, so a restore is a
+few milliseconds even with thousands of entities.
+
+    data = savestate.save(game)
+    ...
+    savestate.restore(game, data)  # Rewind
+    twin = savestate.load(data)  # An independent copy
+
+For lookahead, `fork(game)` returns an independent copy, and
+`lookahead(game, function)` runs `function` on a copy-on-write fork of the
+whole process where the OS supports it, so nothing is copied up front.
+Explosion and debris effects are cosmetic and not saved.
+"""
+import itertools
+import os
+import pickle
+import struct
+import zlib
+
+import pygame
+from asteroid import Asteroid
+from asteroidfield import AsteroidField
+from circleshape import CircleShape
+from game import Game
+from player import Player, Shot
+
+MAGIC = b"ASAV"
+VERSION = 1
+FLAG_BATCHED = 1
+FLAG_COMPRESSED = 2
+NO_PLAYER = 0xFF
+
+HEADER = struct.Struct("<4sBB")  # magic, version, flags; the rest may be compressed
+# seed, entity budget (0 = none), score, lives, game over, spawn timer, elapsed,
+# next entity id, spawns deferred, splits merged, players, local player, asteroids, shots
+GAME = struct.Struct("<qIqq?ddQQQBBII")
+RNG = struct.Struct("<625I?d")  # Mersenne Twister state and position, has gauss_next, gauss_next
+# id, position, previous position, velocity, rotation, shoot timer, invincible, invincible timer,
+# exploding, explosion frame, explosion timer, explosion position (NaN if none), age
+PLAYER = struct.Struct("<Q6ddd?d?Id2dd")
+ASTEROID = struct.Struct("<Q6dddId")  # id, position, previous position, velocity, radius, age, frame, frame timer
+SHOT = struct.Struct("<Q6ddd")  # id, position, previous position, velocity, rotation, age
+
+
+def _next_id(game):
+    """Returns the id the game will give its next entity, without using it up. The game must be active."""
+    next_id = next(game.ids)
+    game.ids = CircleShape.ids = itertools.count(next_id)
+    return next_id
+
+
+def _body(sprite):
+    return (*sprite.position, *sprite.previous_position, *sprite.velocity)
+
+
+def save(game, compress=False):
+    """
+    Captures the game's state.
+
+    :param compress: zlib-compress the entity data (smaller, slower).
+    :return: The save state as bytes.
+    """
+    game.activate()  # The id counter is read through the class, like the other shared settings
+    field = game.asteroid_field
+    players = game.players
+    local = players.index(game.player) if game.player in players else NO_PLAYER
+    parts = [
+        GAME.pack(
+            game.seed,
+            game.budget.limit or 0,
+            game.score,
+            game.lives,
+            game.game_over,
+            field.spawn_timer,
+            field.elapsed,
+            _next_id(game),
+            game.budget.stats["deferred"],
+            game.budget.stats["merged"],
+            len(players),
+            local,
+            len(game.asteroids),
+            len(game.shots),
+        )
+    ]
+    _, internal, gauss_next = game.rng.getstate()
+    parts.append(RNG.pack(*internal, gauss_next is not None, gauss_next or 0.0))
+
+    for player in players:
+        explosion = player.explosion_position
+        if explosion is None:
+            explosion = (float("nan"), float("nan"))
+        parts.append(
+            PLAYER.pack(
+                player.entity_id,
+                *_body(player),
+                player.rotation,
+                player.shoot_timer,
+                player.invincible,
+                player.invincible_timer,
+                player.exploding,
+                player.explosion_frame,
+                player.explosion_time_since_last_frame,
+                *explosion,
+                player.age,
+            )
+        )
+    pack = ASTEROID.pack
+    parts += [
+        pack(a.entity_id, *_body(a), a.radius, a.age, a.current_frame, a.time_since_last_frame)
+        for a in game.asteroids
+    ]
+    pack = SHOT.pack
+    parts += [pack(s.entity_id, *_body(s), s.rotation, s.age) for s in game.shots]
+
+    payload = b"".join(parts)
+    flags = FLAG_BATCHED if game.world is not None else 0
+    if compress:
+        payload = zlib.compress(payload, 1)
+        flags |= FLAG_COMPRESSED
+    return HEADER.pack(MAGIC, VERSION, flags) + payload
+
+
+def _payload(data):
+    magic, version, flags = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"Not a version {VERSION} save state")
+    payload = memoryview(data)[HEADER.size :]
+    if flags & FLAG_COMPRESSED:
+        payload = zlib.decompress(payload)
+    return flags, payload
+
+
+def _set_body(sprite, x, y, previous_x, previous_y, vx, vy):
+    sprite.position = pygame.Vector2(x, y)
+    sprite.previous_position = pygame.Vector2(previous_x, previous_y)
+    sprite.velocity = pygame.Vector2(vx, vy)
+
+
+def _reuse(group, count):
+    """Kills the sprites of `group` past the first `count` and returns the ones kept, in group order."""
+    sprites = group.sprites()
+    for sprite in sprites[count:]:
+        sprite.kill()
+    return sprites[:count]
+
+
+def restore(game, data):
+    """
+    Puts a state from `save` back into `game`, replacing its ships,
+    asteroids and shots. The game must be in the same mode (batched or not)
+    as the one saved.
+    """
+    flags, payload = _payload(data)
+    if bool(flags & FLAG_BATCHED) != (game.world is not None):
+        raise ValueError("The save state and the game are in different modes (batched or not)")
+
+    game.activate()
+    game.effects.clear()
+
+    offset = 0
+    (
+        _,
+        _,
+        game.score,
+        game.lives,
+        game.game_over,
+        game.asteroid_field.spawn_timer,
+        game.asteroid_field.elapsed,
+        next_id,
+        game.budget.stats["deferred"],
+        game.budget.stats["merged"],
+        player_count,
+        local,
+        asteroid_count,
+        shot_count,
+    ) = GAME.unpack_from(payload, offset)
+    offset += GAME.size
+    *internal, has_gauss, gauss_next = RNG.unpack_from(payload, offset)
+    game.rng.setstate((3, tuple(internal), gauss_next if has_gauss else None))
+    offset += RNG.size
+
+    while len(game.players) > player_count:
+        game.remove_player(game.players[-1])
+    while len(game.players) < player_count:
+        game.add_player()
+    end = offset + PLAYER.size * player_count
+    for player, fields in zip(game.players, PLAYER.iter_unpack(payload[offset:end])):
+        player.entity_id = fields[0]
+        _set_body(player, *fields[1:7])
+        (
+            player.rotation,
+            player.shoot_timer,
+            player.invincible,
+            player.invincible_timer,
+            player.exploding,
+            player.explosion_frame,
+            player.explosion_time_since_last_frame,
+        ) = fields[7:14]
+        explosion_x, explosion_y, player.age = fields[14:]
+        player.explosion_position = None if explosion_x != explosion_x else pygame.Vector2(explosion_x, explosion_y)
+    offset = end
+    if local != NO_PLAYER:
+        game.player = game.players[local]
+
+    # Live sprites take the saved records in group order, so only the surplus leaves the groups and only
+    # the shortfall is created (appended, keeping the saved order). Group updates are most of a restore.
+    asteroids = _reuse(game.asteroids, asteroid_count)
+    create = AsteroidField.asteroid_class.create
+    end = offset + ASTEROID.size * asteroid_count
+    for i, (entity_id, *body, radius, age, frame, timer) in enumerate(ASTEROID.iter_unpack(payload[offset:end])):
+        if i < len(asteroids):
+            asteroid = asteroids[i]
+            if asteroid.radius != radius:
+                asteroid.radius = radius
+                asteroid.reset_state(Asteroid.frames_for_radius(radius))
+        else:
+            asteroid = create(body[0], body[1], radius, Asteroid.frames_for_radius(radius))
+        asteroid.entity_id = entity_id
+        _set_body(asteroid, *body)
+        asteroid.age = age
+        asteroid.current_frame = frame
+        asteroid.time_since_last_frame = timer
+    offset = end
+
+    shots = _reuse(game.shots, shot_count)
+    create = (Player.shot_class or Shot).create
+    end = offset + SHOT.size * shot_count
+    for i, (entity_id, *body, rotation, age) in enumerate(SHOT.iter_unpack(payload[offset:end])):
+        if i < len(shots):
+            shot = shots[i]
+            if shot.rotation != rotation:
+                shot.aim(shot.velocity, rotation)
+        else:
+            shot = create(body[0], body[1], pygame.Vector2(), rotation)
+        shot.entity_id = entity_id
+        _set_body(shot, *body)
+        shot.age = age
+
+    game.ids = CircleShape.ids = itertools.count(next_id)
+    return game
+
+
+def load(data):
+    """Builds a new game from a save state and returns it."""
+    flags, payload = _payload(data)
+    seed, budget = GAME.unpack_from(payload)[:2]
+    game = Game(bool(flags & FLAG_BATCHED), seed, budget or None)
+    return restore(game, data)
+
+
+def fork(game):
+    """Returns an independent copy of `game`, e.g. to try out moves without touching the original."""
+    copy = load(save(game))
+    game.activate()  # Leave the original in charge of the shared class settings
+    return copy
+
+
+def lookahead(game, function):
+    """
+    Runs `function(game)` on a copy of the game and returns its result,
+    leaving the original untouched.
+
+    Where the OS has `fork`, the copy is a forked child process that shares
+    the parent's memory copy-on-write, so starting it costs the same however
+    big the world is; the result comes back pickled. Elsewhere it runs on
+    `fork(game)`.
+    """
+    if not hasattr(os, "fork"):
+        return function(fork(game))
+
+    read_end, write_end = os.pipe()
+    pid = os.fork()
+    if pid == 0:  # Child: run on the inherited world, send the result, and never return into the caller
+        status = 1
+        try:
+            os.close(read_end)
+            try:
+                result = (True, function(game))
+            except BaseException as error:
+                result = (False, error)
+            try:
+                data = pickle.dumps(result)
+                pickle.loads(data)  # Some exceptions pickle but can't be rebuilt
+            except BaseException:
+                error = RuntimeError(f"Lookahead {'result' if result[0] else 'error'} can't be pickled: {result[1]!r}")
+                data = pickle.dumps((False, error))
+            with os.fdopen(write_end, "wb") as pipe:
+                pipe.write(data)
+            status = 0
+        finally:
+            os._exit(status)
+
+    os.close(write_end)
+    with os.fdopen(read_end, "rb") as pipe:
+        data = pipe.read()
+    os.waitpid(pid, 0)
+    if not data:
+        raise RuntimeError("The lookahead process exited without sending a result")
+    ok, result = pickle.loads(data)
+    if not ok:
+        raise result
+    return result
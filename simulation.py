@@ -0,0 +1,45 @@
+from constants import *
+
+
+class FixedTimestep:
+    """
+    Accumulator that turns variable frame times into fixed simulation ticks.
+
+    The simulation always advances in steps of exactly `dt`, so physics does
+    not depend on the frame rate: slow frames run several ticks instead of
+    one big jump, and fast frames may run none. `alpha` says how far the
+    render time is between the last two ticks, for interpolated drawing.
+    """
+
+    def __init__(self, rate=SIMULATION_RATE, max_steps=MAX_CATCH_UP_STEPS):
+        """
+        :param rate: Simulation ticks per second.
+        :param max_steps: Most ticks run for a single frame. Time beyond that
+            is dropped so a long stall can't snowball into ever slower frames.
+        """
+        self.dt = 1 / rate
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+        self.ticks = 0  # Total ticks run so far
+        self.dropped = 0.0  # Seconds of simulation skipped by the catch-up limit
+
+    def advance(self, frame_time):
+        """
+        Adds a frame's elapsed time and returns how many ticks to run now.
+
+        :param frame_time: Seconds since the previous frame.
+        """
+        self.accumulator += frame_time
+        steps = int(self.accumulator // self.dt)
+        if steps > self.max_steps:
+            self.dropped += (steps - self.max_steps) * self.dt
+            self.accumulator -= (steps - self.max_steps) * self.dt
+            steps = self.max_steps
+        self.accumulator -= steps * self.dt
+        self.ticks += steps
+        return steps
+
+    @property
+    def alpha(self):
+        """Fraction of a tick between the last simulated state and now."""
+        return min(self.accumulator / self.dt, 1.0)
@@ -0,0 +1,136 @@
+"""
+Shared sound bank and mixer channel scheduler.
+
+Every clip is decoded once and the `Sound` object is shared. Playback goes
+through a scheduler that limits how many voices each clip may use, merges
+identical requests made in the same simulation tick and lets important clips take a
+channel from less important ones, so dense asteroid waves can't starve the
+mixer. Everything works on the SDL dummy audio driver
+(SDL_AUDIODRIVER=dummy), which is how the scheduler is exercised headless.
+"""
+import pygame
+
+# Clip name -> (path, volume, voice limit, priority). Higher priority clips
+# may take a channel from lower priority ones when the mixer is full.
+CLIPS = {
+    "laser": ("sprites/player/laser.mp3", 1.0, 3, 1),
+    "player-explosion": ("sprites/player/p-explosion.mp3", 0.5, 1, 3),
+    "asteroid-medium": ("sprites/asteroids/medium-destroy.mp3", 0.25, 4, 2),
+    "asteroid-small": ("sprites/asteroids/small-destroy.mp3", 0.25, 4, 2),
+}
+
+MIXER_CHANNELS = 16
+
+
+class SoundBank:
+    """Decodes each clip once and hands out the shared `Sound` object."""
+
+    def __init__(self, clips=CLIPS):
+        self.clips = clips
+        self.sounds = {}
+
+    def get(self, name):
+        """Returns the decoded sound for `name`, or None if the mixer is off."""
+        sound = self.sounds.get(name)
+        if sound is None:
+            if not pygame.mixer.get_init():
+                return None
+            path = self.clips[name][0]
+            sound = self.add(name, pygame.mixer.Sound(path))
+        return sound
+
+    def add(self, name, sound):
+        """Stores a decoded clip (see preload.py) and applies its volume."""
+        sound.set_volume(self.clips[name][1])
+        self.sounds[name] = sound
+        return sound
+
+
+class ChannelScheduler:
+    """
+    Assigns mixer channels to clip requests.
+
+    A request is dropped when the same clip was already played this tick.
+    A clip at its voice limit restarts its oldest voice instead of taking a
+    new channel, and when every channel is busy the request takes the oldest
+    channel playing a lower priority clip, or is dropped if there is none.
+    """
+
+    def __init__(self, bank, channels=MIXER_CHANNELS):
+        self.bank = bank
+        pygame.mixer.set_num_channels(channels)
+        self.channels = [pygame.mixer.Channel(i) for i in range(channels)]
+        self.voices = {}  # channel index -> (clip name, priority, start sequence)
+        self.sequence = 0
+        self.tick_clips = set()
+        self.stats = {"played": 0, "deduplicated": 0, "limited": 0, "stolen": 0, "dropped": 0}
+
+    def begin_tick(self):
+        """Starts a new simulation tick for same-tick deduplication."""
+        self.tick_clips.clear()
+
+    def _active(self):
+        """Returns the voices whose channels are still playing."""
+        for index in list(self.voices):
+            if not self.channels[index].get_busy():
+                del self.voices[index]
+        return self.voices
+
+    def play(self, name):
+        """
+        Plays a clip through the scheduler.
+
+        :param name: Clip name from `CLIPS`.
+        :return: The channel used, or None if the request was dropped.
+        """
+        if name in self.tick_clips:
+            self.stats["deduplicated"] += 1
+            return None
+        sound = self.bank.get(name)
+        if sound is None:
+            return None
+        self.tick_clips.add(name)
+
+        _, _, limit, priority = self.bank.clips[name]
+        voices = self._active()
+        same_clip = [index for index, voice in voices.items() if voice[0] == name]
+
+        if len(same_clip) >= limit:
+            index = min(same_clip, key=lambda i: voices[i][2])
+            self.stats["limited"] += 1
+        else:
+            index = next((i for i in range(len(self.channels)) if i not in voices), None)
+            if index is None:
+                weaker = [i for i, voice in voices.items() if voice[1] < priority]
+                if not weaker:
+                    self.stats["dropped"] += 1
+                    return None
+                index = min(weaker, key=lambda i: voices[i][2])
+                self.stats["stolen"] += 1
+
+        channel = self.channels[index]
+        channel.play(sound)
+        self.voices[index] = (name, priority, self.sequence)
+        self.sequence += 1
+        self.stats["played"] += 1
+        return channel
+
+
+bank = SoundBank()
+scheduler = None  # Created on first use, once the mixer is initialized
+
+
+def play(name):
+    """Plays a clip through the shared scheduler."""
+    global scheduler
+    if scheduler is None:
+        if not pygame.mixer.get_init():
+            return None
+        scheduler = ChannelScheduler(bank)
+    return scheduler.play(name)
+
+
+def begin_tick():
+    """Starts a new simulation tick on the shared scheduler (see `Game.update`)."""
+    if scheduler is not None:
+        scheduler.begin_tick()
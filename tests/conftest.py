@@ -0,0 +1,9 @@
+"""Runs the tests headless, on the SDL dummy drivers, with the game's modules importable."""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import headless
+
+headless.init()
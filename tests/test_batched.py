@@ -0,0 +1,60 @@
+import pygame
+import pytest
+
+from asteroid import Asteroid
+from asteroidfield import AsteroidField
+from constants import *
+from game import Game
+from headless import patrol, populate
+from player import Controls, Player, Shot
+
+pytest.importorskip("numpy")
+
+DT = 1 / SIMULATION_RATE
+
+
+@pytest.fixture(autouse=True)
+def quiet(monkeypatch):
+    monkeypatch.setattr(Game, "verbose", False)
+
+
+def volley(batched, shots=5):
+    """
+    A game where `shots` shots all reach one large asteroid during the first
+    tick, and would also reach any of its pieces.
+    """
+    game = Game(batched, seed=7)
+    game.player.controls = Controls(0, 0, False)
+    game.player.make_invincible(float("inf"))
+    radius = ASTEROID_MIN_RADIUS * ASTEROID_KINDS
+    AsteroidField.asteroid_class.create(400, 300, radius, Asteroid.frames_for_radius(radius))
+    speed = PLAYER_SHOOT_SPEED / SIMULATION_RATE
+    for i in range(shots):
+        x = 400 - ASTEROID_MIN_RADIUS - SHOT_RADIUS - speed / 2 + i * 0.5
+        (Player.shot_class or Shot).create(x, 300, pygame.Vector2(PLAYER_SHOOT_SPEED, 0), 90)
+    return game
+
+
+def test_later_shots_hit_pieces_split_in_the_same_tick():
+    plain, batched = volley(False), volley(True)
+    for game in (plain, batched):
+        game.activate()
+        game.step(DT)
+    assert plain.score > 5  # Later shots found the new pieces
+    assert (batched.score, batched.state_hash()) == (plain.score, plain.state_hash())
+
+
+@pytest.mark.parametrize("seed, asteroids, ticks", [(9, 100, 900), (4, 1000, 300)])
+def test_batched_and_plain_games_play_out_the_same(seed, asteroids, ticks):
+    games = [Game(batched, seed) for batched in (False, True)]
+    for game in games:
+        game.activate()
+        populate(game, asteroids)
+        game.player.make_invincible(float("inf"))
+    for tick in range(ticks):
+        for game in games:
+            game.activate()
+            game.player.controls = patrol(tick)
+            game.step(DT)
+        assert games[1].state_hash() == games[0].state_hash(), f"modes diverged at tick {tick}"
+    assert games[0].score > 0
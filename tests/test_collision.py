@@ -0,0 +1,202 @@
+import itertools
+import random
+
+import pygame
+import pytest
+
+from circleshape import CircleShape
+from collision import SpatialHash, circles_overlap, earliest_impacts, time_of_impact, times_of_impact
+from constants import *
+
+
+class Body(CircleShape):
+    """Asteroid stand-in that splits without loading any assets."""
+
+    def __init__(self, x, y, radius, *groups):
+        super().__init__(x, y, radius)
+        self.add(*groups)
+        self.exploding = False
+
+    def split(self):
+        groups = self.groups()
+        self.kill()
+        if self.radius <= ASTEROID_MIN_RADIUS:
+            return []
+        return [Body(*self.position, self.radius - ASTEROID_MIN_RADIUS, *groups) for _ in range(2)]
+
+
+def make_world(seed, count=300, side=1200):
+    """Moving asteroids in a group, some exploding or already dead, and moving shots."""
+    rng = random.Random(seed)
+    asteroids = pygame.sprite.Group()
+    for _ in range(count):
+        body = Body(rng.uniform(0, side), rng.uniform(0, side), ASTEROID_MIN_RADIUS * rng.randint(1, 3), asteroids)
+        body.previous_position = body.position - pygame.Vector2(rng.uniform(-3, 3), rng.uniform(-3, 3))
+    shots = []
+    for _ in range(count):
+        shot = Body(rng.uniform(0, side), rng.uniform(0, side), SHOT_RADIUS)
+        shot.previous_position = shot.position - pygame.Vector2(0, PLAYER_SHOOT_SPEED / SIMULATION_RATE).rotate(
+            rng.uniform(0, 360)
+        )
+        shots.append(shot)
+    return shots, asteroids
+
+
+def usable(asteroid):
+    return asteroid.alive() and not asteroid.exploding
+
+
+def disable_some(asteroids, seed):
+    """Marks some asteroids exploding and kills others, after the grid was built with them."""
+    rng = random.Random(seed)
+    for asteroid in asteroids.sprites():
+        roll = rng.random()
+        if roll < 0.1:
+            asteroid.exploding = True
+        elif roll < 0.2:
+            asteroid.kill()
+
+
+def resolve_scan(shots, asteroids):
+    """Reference: each shot takes the first usable overlapping asteroid in group order, and splits it."""
+    hits = []
+    for shot in shots:
+        for asteroid in asteroids.sprites():
+            if usable(asteroid) and shot.collision(asteroid):
+                hits.append((shot.entity_id, asteroid.entity_id))
+                asteroid.split()
+                break
+    return hits
+
+
+def resolve_grid(shots, asteroids, grid):
+    hits = []
+    for shot in shots:
+        for asteroid in grid.query(shot.position, shot.radius):
+            if usable(asteroid) and shot.collision(asteroid):
+                hits.append((shot.entity_id, asteroid.entity_id))
+                for piece in asteroid.split():
+                    grid.insert(piece)
+                break
+    return hits
+
+
+def earliest(shot, candidates):
+    best = None
+    for asteroid in candidates:
+        if usable(asteroid):
+            t = time_of_impact(shot, asteroid)
+            if t is not None and (best is None or t < best[0]):
+                best = (t, asteroid.entity_id)
+    return best
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_grid_matches_brute_force_scan(seed, monkeypatch):
+    monkeypatch.setattr(CircleShape, "ids", itertools.count(1))
+    shots, asteroids = make_world(seed)
+    disable_some(asteroids, seed)
+    expected = resolve_scan(shots, asteroids)
+
+    monkeypatch.setattr(CircleShape, "ids", itertools.count(1))  # Same ids for the same bodies
+    shots, asteroids = make_world(seed)
+    grid = SpatialHash()
+    grid.build(asteroids)  # Built before some die or start exploding, like the game's grid within a tick
+    disable_some(asteroids, seed)
+    actual = resolve_grid(shots, asteroids, grid)
+
+    assert actual == expected
+    assert expected  # The world is dense enough for hits
+    hit_shots = [shot for shot, _ in actual]
+    assert len(hit_shots) == len(set(hit_shots))  # One asteroid per shot at most
+    hit_asteroids = [asteroid for _, asteroid in actual]
+    assert len(hit_asteroids) == len(set(hit_asteroids))  # Dead asteroids are never hit again
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_swept_query_finds_the_earliest_impact(seed):
+    shots, asteroids = make_world(seed)
+    grid = SpatialHash()
+    grid.build(asteroids)
+    disable_some(asteroids, seed)
+    found = 0
+    for shot in shots:
+        expected = earliest(shot, asteroids.sprites())
+        assert earliest(shot, grid.query_swept(shot)) == expected
+        found += expected is not None
+    assert found
+
+
+def test_reinserted_objects_move_to_the_end():
+    a, b, c = (Body(10, 10, 5) for _ in range(3))
+    grid = SpatialHash()
+    grid.build([a, b])
+    a.position.update(500, 500)
+    a.previous_position.update(500, 500)
+    grid.insert(a)  # A pooled sprite handed out again
+    grid.insert(c)
+    assert grid.query(pygame.Vector2(10, 10), 5) == [b, c]
+    assert grid.query(pygame.Vector2(500, 500), 5) == [a]
+    assert len(set(grid.order.values())) == 3
+
+
+def moving(start, end, radius):
+    body = CircleShape(*end, radius)
+    body.previous_position.update(start)
+    return body
+
+
+def test_fast_shot_cannot_tunnel_through_a_small_circle():
+    # The shot starts left of the asteroid and ends right of it, overlapping at neither end
+    shot = moving((-50, 0), (50, 0), SHOT_RADIUS)
+    asteroid = moving((0, 0), (0, 0), ASTEROID_MIN_RADIUS)
+    assert not circles_overlap(shot, asteroid)
+    t = time_of_impact(shot, asteroid)
+    assert t == pytest.approx((50 - ASTEROID_MIN_RADIUS - SHOT_RADIUS) / 100)
+
+
+def test_circles_overlapping_at_the_start_hit_at_zero():
+    assert time_of_impact(moving((0, 0), (5, 0), 10), moving((8, 0), (30, 0), 10)) == 0.0
+
+
+def test_misses():
+    asteroid = moving((0, 0), (0, 0), ASTEROID_MIN_RADIUS)
+    assert time_of_impact(moving((-50, 40), (50, 40), SHOT_RADIUS), asteroid) is None  # Passes beside it
+    assert time_of_impact(moving((-30, 0), (0, 30), SHOT_RADIUS), moving((10, -10), (40, 0), 1)) is None
+    assert time_of_impact(moving((-100, 0), (-60, 0), SHOT_RADIUS), asteroid) is None  # Stops short
+    assert time_of_impact(moving((30, 0), (60, 0), SHOT_RADIUS), asteroid) is None  # Moving away
+
+
+def test_vectorized_times_match_the_scalar_test():
+    np = pytest.importorskip("numpy")
+    rng = random.Random(0)
+
+    def bodies(count, radii, reach):
+        result = []
+        for _ in range(count):
+            x, y = rng.uniform(0, 300), rng.uniform(0, 300)
+            end = (x + rng.uniform(-reach, reach), y + rng.uniform(-reach, reach))
+            result.append(moving((x, y), end, rng.choice(radii)))
+        return result
+
+    shots = bodies(60, [SHOT_RADIUS], 40)
+    asteroids = bodies(80, [ASTEROID_MIN_RADIUS * kind for kind in range(1, ASTEROID_KINDS + 1)], 5)
+    def arrays(group):
+        starts = np.array([tuple(body.previous_position) for body in group])
+        ends = np.array([tuple(body.position) for body in group])
+        return starts, ends, np.array([body.radius for body in group])
+
+    times = times_of_impact(*arrays(shots), *arrays(asteroids))
+
+    expected = [[time_of_impact(shot, asteroid) for asteroid in asteroids] for shot in shots]
+    assert any(t is not None for row in expected for t in row)
+    assert any(t == 0.0 for row in expected for t in row)
+    for row, expected_row in zip(times.tolist(), expected):
+        for t, scalar in zip(row, expected_row):
+            assert t == (np.inf if scalar is None else scalar)
+
+    # Each shot's earliest hit, ties going to the first asteroid, like Game.earliest_impact
+    for hit, expected_row in zip(earliest_impacts(times), expected):
+        hits = [(t, column) for column, t in enumerate(expected_row) if t is not None]
+        assert hit == (None if not hits else min(hits)[::-1])
+    assert earliest_impacts(times[:, :0]) == [None] * len(shots)
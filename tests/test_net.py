@@ -0,0 +1,131 @@
+import asyncio
+
+import pytest
+
+import net
+from constants import *
+from player import Controls
+
+PLAYERS = [(0, 640.0, 360.0, 90.0, 0), (1, 100.25, 50.5, 359.99, net.INVINCIBLE)]
+
+
+def make_records(count, offset=0):
+    """Asteroid records moving at distinct velocities, in fixed point."""
+    return {
+        entity_id: (net.KIND_ASTEROID, entity_id * 80, entity_id * 40, 400 + entity_id, -200, 20 + entity_id % 3 * 20)
+        for entity_id in range(1 + offset, 1 + offset + count)
+    }
+
+
+def moved(records, ticks):
+    """The same records after flying in straight lines for `ticks` ticks."""
+    seconds = ticks / SIMULATION_RATE
+    return {
+        entity_id: (kind, round(x + vx * seconds), round(y + vy * seconds), vx, vy, radius)
+        for entity_id, (kind, x, y, vx, vy, radius) in records.items()
+    }
+
+
+def assert_reconstructs(state, records, tick):
+    """Checks that a client state extrapolates to `records` at `tick`, within the resend tolerance."""
+    assert state.keys() == records.keys()
+    for entity_id, record in records.items():
+        entry = state[entity_id]
+        assert entry[1][0] == record[0] and entry[1][3:] == record[3:]
+        x, y = net.extrapolate(entry, tick)
+        assert abs(x - record[1]) <= net.POSITION_TOLERANCE and abs(y - record[2]) <= net.POSITION_TOLERANCE
+
+
+def test_snapshot_round_trip_against_baseline():
+    first = make_records(10)
+    packet, sent = net.encode_snapshot(3, first, {}, 0, PLAYERS, input_ack=7, score=40, lives=2)
+    snapshot = net.decode_snapshot(packet, {})
+    assert snapshot["state"] == sent
+    assert_reconstructs(snapshot["state"], first, 3)
+    assert (snapshot["tick"], snapshot["input_ack"], snapshot["score"], snapshot["lives"]) == (3, 7, 40, 2)
+    x, y, rotation, flags = snapshot["players"][1]
+    assert abs(x - 100.25) <= 0.5 / net.POSITION_SCALE and abs(y - 50.5) <= 0.5 / net.POSITION_SCALE
+    assert abs(rotation - 359.99) <= 0.01 and flags == net.INVINCIBLE
+
+    # Tick 9: everything flew straight except one turn, one removal and one new entity
+    second = moved(first, 6)
+    kind, x, y, vx, vy, radius = second[4]
+    second[4] = (kind, x, y, -vx, vy, radius)
+    del second[7]
+    second.update(make_records(1, offset=20))
+    packet, sent = net.encode_snapshot(9, second, snapshot["state"], 3, PLAYERS)
+    delta = net.decode_snapshot(packet, {3: snapshot["state"]})
+    assert delta["state"] == sent
+    assert_reconstructs(delta["state"], second, 9)
+    assert net.SNAPSHOT_HEADER.unpack_from(packet)[-2:] == (1, 2)  # One removed, two sent, the rest extrapolated
+
+    assert net.decode_snapshot(packet, {}) is None  # Baseline unknown
+
+
+def test_snapshot_out_of_room_defers_entities():
+    records = make_records(30)
+    entry_size = net.ENTITY_HEADER.size + net.KIND.size + 2 * net.VECTOR.size + net.RADIUS.size
+    max_size = net.SNAPSHOT_HEADER.size + 10 * entry_size
+
+    packet, sent = net.encode_snapshot(3, records, {}, 0, [], max_size=max_size)
+    assert len(packet) <= max_size
+    first = net.decode_snapshot(packet, {})
+    assert first["state"] == sent and len(sent) == 10
+
+    # The deferred entities follow in the next snapshots, while the sent ones are extrapolated
+    states, state, tick = {3: first["state"]}, first["state"], 3
+    while len(state) < len(records):
+        baseline_tick, tick = tick, tick + 3
+        packet, sent = net.encode_snapshot(
+            tick, moved(records, tick - 3), state, baseline_tick, [], max_size=max_size
+        )
+        assert len(packet) <= max_size
+        state = net.decode_snapshot(packet, states)["state"]
+        assert state == sent
+        states[tick] = state
+    assert_reconstructs(state, moved(records, tick - 3), tick)
+
+    # Removals that don't fit wait too, so the client never drops an entity the server still counts as sent
+    max_size = net.SNAPSHOT_HEADER.size + 4 * net.ENTITY_ID.size
+    baseline_tick, tick = tick, tick + 3
+    packet, sent = net.encode_snapshot(tick, {}, state, baseline_tick, [], max_size=max_size)
+    assert len(packet) <= max_size and len(sent) == len(records) - 4
+    while sent:
+        states[tick] = net.decode_snapshot(packet, states)["state"]
+        assert states[tick] == sent
+        baseline_tick, tick = tick, tick + 3
+        packet, sent = net.encode_snapshot(tick, {}, sent, baseline_tick, [], max_size=max_size)
+    assert net.decode_snapshot(packet, states)["state"] == {}
+
+
+def test_snapshots_fit_one_packet():
+    packet, sent = net.encode_snapshot(3, make_records(300), {}, 0, PLAYERS)
+    assert len(packet) <= net.MAX_DATAGRAM <= 1200
+    assert net.decode_snapshot(packet, {})["state"] == sent
+
+
+@pytest.fixture(scope="module")
+def loopback_run():
+    def controls(index, tick):
+        return Controls(1 if (tick + index * 20) // 30 % 2 else -1, 1, tick % 10 == 0)
+
+    ticks = SIMULATION_RATE * 2  # A whole number of snapshot intervals, so the last one acknowledges every input
+    return asyncio.run(net.loopback(4, ticks, asteroids=50, realtime=False, controls=controls))
+
+
+def test_loopback_delivers_every_snapshot(loopback_run):
+    server, bots = loopback_run
+    assert len(server.connections) == 4
+    for bot in bots:
+        assert bot.stats["dropped"] == 0
+        assert bot.stats["snapshots"] == server.ticks // net.SNAPSHOT_INTERVAL
+        assert not bot.pending
+
+
+def test_predicted_ship_matches_server(loopback_run):
+    server, bots = loopback_run
+    ships = {connection.slot: connection.player for connection in server.connections.values()}
+    for bot in bots:
+        ship = ships[bot.slot]
+        assert bot.ship.position.distance_to(ship.position) <= 1 / net.POSITION_SCALE
+        assert abs((bot.ship.rotation - ship.rotation + 180) % 360 - 180) <= 0.01
@@ -0,0 +1,59 @@
+import random
+
+import pytest
+
+import replay
+from constants import *
+from game import Game
+from headless import populate
+from player import Controls
+
+TICKS = SIMULATION_RATE * 20
+
+
+@pytest.fixture(autouse=True)
+def quiet(monkeypatch):
+    monkeypatch.setattr(Game, "verbose", False)
+
+
+def record_session(batched, seed=11, budget=None):
+    """Plays a seeded session with random controls, recording it like main.py does."""
+    if batched:
+        pytest.importorskip("numpy")
+    game = Game(batched, seed, budget)
+    recording = replay.Recording(game.seed, batched, budget)
+    rng = random.Random(seed)
+    controls = Controls(0, 0, False)
+    for _ in range(TICKS):
+        if rng.random() < 0.1:  # Hold each input for a while, like a player would
+            controls = Controls(rng.randint(-1, 1), rng.randint(0, 1), rng.random() < 0.5)
+        game.player.controls = controls
+        recording.record(controls)
+        game.step(1 / SIMULATION_RATE)
+        if game.game_over:
+            break
+    recording.final_hash = game.state_hash()
+    return game, recording
+
+
+@pytest.mark.parametrize("budget", [None, 40])
+@pytest.mark.parametrize("batched", [False, True])
+def test_replay_reaches_the_recorded_state(batched, budget, tmp_path):
+    game, recording = record_session(batched, budget=budget)
+    assert game.score > 0  # The session did something worth checking
+    path = tmp_path / "session.rec"
+    recording.save(path)
+
+    loaded = replay.Recording.load(path)
+    assert (loaded.seed, loaded.batched, loaded.entity_budget) == (recording.seed, batched, budget)
+    result = replay.replay(loaded)
+    assert result["matched"]
+    assert result["ticks"] == len(recording)
+    assert result["game"].state_hash() == game.state_hash()
+
+
+def test_replay_detects_a_changed_input():
+    _, recording = record_session(False)
+    steer = replay.pack_controls(Controls(1, 1, False))
+    recording.inputs[10:40] = bytes([steer]) * 30  # Half a second of different steering early on
+    assert replay.replay(recording)["matched"] is False
@@ -0,0 +1,93 @@
+import os
+
+import pytest
+
+import savestate
+from constants import *
+from game import Game
+from headless import patrol, populate
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+DT = 1 / SIMULATION_RATE
+BEFORE = 400  # Ticks run before saving
+AFTER = 400  # Ticks run from the save state
+
+
+@pytest.fixture(autouse=True)
+def quiet(monkeypatch):
+    monkeypatch.setattr(Game, "verbose", False)
+
+
+def run(game, start, ticks):
+    """Steps `game` with the patrol controls from tick `start` and returns its state hash and score."""
+    for tick in range(start, start + ticks):
+        game.activate()
+        game.player.controls = patrol(tick)
+        game.step(DT)
+    return game.state_hash(), game.score
+
+
+def played(batched, budget):
+    if batched and numpy is None:
+        pytest.skip("The batched world requires NumPy")
+    game = Game(batched, 9, budget)
+    populate(game, 100)
+    run(game, 0, BEFORE)
+    return game
+
+
+@pytest.mark.parametrize("budget", [None, 60])
+@pytest.mark.parametrize("batched", [False, True])
+def test_restored_games_play_on_like_the_original(batched, budget):
+    game = played(batched, budget)
+    data = savestate.save(game)
+    loaded = savestate.load(savestate.save(game, compress=True))
+    forked = savestate.fork(game)
+    ahead = savestate.lookahead(game, lambda copy: run(copy, BEFORE, AFTER))
+
+    expected = run(game, BEFORE, AFTER)
+    assert run(loaded, BEFORE, AFTER) == expected
+    assert run(forked, BEFORE, AFTER) == expected
+    assert ahead == expected
+
+    savestate.restore(game, data)  # Rewind the original in place, over a different set of sprites
+    assert run(game, BEFORE, AFTER) == expected
+
+
+def test_restore_rejects_other_formats():
+    game = Game(seed=1)
+    data = savestate.save(game)
+    with pytest.raises(ValueError):
+        savestate.restore(game, b"XXXX" + data[4:])
+    if numpy is not None:
+        with pytest.raises(ValueError):
+            savestate.restore(Game(batched=True, seed=1), data)
+
+
+class Unpicklable(Exception):
+    def __init__(self):
+        super().__init__("holds a lambda")
+        self.callback = lambda: None
+
+
+def fail(game):
+    raise Unpicklable()
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="lookahead only forks where os.fork exists")
+def test_lookahead_errors_come_back_from_the_child():
+    game = Game(seed=1)
+    pid = os.getpid()
+    with pytest.raises(ZeroDivisionError):
+        savestate.lookahead(game, lambda copy: 1 / 0)
+    with pytest.raises(RuntimeError, match="can't be pickled"):
+        savestate.lookahead(game, fail)
+    with pytest.raises(RuntimeError, match="can't be pickled"):
+        savestate.lookahead(game, lambda copy: lambda: None)
+    with pytest.raises(RuntimeError, match="without sending a result"):
+        savestate.lookahead(game, lambda copy: os._exit(0))
+    assert os.getpid() == pid
@@ -0,0 +1,63 @@
+import pygame
+import pytest
+
+import sounds
+
+# Name -> (path, volume, voice limit, priority); the sounds are generated, not loaded
+CLIPS = {
+    "laser": (None, 1.0, 2, 1),
+    "rumble": (None, 1.0, 8, 1),
+    "alarm": (None, 1.0, 8, 3),
+}
+
+
+@pytest.fixture
+def scheduler():
+    if not pygame.mixer.get_init():
+        pytest.skip("No mixer, even on the dummy audio driver")
+    bank = sounds.SoundBank(CLIPS)
+    silence = bytes(4 * 44100 * 5)  # Five seconds, so voices stay busy for the whole test
+    for name in CLIPS:
+        bank.add(name, pygame.mixer.Sound(buffer=silence))
+    yield sounds.ChannelScheduler(bank, channels=3)
+    pygame.mixer.stop()
+    pygame.mixer.set_num_channels(sounds.MIXER_CHANNELS)
+
+
+def play_ticks(scheduler, name, times):
+    """Plays `name` once per tick, `times` ticks in a row, and returns the channels used."""
+    channels = []
+    for _ in range(times):
+        scheduler.begin_tick()
+        channels.append(scheduler.play(name))
+    return channels
+
+
+def test_repeat_in_the_same_tick_is_dropped(scheduler):
+    scheduler.begin_tick()
+    assert scheduler.play("laser") is not None
+    assert scheduler.play("laser") is None
+    assert scheduler.stats["deduplicated"] == 1
+    assert play_ticks(scheduler, "laser", 1)[0] is not None  # A new tick plays it again
+
+
+def test_clip_at_its_voice_limit_restarts_its_oldest_voice(scheduler):
+    first, second, third = play_ticks(scheduler, "laser", 3)
+    assert first is not second
+    assert third is first
+    assert scheduler.stats["limited"] == 1
+    assert [voice[0] for voice in scheduler.voices.values()].count("laser") == 2
+
+
+def test_higher_priority_clip_takes_the_oldest_lower_priority_channel(scheduler):
+    rumbles = play_ticks(scheduler, "rumble", 3)  # Every channel busy
+    assert None not in rumbles
+    assert play_ticks(scheduler, "alarm", 1)[0] is rumbles[0]
+    assert scheduler.stats["stolen"] == 1
+
+
+def test_request_is_dropped_without_a_lower_priority_channel(scheduler):
+    assert None not in play_ticks(scheduler, "alarm", 3)
+    assert play_ticks(scheduler, "rumble", 1) == [None]
+    assert play_ticks(scheduler, "alarm", 1) == [None]  # Equal priority doesn't take a channel either
+    assert scheduler.stats["dropped"] == 2
@@ -0,0 +1,95 @@
+"""
+Difficulty waves and the live entity budget.
+
+The asteroid field follows `WAVES`, a difficulty curve given as data: each
+wave starts a number of seconds into the game and sets how often asteroids
+spawn, how many at a time, how fast and how large. `EntityBudget` caps the
+live asteroids and shots. Over budget, spawns are deferred and splitting
+asteroids break into one piece instead of two, so difficulty can rise
+without frame time leaving its envelope.
+
+The budget is measured once at startup (`calibrate_budget`) and then fixed
+for the game, so runs with the same seed, budget and inputs stay identical.
+"""
+import time
+
+from constants import *
+
+# Difficulty curve. time: seconds into the game the wave starts, interval:
+# seconds between spawns, burst: asteroids per spawn, speed: (min, max) in
+# px/s, kinds: (smallest, largest) size kind, spread: max degrees off the
+# edge normal. The first wave matches the original fixed spawner.
+WAVES = [
+    {"time": 0, "interval": ASTEROID_SPAWN_RATE, "burst": 1, "speed": (40, 100), "kinds": (1, 3), "spread": 30},
+    {"time": 45, "interval": 0.7, "burst": 1, "speed": (50, 110), "kinds": (1, 3), "spread": 35},
+    {"time": 90, "interval": 0.9, "burst": 2, "speed": (50, 120), "kinds": (2, 3), "spread": 40},
+    {"time": 150, "interval": 0.8, "burst": 2, "speed": (60, 130), "kinds": (2, 3), "spread": 45},
+    {"time": 240, "interval": 0.9, "burst": 3, "speed": (70, 140), "kinds": (3, 3), "spread": 45},
+]
+
+FRAME_TARGET_MS = 1000 / RENDER_FPS / 2  # Simulation and drawing share of a frame, the rest is headroom
+MIN_ENTITY_BUDGET = 40
+MAX_ENTITY_BUDGET = 2000
+CALIBRATION_ENTITIES = 300
+CALIBRATION_TICKS = 30
+
+
+def wave_at(elapsed, waves=WAVES):
+    """Returns the wave in effect `elapsed` seconds into the game."""
+    current = waves[0]
+    for wave in waves:
+        if wave["time"] > elapsed:
+            break
+        current = wave
+    return current
+
+
+class EntityBudget:
+    """
+    Limit on live asteroids and shots.
+
+    `count` is a callable returning the live entities; the game sets it to
+    its groups. A limit of None never runs out.
+    """
+
+    def __init__(self, limit=None, count=None):
+        self.limit = limit
+        self.count = count
+        self.stats = {"deferred": 0, "merged": 0}
+
+    def exceeded(self):
+        """Whether no more entities fit."""
+        return self.limit is not None and self.count() >= self.limit
+
+
+def calibrate_budget(surface=None, target_ms=FRAME_TARGET_MS):
+    """
+    Measures what one entity costs per frame on this machine and returns how
+    many fit in `target_ms`, clamped to the budget limits.
+
+    :param surface: Surface to draw on while measuring, None to time the
+        simulation only.
+    """
+    from game import Game
+    from player import Controls
+    import headless
+
+    game = Game(seed=0)
+    game.verbose = False
+    game.player.make_invincible(float("inf"))
+    game.player.controls = Controls(0, 0, False)  # Keys held during startup must not steer or fire
+    headless.populate(game, CALIBRATION_ENTITIES)
+
+    dt = 1 / SIMULATION_RATE
+    start = time.perf_counter()
+    for _ in range(CALIBRATION_TICKS):
+        game.step(dt)
+        if surface is not None:
+            game.draw(surface)
+    seconds = time.perf_counter() - start
+
+    entities = max(len(game.asteroids) + len(game.shots), 1)
+    cost_ms = seconds * 1000 / CALIBRATION_TICKS / entities
+    for sprite in list(game.asteroids) + list(game.shots):
+        sprite.kill()  # Back to the pools for the real game
+    return max(MIN_ENTITY_BUDGET, min(MAX_ENTITY_BUDGET, int(target_ms / cost_ms)))